@@ -30,8 +30,73 @@ from src.utils.os_utils import (
 
 STILL_STARTING_UP = True
 
+EPHE_PATH = app_path('ephe')
+HELP_PATH = app_path('help')
+
+if PLATFORM == 'Win32GUI':
+    DLL_PATH = app_path(os.path.join('dll', 'swedll32.dll'))
+elif PLATFORM == 'linux':
+    DLL_PATH = app_path(os.path.join('dll', 'libswe.so'))
+elif PLATFORM == 'darwin':
+    DLL_PATH = app_path(os.path.join('dll', 'libswe.dylib'))
+
+# Everything below is set by initialize(), which creates the user
+# directories, migrates option files and reads the colour and data entry
+# files. Nothing touches the filesystem when the package is imported;
+# the first lookup of any of these names runs initialize().
+SETTINGS = (
+    'primary_directory',
+    'secondary_directory',
+    'docpath',
+    'CHART_PATH',
+    'TEMP_CHARTS',
+    'log_directory',
+    'ERROR_FILE',
+    'OPTION_PATH',
+    'PROGRAM_OPTION_PATH',
+    'STUDENT_FILE',
+    'INGRESS_ALMANAC_FILE',
+    'BURST_PATH',
+    'MIGRATION_JOURNAL_FILE',
+    'LOCATIONS_FILE',
+    'RECENT_FILE',
+    'COLOR_FILE',
+    'default_colors',
+    'colors',
+    'default',
+    'BG_COLOR',
+    'BTN_COLOR',
+    'DISABLED_BUTTON_COLOR',
+    'TXT_COLOR',
+    'ERR_COLOR',
+    'DATA_ENTRY_FILE',
+    'data_entry',
+    'DATE_FMT',
+    'TIME_FMT',
+    'HOME_LOC_FILE',
+    'HOME_LOC',
+)
+
+_initialized = False
+
+
+def __getattr__(name: str):
+    if name in SETTINGS:
+        initialize()
+        # Some settings only exist on some platforms
+        if name in globals():
+            return globals()[name]
+
+    if name == '__all__':
+        # Star imports are only made by the GUI, which needs the settings
+        initialize()
+        return [name for name in globals() if not name.startswith('_')]
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
 
 def log_startup_error(e):
+    initialize()
     contents = ''
     with open(ERROR_FILE, 'r') as file:
         contents = file.read()
@@ -46,245 +111,262 @@ def log_startup_error(e):
         file.write(timestamped_error + '\n' + contents)
 
 
-EPHE_PATH = app_path('ephe')
-HELP_PATH = app_path('help')
-
-# Set base directories and paths
-if PLATFORM == 'Win32GUI':
-    primary_directory = os.path.expanduser(r'~\Documents')
-    DLL_PATH = app_path(os.path.join('dll', 'swedll32.dll'))
-elif PLATFORM == 'linux':
-    primary_directory = os.path.join(os.path.expanduser('~'), '.tmsa')
-    if not os.path.exists(primary_directory):
-        create_directory(primary_directory)
-    DLL_PATH = app_path(os.path.join('dll', 'libswe.so'))
-elif PLATFORM == 'darwin':
-    primary_directory = os.path.join(
-        os.path.expanduser('~'), 'Documents', 'tmsa'
-    )
-    if not os.path.exists(primary_directory):
-        create_directory(primary_directory)
-    DLL_PATH = app_path(os.path.join('dll', 'libswe.dylib'))
+def initialize():
+    global _initialized
+    global primary_directory, secondary_directory, docpath, CHART_PATH
+    global TEMP_CHARTS, log_directory, ERROR_FILE, OPTION_PATH
+    global PROGRAM_OPTION_PATH, STUDENT_FILE, INGRESS_ALMANAC_FILE, BURST_PATH
+    global MIGRATION_JOURNAL_FILE
+    global LOCATIONS_FILE, RECENT_FILE, COLOR_FILE, default_colors, colors
+    global default, BG_COLOR, BTN_COLOR, DISABLED_BUTTON_COLOR, TXT_COLOR
+    global ERR_COLOR, DATA_ENTRY_FILE, data_entry, DATE_FMT, TIME_FMT
+    global HOME_LOC_FILE, HOME_LOC
+
+    if _initialized:
+        return
+    _initialized = True
+
+    # Set base directories and paths
+    if PLATFORM == 'Win32GUI':
+        primary_directory = os.path.expanduser(r'~\Documents')
+    elif PLATFORM == 'linux':
+        primary_directory = os.path.join(os.path.expanduser('~'), '.tmsa')
+        if not os.path.exists(primary_directory):
+            create_directory(primary_directory)
+    elif PLATFORM == 'darwin':
+        primary_directory = os.path.join(
+            os.path.expanduser('~'), 'Documents', 'tmsa'
+        )
+        if not os.path.exists(primary_directory):
+            create_directory(primary_directory)
 
-if os.path.exists(primary_directory):
-    primary_directory = os.path.expandvars(primary_directory)
-else:
-    primary_directory = None
+    if os.path.exists(primary_directory):
+        primary_directory = os.path.expandvars(primary_directory)
+    else:
+        primary_directory = None
 
-if PLATFORM == 'Win32GUI':
-    import winreg
+    if PLATFORM == 'Win32GUI':
+        import winreg
 
-    key = winreg.OpenKey(
-        winreg.HKEY_CURRENT_USER,
-        r'Software\Microsoft\Windows\CurrentVersion\Explorer\User Shell Folders',
-    )
-    for i in range(1000):
-        try:
-            r = winreg.EnumValue(key, i)
-            if r[0] == 'Personal':
-                secondary_directory = r[1]
-                break
-        except:
-            secondary_directory = None
-    key.Close()
-    if secondary_directory:
-        secondary_directory = os.path.expandvars(secondary_directory)
-        if os.path.exists(secondary_directory):
-            docpath = secondary_directory
+        key = winreg.OpenKey(
+            winreg.HKEY_CURRENT_USER,
+            r'Software\Microsoft\Windows\CurrentVersion\Explorer\User Shell Folders',
+        )
+        for i in range(1000):
+            try:
+                r = winreg.EnumValue(key, i)
+                if r[0] == 'Personal':
+                    secondary_directory = r[1]
+                    break
+            except:
+                secondary_directory = None
+        key.Close()
+        if secondary_directory:
+            secondary_directory = os.path.expandvars(secondary_directory)
+            if os.path.exists(secondary_directory):
+                docpath = secondary_directory
+            else:
+                secondary_directory = None
+        elif primary_directory:
+            docpath = primary_directory
         else:
-            secondary_directory = None
-    elif primary_directory:
-        docpath = primary_directory
-    else:
-        docpath = 'c:\\'
-    CHART_PATH = os.path.join(docpath, 'tmsa', 'charts')
-    os.makedirs(CHART_PATH, exist_ok=True)
+            docpath = 'c:\\'
+        CHART_PATH = os.path.join(docpath, 'tmsa', 'charts')
+        os.makedirs(CHART_PATH, exist_ok=True)
 
-    TEMP_CHARTS = os.path.join(CHART_PATH, 'temporary')
+        TEMP_CHARTS = os.path.join(CHART_PATH, 'temporary')
 
-    ERROR_FILE = os.path.join(docpath, 'tmsa_errors', 'error.txt')
-    os.makedirs(os.path.dirname(ERROR_FILE), exist_ok=True)
+        ERROR_FILE = os.path.join(docpath, 'tmsa_errors', 'error.txt')
+        os.makedirs(os.path.dirname(ERROR_FILE), exist_ok=True)
 
-    OPTION_PATH = os.path.join(docpath, 'tmsa', 'options')
-    os.makedirs(OPTION_PATH, exist_ok=True)
+        OPTION_PATH = os.path.join(docpath, 'tmsa', 'options')
+        os.makedirs(OPTION_PATH, exist_ok=True)
 
-    PROGRAM_OPTION_PATH = os.path.join(docpath, 'tmsa', 'program_options.opt')
+        PROGRAM_OPTION_PATH = os.path.join(
+            docpath, 'tmsa', 'program_options.opt'
+        )
 
+    elif PLATFORM in ['linux', 'darwin']:
+        CHART_PATH = os.path.join(primary_directory, 'charts')
+        create_directory(CHART_PATH)
+        TEMP_CHARTS = os.path.join(CHART_PATH, 'temporary')
 
-elif PLATFORM in ['linux', 'darwin']:
-    CHART_PATH = os.path.join(primary_directory, 'charts')
-    create_directory(CHART_PATH)
-    TEMP_CHARTS = os.path.join(CHART_PATH, 'temporary')
+        log_directory = os.path.join(primary_directory, 'logs')
+        create_directory(log_directory)
+        ERROR_FILE = os.path.join(log_directory, 'error.txt')
 
-    log_directory = os.path.join(primary_directory, 'logs')
-    create_directory(log_directory)
-    ERROR_FILE = os.path.join(log_directory, 'error.txt')
+        # Make empty error file if it doesn't exist
+        if not os.path.exists(ERROR_FILE):
+            open(ERROR_FILE, 'w').close()
 
-    # Make empty error file if it doesn't exist
-    if not os.path.exists(ERROR_FILE):
-        open(ERROR_FILE, 'w').close()
+        OPTION_PATH = os.path.join(primary_directory, 'options')
+        create_directory(OPTION_PATH)
 
-    OPTION_PATH = os.path.join(primary_directory, 'options')
-    create_directory(OPTION_PATH)
+        PROGRAM_OPTION_PATH = os.path.join(
+            primary_directory, 'program_options.opt'
+        )
+
+    if not os.path.exists(PROGRAM_OPTION_PATH):
+        write_to_file_if_not_exists(PROGRAM_OPTION_PATH, json.dumps({}))
+
+    # Ensure all option file defaults exist.
+    # This is the same for every OS.
 
-    PROGRAM_OPTION_PATH = os.path.join(
-        primary_directory, 'program_options.opt'
+    migrate_from_file(
+        old_path=os.path.join(OPTION_PATH, 'Default_Natal.opt'),
+        new_path=os.path.join(OPTION_PATH, 'Natal_Default.opt'),
+        fallback=json.dumps(NATAL_DEFAULT),
     )
 
-if not os.path.exists(PROGRAM_OPTION_PATH):
-    write_to_file_if_not_exists(PROGRAM_OPTION_PATH, json.dumps({}))
+    migrate_from_file(
+        old_path=os.path.join(OPTION_PATH, 'Default_Ingress.opt'),
+        new_path=os.path.join(OPTION_PATH, 'Ingress_Default.opt'),
+        fallback=json.dumps(INGRESS_DEFAULT),
+    )
 
-# Ensure all option file defaults exist.
-# This is the same for every OS.
+    migrate_from_file(
+        old_path=os.path.join(OPTION_PATH, 'Default_Return.opt'),
+        new_path=os.path.join(OPTION_PATH, 'Return_Default.opt'),
+        fallback=json.dumps(RETURN_DEFAULT),
+    )
 
-migrate_from_file(
-    old_path=os.path.join(OPTION_PATH, 'Default_Natal.opt'),
-    new_path=os.path.join(OPTION_PATH, 'Natal_Default.opt'),
-    fallback=json.dumps(NATAL_DEFAULT),
-)
+    migrate_from_file(
+        old_path=os.path.join(OPTION_PATH, 'Cosmobiology.opt'),
+        new_path=os.path.join(OPTION_PATH, 'Cosmobiology.opt'),
+        fallback=json.dumps(COSMOBIOLOGY),
+    )
 
-migrate_from_file(
-    old_path=os.path.join(OPTION_PATH, 'Default_Ingress.opt'),
-    new_path=os.path.join(OPTION_PATH, 'Ingress_Default.opt'),
-    fallback=json.dumps(INGRESS_DEFAULT),
-)
+    migrate_from_file(
+        os.path.join(OPTION_PATH, 'Student_Natal.opt'),
+        os.path.join(OPTION_PATH, 'Student_Natal.opt'),
+        fallback=json.dumps(STUDENT_NATAL),
+    )
 
-migrate_from_file(
-    old_path=os.path.join(OPTION_PATH, 'Default_Return.opt'),
-    new_path=os.path.join(OPTION_PATH, 'Return_Default.opt'),
-    fallback=json.dumps(RETURN_DEFAULT),
-)
+    migrate_from_file(
+        'aaaaaaaaaaaaaaaaaaa',
+        os.path.join(OPTION_PATH, 'Progressed_Default.opt'),
+        fallback=json.dumps(PROGRESSED_DEFAULT),
+    )
 
-migrate_from_file(
-    old_path=os.path.join(OPTION_PATH, 'Cosmobiology.opt'),
-    new_path=os.path.join(OPTION_PATH, 'Cosmobiology.opt'),
-    fallback=json.dumps(COSMOBIOLOGY),
-)
+    STUDENT_FILE = os.path.join(OPTION_PATH, 'student.json')
 
-migrate_from_file(
-    os.path.join(OPTION_PATH, 'Student_Natal.opt'),
-    os.path.join(OPTION_PATH, 'Student_Natal.opt'),
-    fallback=json.dumps(STUDENT_NATAL),
-)
+    INGRESS_ALMANAC_FILE = os.path.join(OPTION_PATH, 'ingress_almanac.bin')
 
-migrate_from_file(
-    'aaaaaaaaaaaaaaaaaaa',
-    os.path.join(OPTION_PATH, 'Progressed_Default.opt'),
-    fallback=json.dumps(PROGRESSED_DEFAULT),
-)
+    BURST_PATH = os.path.join(OPTION_PATH, 'bursts')
 
-STUDENT_FILE = os.path.join(OPTION_PATH, 'student.json')
-
-LOCATIONS_FILE = os.path.join(OPTION_PATH, 'locations.json')
-
-if not os.path.exists(LOCATIONS_FILE):
-    try:
-        with open(LOCATIONS_FILE, 'w') as datafile:
-            json.dump([], datafile, indent=4)
-    except Exception as e:
-        e.args = (e.args[0] + ' - unable to open locations file.',) + e.args[
-            1:
-        ]
-        log_startup_error(e)
-
-RECENT_FILE = os.path.join(OPTION_PATH, 'recent.json')
-
-COLOR_FILE = os.path.join(OPTION_PATH, 'colors.json')
-
-if not os.path.exists(RECENT_FILE):
-    try:
-        with open(RECENT_FILE, 'w') as datafile:
-            json.dump([], datafile, indent=4)
-    except Exception as e:
-        e.args = (e.args[0] + ' - unable to open recent file.',) + e.args[1:]
-        log_startup_error(e)
-
-default_colors = {
-    'bg_color': 'black',
-    'button_color': 'blue',
-    'disabled_button': 'gray25',
-    'text_color': 'yellow',
-    'error_color': 'red',
-}
-colors = None
-
-default = True
-if os.path.exists(COLOR_FILE):
-    try:
-        with open(COLOR_FILE) as datafile:
-            colors = json.load(datafile)
-        default = False
-    except Exception as e:
-        e.args = (
-            e.args[0] + ' - unable to open color file to load colors.',
-        ) + e.args[1:]
-        log_startup_error(e)
-
-if default:
-    try:
-        with open(COLOR_FILE, 'w') as datafile:
-            json.dump(
-                colors if colors is not None else default_colors,
-                datafile,
-                indent=4,
-            )
-    except Exception as e:
-        e.args = (
-            e.args[0] + ' - unable to open color file to save colors.',
-        ) + e.args[1:]
-        log_startup_error(e)
-
-if colors is None or colors == [] or colors == {}:
-    colors = default_colors
-
-BG_COLOR = colors.get('bg_color', default_colors['bg_color'])
-BTN_COLOR = colors.get('button_color', default_colors['button_color'])
-DISABLED_BUTTON_COLOR = colors.get(
-    'disabled_button', default_colors['disabled_button']
-)
-TXT_COLOR = colors.get('text_color', default_colors['text_color'])
-ERR_COLOR = colors.get('error_color', default_colors['error_color'])
-
-DATA_ENTRY_FILE = os.path.join(OPTION_PATH, 'data_entry.json')
-
-
-data_entry = {'date_fmt': 'M D Y', 'time_fmt': 'AM/PM'}
-default = True
-if os.path.exists(DATA_ENTRY_FILE):
-    try:
-        with open(DATA_ENTRY_FILE) as datafile:
-            data_entry = json.load(datafile)
-        default = False
-    except Exception as e:
-        e.args = (
-            e.args[0] + ' - unable to open data entry file to load data.',
-        ) + e.args[1:]
-        log_startup_error(e)
-
-if default:
-    try:
-        with open(DATA_ENTRY_FILE, 'w') as datafile:
-            json.dump(data_entry, datafile, indent=4)
-    except Exception as e:
-        e.args = (
-            e.args[0] + ' - unable to open data entry file to save data.',
-        ) + e.args[1:]
-        log_startup_error(e)
-
-DATE_FMT = data_entry['date_fmt']
-TIME_FMT = data_entry['time_fmt']
-
-HOME_LOC_FILE = os.path.join(OPTION_PATH, 'home.json')
-
-if os.path.exists(HOME_LOC_FILE):
-    try:
-        with open(HOME_LOC_FILE, 'r') as datafile:
-            HOME_LOC = json.load(datafile)
-    except Exception as e:
+    MIGRATION_JOURNAL_FILE = os.path.join(OPTION_PATH, 'migration_journal.txt')
+
+    LOCATIONS_FILE = os.path.join(OPTION_PATH, 'locations.json')
+
+    if not os.path.exists(LOCATIONS_FILE):
+        try:
+            with open(LOCATIONS_FILE, 'w') as datafile:
+                json.dump([], datafile, indent=4)
+        except Exception as e:
+            e.args = (
+                e.args[0] + ' - unable to open locations file.',
+            ) + e.args[1:]
+            log_startup_error(e)
+
+    RECENT_FILE = os.path.join(OPTION_PATH, 'recent.json')
+
+    COLOR_FILE = os.path.join(OPTION_PATH, 'colors.json')
+
+    if not os.path.exists(RECENT_FILE):
+        try:
+            with open(RECENT_FILE, 'w') as datafile:
+                json.dump([], datafile, indent=4)
+        except Exception as e:
+            e.args = (e.args[0] + ' - unable to open recent file.',) + e.args[
+                1:
+            ]
+            log_startup_error(e)
+
+    default_colors = {
+        'bg_color': 'black',
+        'button_color': 'blue',
+        'disabled_button': 'gray25',
+        'text_color': 'yellow',
+        'error_color': 'red',
+    }
+    colors = None
+
+    default = True
+    if os.path.exists(COLOR_FILE):
+        try:
+            with open(COLOR_FILE) as datafile:
+                colors = json.load(datafile)
+            default = False
+        except Exception as e:
+            e.args = (
+                e.args[0] + ' - unable to open color file to load colors.',
+            ) + e.args[1:]
+            log_startup_error(e)
+
+    if default:
+        try:
+            with open(COLOR_FILE, 'w') as datafile:
+                json.dump(
+                    colors if colors is not None else default_colors,
+                    datafile,
+                    indent=4,
+                )
+        except Exception as e:
+            e.args = (
+                e.args[0] + ' - unable to open color file to save colors.',
+            ) + e.args[1:]
+            log_startup_error(e)
+
+    if colors is None or colors == [] or colors == {}:
+        colors = default_colors
+
+    BG_COLOR = colors.get('bg_color', default_colors['bg_color'])
+    BTN_COLOR = colors.get('button_color', default_colors['button_color'])
+    DISABLED_BUTTON_COLOR = colors.get(
+        'disabled_button', default_colors['disabled_button']
+    )
+    TXT_COLOR = colors.get('text_color', default_colors['text_color'])
+    ERR_COLOR = colors.get('error_color', default_colors['error_color'])
+
+    DATA_ENTRY_FILE = os.path.join(OPTION_PATH, 'data_entry.json')
+
+    data_entry = {'date_fmt': 'M D Y', 'time_fmt': 'AM/PM'}
+    default = True
+    if os.path.exists(DATA_ENTRY_FILE):
+        try:
+            with open(DATA_ENTRY_FILE) as datafile:
+                data_entry = json.load(datafile)
+            default = False
+        except Exception as e:
+            e.args = (
+                e.args[0] + ' - unable to open data entry file to load data.',
+            ) + e.args[1:]
+            log_startup_error(e)
+
+    if default:
+        try:
+            with open(DATA_ENTRY_FILE, 'w') as datafile:
+                json.dump(data_entry, datafile, indent=4)
+        except Exception as e:
+            e.args = (
+                e.args[0] + ' - unable to open data entry file to save data.',
+            ) + e.args[1:]
+            log_startup_error(e)
+
+    DATE_FMT = data_entry['date_fmt']
+    TIME_FMT = data_entry['time_fmt']
+
+    HOME_LOC_FILE = os.path.join(OPTION_PATH, 'home.json')
+
+    if os.path.exists(HOME_LOC_FILE):
+        try:
+            with open(HOME_LOC_FILE, 'r') as datafile:
+                HOME_LOC = json.load(datafile)
+        except Exception as e:
+            HOME_LOC = None
+            e.args = (
+                e.args[0] + ' - unable to open home location file.',
+            ) + e.args[1:]
+            log_startup_error(e)
+    else:
         HOME_LOC = None
-        e.args = (
-            e.args[0] + ' - unable to open home location file.',
-        ) + e.args[1:]
-        log_startup_error(e)
-else:
-    HOME_LOC = None
@@ -0,0 +1,93 @@
+"""Chart computation without the GUI.
+
+Importing this module doesn't import Tk, touch the filesystem or load the
+ephemeris library; the library is loaded on the first ephemeris call.
+The searches and harmonic charts need numpy, so they are only imported
+when first used.
+"""
+
+import importlib
+
+from src.models.charts import ChartObject, ChartType, ChartWheelRole
+from src.models.options import Options
+from src.utils.aspect_index import AspectIndex
+from src.utils.calculation_utils import (
+    ParanCalculationError,
+    calc_halfsums,
+    calc_major_angle_paran,
+    calc_midpoints_3,
+    parse_aspect,
+)
+from src.utils.chart_cache import radix_charts, transit_charts
+
+LAZY_FUNCTIONS = {
+    'iter_solunar_returns': 'src.utils.solunars',
+    'search_solunars': 'src.utils.solunars',
+    'search_roster_solunars': 'src.utils.solunars',
+    'calc_harmonic_charts': 'src.utils.harmonics',
+    'calc_harmonic_aspects': 'src.utils.harmonics',
+}
+
+__all__ = [
+    'AspectIndex',
+    'ChartObject',
+    'ChartType',
+    'ChartWheelRole',
+    'Options',
+    'ParanCalculationError',
+    'build_chart',
+    'calc_major_angle_paran',
+    'calc_midpoints',
+    'initialize_chart_worker',
+    'initialize_worker',
+    'parse_aspect',
+    'radix_charts',
+    'transit_charts',
+    *LAZY_FUNCTIONS,
+]
+
+
+def __getattr__(name: str):
+    if name in LAZY_FUNCTIONS:
+        function = getattr(importlib.import_module(LAZY_FUNCTIONS[name]), name)
+        globals()[name] = function
+        return function
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def build_chart(
+    params: dict, role: ChartWheelRole | None = None
+) -> ChartObject:
+    """A chart for the params, shared through the transit chart cache."""
+    chart = transit_charts.get(params)
+    return chart.with_role(role) if role else chart
+
+
+def calc_midpoints(
+    options: Options, charts: list[ChartObject]
+) -> dict[str, list]:
+    return calc_midpoints_3(options, charts, calc_halfsums(options, charts))
+
+
+def initialize_worker():
+    """Loads the ephemeris library in a pool process."""
+    import src.swe
+
+    src.swe.load_dll()
+
+
+def initialize_chart_worker(
+    chart_path: str, temporary_charts: str, option_path: str
+):
+    """Initializes a pool process that saves charts and writes reports
+    in the same folders as the process that started the pool."""
+    import src
+
+    initialize_worker()
+    # Settings are read on first use, which would overwrite the folders
+    # if done later
+    src.initialize()
+    src.CHART_PATH = chart_path
+    src.TEMP_CHARTS = temporary_charts
+    src.OPTION_PATH = option_path
@@ -1,11 +1,10 @@
+import copy
 import itertools
 import json
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from enum import Enum
 from typing import Iterator, TypedDict, TypeVar
 
-import pydash
-
 from src import log_startup_error, swe
 from src.constants import PLANETS, VERSION
 from src.models.angles import (
@@ -67,6 +66,9 @@ class ChartWheelRole(Enum):
 
 
 class __PointData:
+    # Slotted subclasses only stay slotted if every base is
+    __slots__ = ()
+
     name: str = ''
     short_name: str = ''
     number: int = -1
@@ -126,7 +128,7 @@ class __PointData:
         return False
 
 
-@dataclass
+@dataclass(slots=True)
 class PlanetData(__PointData):
     name: str = ''
     short_name: str = ''
@@ -280,7 +282,7 @@ class PlanetData(__PointData):
         return f'{self.role.value}{self.short_name}'
 
 
-@dataclass
+@dataclass(slots=True)
 class AngleData(__PointData):
     name: str = ''
     short_name: str = ''
@@ -513,6 +515,47 @@ class ChartParams(TypedDict):
     type: ChartType
 
 
+def copy_point(point: PlanetData | AngleData) -> PlanetData | AngleData:
+    point = copy.copy(point)
+    for point_field in fields(point):
+        value = getattr(point, point_field.name)
+        if isinstance(value, list):
+            setattr(point, point_field.name, [*value])
+    return point
+
+
+@dataclass
+class EphemerisSnapshot:
+    """Everything about a chart that depends only on the moment,
+    not on where it was cast."""
+
+    julian_day_utc: float
+    ayanamsa: float
+    obliquity: float
+    positions: dict[str, list[float]]
+    stationary: dict[str, bool]
+
+    @staticmethod
+    def calculate(julian_day_utc: float):
+        positions = {}
+        stationary = {}
+        for [long_name, planet_definition] in PLANETS.items():
+            positions[long_name] = swe.calc_planet(
+                julian_day_utc, planet_definition['number']
+            )
+            stationary[long_name] = swe.is_planet_stationary(
+                long_name, julian_day_utc
+            )
+
+        return EphemerisSnapshot(
+            julian_day_utc=julian_day_utc,
+            ayanamsa=swe.calc_ayan(julian_day_utc),
+            obliquity=swe.calc_obliquity(julian_day_utc),
+            positions=positions,
+            stationary=stationary,
+        )
+
+
 @dataclass
 class ChartObject:
     name: str | None
@@ -546,7 +589,7 @@ class ChartObject:
     chart_class: str = ''
     options_file: str = ''
 
-    def __init__(self, data: dict):
+    def __init__(self, data: dict, snapshot: EphemerisSnapshot | None = None):
         # This should be the only information actually stored in data files
         self.type = ChartType(data['type'])
         self.name = data.get('name', None)
@@ -611,8 +654,11 @@ class ChartObject:
                 self.julian_day_utc, self.geo_longitude
             )
 
-        self.ayanamsa = swe.calc_ayan(self.julian_day_utc)
-        self.obliquity = swe.calc_obliquity(self.julian_day_utc)
+        if snapshot is None or snapshot.julian_day_utc != self.julian_day_utc:
+            snapshot = EphemerisSnapshot.calculate(self.julian_day_utc)
+
+        self.ayanamsa = snapshot.ayanamsa
+        self.obliquity = snapshot.obliquity
 
         # Calculate cusps & angles
         (cusps, angles) = swe.calc_cusps(
@@ -731,14 +777,13 @@ class ChartObject:
         self.planets = {}
 
         for [long_name, planet_definition] in PLANETS.items():
-            planet_index = planet_definition['number']
             [
                 longitude,
                 latitude,
                 speed,
                 right_ascension,
                 declination,
-            ] = swe.calc_planet(self.julian_day_utc, planet_index)
+            ] = snapshot.positions[long_name]
             [azimuth, altitude] = swe.calc_azimuth(
                 self.julian_day_utc,
                 self.geo_longitude,
@@ -770,9 +815,7 @@ class ChartObject:
                 meridian_longitude=meridian_longitude,
                 house=house_position,
                 prime_vertical_longitude=house_position,
-                is_stationary=swe.is_planet_stationary(
-                    long_name, self.julian_day_utc
-                ),
+                is_stationary=snapshot.stationary[long_name],
             )
 
         self.sun_sign = SIGNS_SHORT[int(self.planets['Sun'].longitude // 30)]
@@ -841,6 +884,53 @@ class ChartObject:
             else:
                 yield point, data
 
+    @staticmethod
+    def at_locations(
+        data: dict, locations: list[tuple[str, float, float]]
+    ) -> list[T]:
+        """Casts the same moment for each (location, latitude, longitude),
+        computing planetary positions only once."""
+        snapshot = None
+        charts = []
+        for location, latitude, longitude in locations:
+            chart = ChartObject(
+                {
+                    **data,
+                    'location': location,
+                    'latitude': latitude,
+                    'longitude': longitude,
+                },
+                snapshot,
+            )
+            # Local mean time zones shift the julian day with longitude;
+            # those charts fall back to computing their own positions.
+            if snapshot is None:
+                snapshot = chart.ephemeris_snapshot()
+            charts.append(chart)
+        return charts
+
+    def ephemeris_snapshot(self) -> EphemerisSnapshot:
+        # Only meaningful before the chart has been precessed
+        return EphemerisSnapshot(
+            julian_day_utc=self.julian_day_utc,
+            ayanamsa=self.ayanamsa,
+            obliquity=self.obliquity,
+            positions={
+                name: [
+                    planet.longitude,
+                    planet.latitude,
+                    planet.speed,
+                    planet.right_ascension,
+                    planet.declination,
+                ]
+                for name, planet in self.planets.items()
+            },
+            stationary={
+                name: planet.is_stationary
+                for name, planet in self.planets.items()
+            },
+        )
+
     @staticmethod
     def from_file(file_path: str):
         with open(file_path, 'r') as file:
@@ -858,13 +948,75 @@ class ChartObject:
         self.role = role
         return self
 
+    def copy(self) -> T:
+        """Copy whose planets and angles can be precessed or tagged
+        without touching this chart."""
+        chart = copy.copy(self)
+        chart.planets = {
+            name: copy_point(planet) for name, planet in self.planets.items()
+        }
+        chart.angle_data = {
+            name: copy_point(angle) for name, angle in self.angle_data.items()
+        }
+        chart.cusps = [*self.cusps]
+        chart.angles = [*self.angles]
+        chart.vertex = [*self.vertex]
+        chart.eastpoint = [*self.eastpoint]
+        return chart
+
     def precess_to(self, to_chart: T):
-        for planet in self.planets:
-            self.planets[planet].precess_to(to_chart)
+        # Same as precessing each planet and angle in turn,
+        # but with one round trip into the ephemeris for the whole chart
+        planets = list(self.planets.values())
+        angles = list(self.angle_data.values())
+
+        points = []
+        for planet in planets:
+            points.append(
+                (
+                    [
+                        planet.longitude + to_chart.ayanamsa,
+                        planet.latitude,
+                        planet.speed,
+                    ],
+                    to360(planet.longitude + to_chart.ayanamsa),
+                    planet.latitude,
+                )
+            )
+        for angle in angles:
+            tropical_longitude = to360(angle.longitude + to_chart.ayanamsa)
+            points.append(([tropical_longitude, 0, 0], tropical_longitude, 0))
 
-        # Precess angles
-        for angle in self.angle_data:
-            self.angle_data[angle].precess_to(to_chart)
+        positions = swe.calc_frame_positions(
+            points,
+            to_chart.julian_day_utc,
+            to_chart.geo_longitude,
+            to_chart.geo_latitude,
+            to_chart.ramc,
+            to_chart.obliquity,
+        )
+
+        for planet, position in zip(planets, positions):
+            (
+                planet.right_ascension,
+                planet.declination,
+                planet.azimuth,
+                planet.altitude,
+                planet.house,
+            ) = position
+            planet.meridian_longitude = swe.calc_meridian_longitude(
+                planet.azimuth, planet.altitude
+            )
+            planet.prime_vertical_longitude = planet.house
+
+        for angle, position in zip(angles, positions[len(planets) :]):
+            (
+                angle.right_ascension,
+                angle.declination,
+                angle.azimuth,
+                angle.altitude,
+                angle.prime_vertical_longitude,
+            ) = position
 
         return self
 
@@ -948,7 +1100,7 @@ class AspectFramework(Enum):
     PARAN = 'P'
 
 
-@dataclass
+@dataclass(slots=True)
 class Aspect:
     type: AspectType = AspectType.CONJUNCTION
     aspect_class: int = 0
@@ -1091,7 +1243,7 @@ class Aspect:
         return False
 
 
-@dataclass
+@dataclass(slots=True)
 class AngleContactAspect:
     type: AspectType = AspectType.CONJUNCTION
     aspect_class: int = 0
@@ -1228,7 +1380,7 @@ class AngleContactAspect:
         return False
 
 
-@dataclass
+@dataclass(slots=True)
 class HalfSum:
     point_a: PlanetData | AngleData
     point_b: PlanetData | AngleData
@@ -1294,7 +1446,7 @@ class MidpointAspectType(Enum):
     INDIRECT = 'i'
 
 
-@dataclass
+@dataclass(slots=True)
 class MidpointAspect:
     from_point_data: PlanetData | AngleData
     midpoint_type: MidpointAspectType = MidpointAspectType.DIRECT
@@ -153,9 +153,17 @@ class Options:
 
 class ProgramOptions:
     quarti_returns_enabled: bool = True
+    ingress_almanac_start_year: int = 1900
+    ingress_almanac_end_year: int = 2100
 
     def __init__(self, data: dict[str, any]):
         self.quarti_returns_enabled = data.get('quarti_returns_enabled', True)
+        self.ingress_almanac_start_year = data.get(
+            'ingress_almanac_start_year', 1900
+        )
+        self.ingress_almanac_end_year = data.get(
+            'ingress_almanac_end_year', 2100
+        )
 
     @staticmethod
     def from_default():
@@ -0,0 +1,423 @@
+"""Local chart computation service.
+
+Serves the computation core over HTTP on localhost or a Unix socket, so
+scripts and other tools can cast charts without starting the GUI. The
+charts are cast in a pool of worker processes that load the ephemeris
+once at startup. Concurrent requests for the same computation share a
+single worker call.
+
+    python -m src.service --port 8765
+    python -m src.service --unix-socket /tmp/tmsa.sock
+"""
+
+import argparse
+import asyncio
+import bisect
+import json
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+from src.core import initialize_worker
+from src.utils.chart_cache import chart_cache_key
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+DEFAULT_WORKERS = 2
+
+# Upper bounds of the latency buckets, in milliseconds
+LATENCY_BUCKETS_MS = [1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+MAX_BODY_BYTES = 1024 * 1024
+
+REASONS = {
+    200: 'OK',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    413: 'Payload Too Large',
+    500: 'Internal Server Error',
+}
+
+PLANET_FIELDS = [
+    'longitude',
+    'latitude',
+    'speed',
+    'right_ascension',
+    'declination',
+    'azimuth',
+    'altitude',
+    'house',
+    'prime_vertical_longitude',
+    'meridian_longitude',
+]
+
+
+class ServiceRequestError(ValueError):
+    pass
+
+
+class LatencyHistogram:
+    def __init__(self, buckets: list[float] = LATENCY_BUCKETS_MS):
+        self.buckets = list(buckets)
+        # The last count is for everything over the largest bucket
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.total = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, elapsed_ms: float):
+        self.counts[bisect.bisect_left(self.buckets, elapsed_ms)] += 1
+        self.total += 1
+        self.sum_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+
+    def to_dict(self) -> dict:
+        labels = [f'<={bucket}' for bucket in self.buckets] + [
+            f'>{self.buckets[-1]}'
+        ]
+        return {
+            'count': self.total,
+            'mean_ms': self.sum_ms / self.total if self.total else 0.0,
+            'max_ms': self.max_ms,
+            'buckets': dict(zip(labels, self.counts)),
+        }
+
+
+# Worker side. These run in the pool processes, so they have to be
+# importable module-level functions.
+
+
+def chart_to_dict(chart) -> dict:
+    return {
+        **chart.to_dict(),
+        'julian_day': chart.julian_day_utc,
+        'ayanamsa': chart.ayanamsa,
+        'obliquity': chart.obliquity,
+        'ramc': chart.ramc,
+        'cusps': list(chart.cusps),
+        'planets': {
+            name: {field: getattr(planet, field) for field in PLANET_FIELDS}
+            for (name, planet) in chart.planets.items()
+        },
+    }
+
+
+def compute_chart(params: dict) -> dict:
+    from src.core import build_chart
+
+    return chart_to_dict(build_chart(params))
+
+
+def compute_returns(request: dict) -> list[dict]:
+    from src.core import ChartWheelRole, search_solunars
+    from src.swe import revjul
+    from src.utils.chart_cache import radix_charts
+
+    base_chart = request['base_chart']
+    params = {
+        **base_chart,
+        **request['params'],
+        'base_chart': base_chart,
+        'radix': radix_charts.get(base_chart).with_role(ChartWheelRole.RADIX),
+    }
+
+    return [
+        {
+            'type': solunar_type,
+            'class': chart_class,
+            'julian_day': julian_day,
+            'date': list(revjul(julian_day, params['style'])),
+        }
+        for (_, julian_day, solunar_type, chart_class) in search_solunars(
+            params,
+            request.get('solars', []),
+            request.get('lunars', []),
+            request.get('burst_months'),
+            request.get('active', False),
+        )
+    ]
+
+
+def compute_ingress(request: dict) -> dict:
+    from src import swe
+
+    crossings = {
+        'Sun': swe.calc_sun_crossing,
+        'Moon': swe.calc_moon_crossing,
+    }
+    body = request.get('body', 'Sun')
+    if body not in crossings:
+        raise ServiceRequestError(f'No ingress search for {body}')
+
+    style = request.get('style', 1)
+    start = request.get('julian_day')
+    if start is None:
+        start = swe.julday(
+            request['year'],
+            request['month'],
+            request['day'],
+            request.get('time', 0.0),
+            style,
+        )
+
+    julian_day = crossings[body](float(request['longitude']) % 360, start)
+    return {
+        'body': body,
+        'longitude': float(request['longitude']) % 360,
+        'julian_day': julian_day,
+        'date': list(swe.revjul(julian_day, style)),
+    }
+
+
+def json_key(request: dict) -> str:
+    return json.dumps(request, sort_keys=True)
+
+
+# Each endpoint's worker function, and the key under which concurrent
+# requests share one computation
+ENDPOINTS = {
+    '/chart': (compute_chart, chart_cache_key),
+    '/returns': (compute_returns, json_key),
+    '/ingress': (compute_ingress, json_key),
+}
+
+
+class ChartService:
+    def __init__(
+        self, workers: int = DEFAULT_WORKERS, executor: Executor = None
+    ):
+        self.owns_executor = executor is None
+        self.executor = executor or ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=initialize_worker,
+        )
+        self.in_flight: dict[tuple, asyncio.Future] = {}
+        self.latency = {path: LatencyHistogram() for path in ENDPOINTS}
+        self.computed = 0
+        self.coalesced = 0
+        self.server: asyncio.AbstractServer = None
+
+    async def compute(self, path: str, request: dict):
+        (function, make_key) = ENDPOINTS[path]
+        try:
+            key = (path, make_key(request))
+        except (KeyError, TypeError, ValueError) as error:
+            raise ServiceRequestError(f'Invalid request: {error!r}')
+
+        future = self.in_flight.get(key)
+        if future is None:
+            self.computed += 1
+            future = asyncio.get_running_loop().run_in_executor(
+                self.executor, function, request
+            )
+            self.in_flight[key] = future
+            future.add_done_callback(lambda _: self.in_flight.pop(key, None))
+        else:
+            self.coalesced += 1
+
+        # A client hanging up mustn't cancel the others' shared result
+        result = await asyncio.shield(future)
+
+        if path == '/chart':
+            # Coalesced on the moment and place only, so the caller's own
+            # name, type and notes go back on
+            result = {
+                **result,
+                **{
+                    key: request[key]
+                    for key in ['name', 'type', 'class', 'location', 'notes']
+                    if key in request
+                },
+            }
+        return result
+
+    def metrics(self) -> dict:
+        return {
+            'computed': self.computed,
+            'coalesced': self.coalesced,
+            'in_flight': len(self.in_flight),
+            'latency': {
+                path: histogram.to_dict()
+                for (path, histogram) in self.latency.items()
+            },
+        }
+
+    async def dispatch(self, method: str, path: str, body: bytes):
+        if path == '/metrics':
+            if method != 'GET':
+                return (405, {'error': 'Use GET'})
+            return (200, self.metrics())
+
+        if path not in ENDPOINTS:
+            return (404, {'error': f'No endpoint {path}'})
+        if method != 'POST':
+            return (405, {'error': 'Use POST'})
+
+        started = time.perf_counter()
+        try:
+            request = json.loads(body or b'{}')
+            if not isinstance(request, dict):
+                raise ServiceRequestError('Expected a JSON object')
+            result = (200, await self.compute(path, request))
+        except (json.JSONDecodeError, ServiceRequestError) as error:
+            result = (400, {'error': str(error)})
+        except (KeyError, TypeError, ValueError) as error:
+            result = (400, {'error': f'Invalid request: {error!r}'})
+        except Exception as error:
+            result = (500, {'error': repr(error)})
+
+        self.latency[path].record((time.perf_counter() - started) * 1000)
+        return result
+
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        try:
+            request_line = await reader.readline()
+            if not request_line:
+                return
+            (method, path, _) = request_line.decode('latin-1').split(' ', 2)
+
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                (name, _, value) = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+
+            length = int(headers.get('content-length', 0))
+            if length > MAX_BODY_BYTES:
+                (status, payload) = (413, {'error': 'Request too large'})
+            else:
+                body = await reader.readexactly(length)
+                (status, payload) = await self.dispatch(
+                    method, path.split('?', 1)[0], body
+                )
+        except (ValueError, asyncio.IncompleteReadError):
+            (status, payload) = (400, {'error': 'Malformed request'})
+
+        try:
+            content = json.dumps(payload).encode()
+            writer.write(
+                (
+                    f'HTTP/1.1 {status} {REASONS[status]}\r\n'
+                    'Content-Type: application/json\r\n'
+                    f'Content-Length: {len(content)}\r\n'
+                    'Connection: close\r\n\r\n'
+                ).encode('latin-1')
+                + content
+            )
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def start(
+        self,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        unix_socket: str = None,
+    ) -> asyncio.AbstractServer:
+        if unix_socket:
+            self.server = await asyncio.start_unix_server(
+                self.handle_connection, path=unix_socket
+            )
+        else:
+            self.server = await asyncio.start_server(
+                self.handle_connection, host, port
+            )
+        return self.server
+
+    async def close(self):
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+        if self.owns_executor:
+            self.executor.shutdown()
+
+
+class ChartServiceClient:
+    """Minimal client for the service, one connection per request."""
+
+    def __init__(
+        self,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        unix_socket: str = None,
+    ):
+        self.host = host
+        self.port = port
+        self.unix_socket = unix_socket
+
+    async def request(
+        self, method: str, path: str, payload: dict = None
+    ) -> tuple[int, dict]:
+        if self.unix_socket:
+            (reader, writer) = await asyncio.open_unix_connection(
+                self.unix_socket
+            )
+        else:
+            (reader, writer) = await asyncio.open_connection(
+                self.host, self.port
+            )
+
+        body = b'' if payload is None else json.dumps(payload).encode()
+        writer.write(
+            (
+                f'{method} {path} HTTP/1.1\r\n'
+                f'Host: {self.host}\r\n'
+                'Content-Type: application/json\r\n'
+                f'Content-Length: {len(body)}\r\n'
+                'Connection: close\r\n\r\n'
+            ).encode('latin-1')
+            + body
+        )
+        await writer.drain()
+
+        response = await reader.read()
+        writer.close()
+
+        (head, _, content) = response.partition(b'\r\n\r\n')
+        status = int(head.split(b' ', 2)[1])
+        return (status, json.loads(content))
+
+    async def chart(self, params: dict) -> tuple[int, dict]:
+        return await self.request('POST', '/chart', params)
+
+    async def returns(self, request: dict) -> tuple[int, list]:
+        return await self.request('POST', '/returns', request)
+
+    async def ingress(self, request: dict) -> tuple[int, dict]:
+        return await self.request('POST', '/ingress', request)
+
+    async def metrics(self) -> tuple[int, dict]:
+        return await self.request('GET', '/metrics')
+
+
+async def serve(args: argparse.Namespace):
+    service = ChartService(workers=args.workers)
+    server = await service.start(args.host, args.port, args.unix_socket)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--unix-socket')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS)
+
+    try:
+        asyncio.run(serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
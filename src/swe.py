@@ -8,6 +8,7 @@
 # You should have received a copy of the GNU Affero General Public License along with TMSA. If not, see <https://www.gnu.org/licenses/>.
 
 import math
+import threading
 from ctypes import (
     CDLL,
     POINTER,
@@ -20,29 +21,54 @@ from ctypes import (
     create_string_buffer,
 )
 
-from src import *
+from src import DLL_PATH, EPHE_PATH
 from src.constants import HOUR_FRACTION_OF_A_DAY, PLANETS, PLATFORM
-from src.utils.calculation_utils import get_signed_orb_to_reference
 from src.utils.format_utils import (
     add_360_if_negative,
     arccotangent,
     cotangent,
+    get_signed_orb_to_reference,
     north_azimuth,
     southern_azimuth,
 )
 
-dll = CDLL(DLL_PATH)
+# The library is loaded on the first ephemeris call, not on import
+dll = None
 
+# Depending on how it was built, the library keeps its ephemeris path,
+# open files and position caches either in globals or per thread. Every
+# call holds this lock, and each thread sets the ephemeris path before
+# its first call; the buffers passed in are created per call, so nothing
+# else is shared between threads.
+EPHEMERIS_LOCK = threading.RLock()
+ephemeris_thread = threading.local()
 
-if PLATFORM == 'Win32GUI':
-    swe_set_ephe = getattr(dll, '_swe_set_ephe_path@4')
-elif PLATFORM == 'linux':
-    swe_set_ephe = getattr(dll, 'swe_set_ephe_path')
-elif PLATFORM == 'darwin':
-    swe_set_ephe = getattr(dll, 'swe_set_ephe_path')
-swe_set_ephe.argtypes = [c_char_p]
-swe_set_ephe.restype = c_void_p
-swe_set_ephe(EPHE_PATH.encode())
+
+def set_ephemeris_path(library: CDLL):
+    if PLATFORM == 'Win32GUI':
+        swe_set_ephe = getattr(library, '_swe_set_ephe_path@4')
+    elif PLATFORM == 'linux':
+        swe_set_ephe = getattr(library, 'swe_set_ephe_path')
+    elif PLATFORM == 'darwin':
+        swe_set_ephe = getattr(library, 'swe_set_ephe_path')
+    swe_set_ephe.argtypes = [c_char_p]
+    swe_set_ephe.restype = c_void_p
+    swe_set_ephe(EPHE_PATH.encode())
+    ephemeris_thread.has_path = True
+
+
+def load_dll() -> CDLL:
+    global dll
+
+    with EPHEMERIS_LOCK:
+        if dll is None:
+            library = CDLL(DLL_PATH)
+            set_ephemeris_path(library)
+            dll = library
+        elif not getattr(ephemeris_thread, 'has_path', False):
+            set_ephemeris_path(dll)
+
+    return dll
 
 
 def _get_handle_for_platform(dll: CDLL, windows_string: str):
@@ -58,106 +84,154 @@ def _get_handle_for_platform(dll: CDLL, windows_string: str):
     return getattr(dll, handle)
 
 
-swe_julday = _get_handle_for_platform(dll, '_swe_julday@24')
-swe_julday.argtypes = [c_int, c_int, c_int, c_double, c_int]
-swe_julday.restype = c_double
+class DllFunction:
+    """A function in the ephemeris library, bound on its first call."""
 
-swe_revjul = _get_handle_for_platform(dll, '_swe_revjul@28')
-swe_revjul.argtypes = [
-    c_double,
-    c_int,
-    POINTER(c_int),
-    POINTER(c_int),
-    POINTER(c_int),
-    POINTER(c_double),
-]
-swe_revjul.restype = c_void_p
-
-swe_calc_ut = _get_handle_for_platform(dll, '_swe_calc_ut@24')
-swe_calc_ut.argtypes = [
-    c_double,
-    c_int,
-    c_int,
-    POINTER(c_double * 6),
-    POINTER(c_char * 256),
-]
+    def __init__(self, windows_string: str, argtypes: list, restype=None):
+        self.windows_string = windows_string
+        self.argtypes = argtypes
+        self.restype = restype
+        self.function = None
 
-swe_get_ayanamsa_ex_ut = _get_handle_for_platform(
-    dll, '_swe_get_ayanamsa_ex_ut@20'
+    def bind(self):
+        function = _get_handle_for_platform(load_dll(), self.windows_string)
+        function.argtypes = self.argtypes
+        if self.restype is not None:
+            function.restype = self.restype
+        self.function = function
+        return function
+
+    def __call__(self, *args):
+        with EPHEMERIS_LOCK:
+            if not getattr(ephemeris_thread, 'has_path', False):
+                load_dll()
+            return (self.function or self.bind())(*args)
+
+
+swe_julday = DllFunction(
+    '_swe_julday@24',
+    [c_int, c_int, c_int, c_double, c_int],
+    restype=c_double,
 )
-swe_get_ayanamsa_ex_ut.argtypes = [
-    c_double,
-    c_int,
-    POINTER(c_double),
-    POINTER(c_char * 256),
-]
 
-swe_houses_ex = _get_handle_for_platform(dll, '_swe_houses_ex@40')
-swe_houses_ex.argtypes = [
-    c_double,
-    c_int,
-    c_double,
-    c_double,
-    c_int,
-    POINTER(c_double * 13),
-    POINTER(c_double * 10),
-]
+swe_revjul = DllFunction(
+    '_swe_revjul@28',
+    [
+        c_double,
+        c_int,
+        POINTER(c_int),
+        POINTER(c_int),
+        POINTER(c_int),
+        POINTER(c_double),
+    ],
+    restype=c_void_p,
+)
 
-swe_house_pos = _get_handle_for_platform(dll, '_swe_house_pos@36')
-swe_house_pos.argtypes = [
-    c_double,
-    c_double,
-    c_double,
-    c_int,
-    POINTER(c_double * 2),
-    POINTER(c_char * 256),
-]
-swe_house_pos.restype = c_double
+swe_calc_ut = DllFunction(
+    '_swe_calc_ut@24',
+    [
+        c_double,
+        c_int,
+        c_int,
+        POINTER(c_double * 6),
+        POINTER(c_char * 256),
+    ],
+)
 
-swe_azalt = _get_handle_for_platform(dll, '_swe_azalt@40')
-swe_azalt.argtypes = [
-    c_double,
-    c_int,
-    POINTER(c_double * 3),
-    c_double,
-    c_double,
-    POINTER(c_double * 3),
-    POINTER(c_double * 3),
-]
+swe_get_ayanamsa_ex_ut = DllFunction(
+    '_swe_get_ayanamsa_ex_ut@20',
+    [
+        c_double,
+        c_int,
+        POINTER(c_double),
+        POINTER(c_char * 256),
+    ],
+)
 
-swe_lat_to_lmt = _get_handle_for_platform(dll, '_swe_lat_to_lmt@24')
-swe_lat_to_lmt.argtypes = [
-    c_double,
-    c_double,
-    POINTER(c_double),
-    POINTER(c_char * 256),
-]
+swe_houses_ex = DllFunction(
+    '_swe_houses_ex@40',
+    [
+        c_double,
+        c_int,
+        c_double,
+        c_double,
+        c_int,
+        POINTER(c_double * 13),
+        POINTER(c_double * 10),
+    ],
+)
 
-swe_lmt_to_lat = _get_handle_for_platform(dll, '_swe_lmt_to_lat@24')
-swe_lmt_to_lat.argtypes = [
-    c_double,
-    c_double,
-    POINTER(c_double),
-    POINTER(c_char * 256),
-]
+swe_house_pos = DllFunction(
+    '_swe_house_pos@36',
+    [
+        c_double,
+        c_double,
+        c_double,
+        c_int,
+        POINTER(c_double * 2),
+        POINTER(c_char * 256),
+    ],
+    restype=c_double,
+)
+
+swe_azalt = DllFunction(
+    '_swe_azalt@40',
+    [
+        c_double,
+        c_int,
+        POINTER(c_double * 3),
+        c_double,
+        c_double,
+        POINTER(c_double * 3),
+        POINTER(c_double * 3),
+    ],
+)
+
+swe_lat_to_lmt = DllFunction(
+    '_swe_lat_to_lmt@24',
+    [
+        c_double,
+        c_double,
+        POINTER(c_double),
+        POINTER(c_char * 256),
+    ],
+)
 
-swe_time_equ = _get_handle_for_platform(dll, '_swe_time_equ@16')
-swe_time_equ.argtypes = [
-    c_double,  # Julian day UTC
-    POINTER(c_double),  # Output for equation of time
-    POINTER(c_char * 256),  # error string
-]
+swe_lmt_to_lat = DllFunction(
+    '_swe_lmt_to_lat@24',
+    [
+        c_double,
+        c_double,
+        POINTER(c_double),
+        POINTER(c_char * 256),
+    ],
+)
+
+swe_time_equ = DllFunction(
+    '_swe_time_equ@16',
+    [
+        c_double,  # Julian day UTC
+        POINTER(c_double),  # Output for equation of time
+        POINTER(c_char * 256),  # error string
+    ],
+)
 
-swe_solcross_ut = _get_handle_for_platform(dll, '_swe_solcross_ut@24')
-swe_solcross_ut.argtypes = [c_double, c_double, c_int, POINTER(c_char * 256)]
-swe_solcross_ut.restype = c_double
+swe_solcross_ut = DllFunction(
+    '_swe_solcross_ut@24',
+    [c_double, c_double, c_int, POINTER(c_char * 256)],
+    restype=c_double,
+)
 
-swe_mooncross_ut = _get_handle_for_platform(dll, '_swe_mooncross_ut@24')
-swe_mooncross_ut.argtypes = [c_double, c_double, c_int, POINTER(c_char * 256)]
-swe_mooncross_ut.restype = c_double.restype = c_double
+swe_mooncross_ut = DllFunction(
+    '_swe_mooncross_ut@24',
+    [c_double, c_double, c_int, POINTER(c_char * 256)],
+    restype=c_double,
+)
 
-swe_cotrans = _get_handle_for_platform(dll, '_swe_cotrans@16')
-swe_cotrans.argtypes = [POINTER(c_double * 3), POINTER(c_double * 3), c_double]
+swe_cotrans = DllFunction(
+    '_swe_cotrans@16',
+    [POINTER(c_double * 3), POINTER(c_double * 3), c_double],
+)
 
 
 def julday(year, month, day, hour, isgreg) -> float:
@@ -199,6 +273,25 @@ def calc_planet(universal_time: float, planet: int):
     return result
 
 
+def calc_planet_longitude(universal_time: float, planet: int):
+    """Sidereal longitude and speed only, for searches that sample
+    a body many times.
+
+    Returns:
+        List[float]: [longitude, speed]"""
+    err = create_string_buffer(256)
+    result_array = (c_double * 6)()
+    sidereal_positions_and_speed = 64 * 1024 + 256
+    swe_calc_ut(
+        universal_time,
+        planet,
+        sidereal_positions_and_speed,
+        byref(result_array),
+        byref(err),
+    )
+    return [result_array[0], result_array[3]]
+
+
 def calc_obliquity(ut):
     err = create_string_buffer(256)
     pos = (c_double * 6)()
@@ -347,6 +440,74 @@ def cotrans(ecliptic, oe):
     return equator
 
 
+def calc_frame_positions(
+    points: list[tuple[list[float], float, float]],
+    universal_time: float,
+    geo_longitude: float,
+    geo_latitude: float,
+    ramc: float,
+    obliquity: float,
+):
+    """Batch form of cotrans, calc_azimuth and calc_house_pos for many
+    points cast into the same chart, reusing one set of buffers.
+    Each point is (cotrans input, tropical longitude, ecliptic latitude).
+
+    Returns:
+        List[List[float]]: [right ascension, declination, azimuth,
+        true altitude, Campanus house position] for each point"""
+    err = create_string_buffer(256)
+    ecliptic = (c_double * 3)()
+    equator = (c_double * 3)()
+    geo = (c_double * 3)(geo_longitude, geo_latitude, 0)
+    horizon_input = (c_double * 3)()
+    horizon = (c_double * 3)()
+    house_input = (c_double * 2)()
+    campanus_house = ord('C')
+
+    results = []
+    for cotrans_input, tlong, elat in points:
+        ecliptic[0], ecliptic[1], ecliptic[2] = cotrans_input
+        swe_cotrans(ecliptic, byref(equator), -obliquity)
+
+        horizon_input[0] = tlong
+        horizon_input[1] = elat
+        swe_azalt(
+            universal_time,
+            0,
+            byref(geo),
+            0,
+            0,
+            byref(horizon_input),
+            byref(horizon),
+        )
+
+        house_input[0] = tlong
+        house_input[1] = elat
+        house = (
+            swe_house_pos(
+                ramc,
+                geo_latitude,
+                obliquity,
+                campanus_house,
+                house_input,
+                err,
+            )
+            * 30
+            - 30
+        )
+
+        results.append(
+            [
+                equator[0],
+                equator[1],
+                (horizon[0] + 180) % 360,
+                horizon[1],
+                house,
+            ]
+        )
+    return results
+
+
 def calc_meridian_longitude(azimuth: float, altitude: float):
     ratio = cotangent(math.radians(altitude)) / math.cos(math.radians(azimuth))
     meridian_longitude = math.degrees(arccotangent(ratio))
@@ -419,41 +580,69 @@ def calc_signed_moon_elongation(jd_utc: float) -> float:
     return get_signed_orb_to_reference(moon_longitude, sun_longitude)
 
 
-def find_jd_utc_of_elongation(
-    target: float,
-    lower_bound: float,
-    higher_bound: float,
-    precision: int = 5,
-) -> float | None:
-    low = lower_bound
-    high = higher_bound
+# Mean Moon-Sun relative speed in degrees per day, and a floor on it
+SYNODIC_DEGREES_PER_DAY = 360 / 29.530589
+MINIMUM_SYNODIC_DEGREES_PER_DAY = 10
+ELONGATION_TOLERANCE = 1e-7
+ELONGATION_MAX_ITERATIONS = 50
 
-    target_rounded = round(target, precision)
 
-    previous_check = None
+def calc_elongation_crossing(
+    target: float,
+    ut: float,
+    tolerance: float = ELONGATION_TOLERANCE,
+) -> float:
+    """First julian day after ut at which the signed Moon-Sun elongation
+    equals the target, to within tolerance degrees.
+
+    The elongation always increases, so Newton steps on the relative
+    speed converge; any step that leaves the bracket is replaced by
+    bisection."""
+    (sun_longitude, _) = calc_planet_longitude(ut, 0)
+    (moon_longitude, _) = calc_planet_longitude(ut, 1)
+    remaining = (target - (moon_longitude - sun_longitude)) % 360 or 360
+
+    low = ut
+    high = ut + remaining / MINIMUM_SYNODIC_DEGREES_PER_DAY
+    mean_date = ut + remaining / SYNODIC_DEGREES_PER_DAY
+    date = mean_date
+
+    for _ in range(ELONGATION_MAX_ITERATIONS):
+        (sun_longitude, sun_speed) = calc_planet_longitude(date, 0)
+        (moon_longitude, moon_speed) = calc_planet_longitude(date, 1)
+        difference = (
+            moon_longitude - sun_longitude - target + 180
+        ) % 360 - 180
+        # Anywhere in the bracket, mean motion predicts the elongation
+        # to well within half a turn, which picks the right winding
+        expected = (date - mean_date) * SYNODIC_DEGREES_PER_DAY
+        difference += 360 * round((expected - difference) / 360)
+
+        if abs(difference) < tolerance:
+            break
 
-    while True:
-        date = (low + high) / 2
-        test_elongation = calc_signed_moon_elongation(date)
-        test_elongation = round(test_elongation, precision)
+        if difference > 0:
+            high = date
+        else:
+            low = date
 
-        if previous_check and previous_check == test_elongation:
-            return None
+        next_date = date - difference / (moon_speed - sun_speed)
+        if not low < next_date < high:
+            next_date = (low + high) / 2
+        date = next_date
 
-        if target_rounded == test_elongation or high <= low:
-            break
+    return date
 
-        if math.fabs(test_elongation - target_rounded) < 180:
-            if test_elongation > target_rounded:
-                high = date
-            else:
-                low = date
-        else:
-            if test_elongation < target_rounded:
-                high = date
-            else:
-                low = date
 
-        previous_check = test_elongation
+def find_jd_utc_of_elongation(
+    target: float,
+    lower_bound: float,
+    higher_bound: float,
+    precision: int = 5,
+) -> float | None:
+    date = calc_elongation_crossing(target, lower_bound, 10**-precision)
+
+    if date > higher_bound:
+        return None
 
     return date
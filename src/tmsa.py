@@ -9,6 +9,7 @@
 
 import json
 import math
+import multiprocessing
 import os
 import shutil
 import webbrowser
@@ -22,6 +23,8 @@ from src.constants import (
     LABEL_X_COORD,
     VERSION,
 )
+from src.user_interfaces.bulk_import import BulkImport
+from src.user_interfaces.chart_migration import ChartMigration
 from src.user_interfaces.chart_options import ChartOptions
 from src.user_interfaces.ingresses import Ingresses
 from src.user_interfaces.new_chart import NewChart
@@ -226,6 +229,12 @@ class StartPage(Frame):
         Button(self, 'Clear Caches', 0.6, 0.55, 0.2).bind(
             '<Button-1>', lambda _: delay(self.clear_cache)
         )
+        Button(self, 'Import Charts', 0.3, 0.6, 0.2).bind(
+            '<Button-1>', lambda _: delay(BulkImport)
+        )
+        Button(self, 'Migrate Charts', 0.5, 0.6, 0.2).bind(
+            '<Button-1>', lambda _: delay(ChartMigration)
+        )
 
         if not STILL_STARTING_UP:
             return
@@ -359,5 +368,9 @@ class StartPage(Frame):
         # self.chart_for_now.configure(font=font)
 
 
-StartPage()
-main.mainloop()
+# Pool processes run this module again, so the GUI only starts in the
+# process that was launched
+if __name__ == '__main__':
+    multiprocessing.freeze_support()
+    StartPage()
+    main.mainloop()
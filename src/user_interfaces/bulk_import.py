@@ -0,0 +1,115 @@
+# Copyright 2026 James Eshelman, Mike Nelson, Mike Verducci
+
+# This file is part of Time Matters: A Sidereal Astrology Toolkit (TMSA).
+# TMSA is free software: you can redistribute it and/or modify it under the terms of the GNU Affero General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# TMSA is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License along with TMSA. If not, see <https://www.gnu.org/licenses/>.
+
+import os
+import tkinter.filedialog as tkfiledialog
+
+from src import *
+from src.user_interfaces.widgets import *
+from src.utils.bulk_import import (
+    ImportStatus,
+    import_charts,
+    write_import_report,
+)
+from src.utils.gui_utils import ShowHelp
+from src.utils.os_utils import open_file
+
+
+class BulkImport(Frame):
+    def __init__(self):
+        super().__init__()
+        Label(self, 'Client File', 0.15, 0.05, 0.15, anchor=tk.W)
+        self.file = Entry(self, '', 0.3, 0.05, 0.4)
+        self.file.focus()
+        Button(self, 'Choose', 0.7, 0.05, 0.1).bind(
+            '<Button-1>', lambda _: delay(self.choose_file)
+        )
+        Label(self, 'Options', 0.15, 0.1, 0.15, anchor=tk.W)
+        self.options = Entry(self, 'Natal Default', 0.3, 0.1, 0.3)
+        if os.path.exists(STUDENT_FILE):
+            self.options.text = 'Student Natal'
+        Button(self, 'Select', 0.6, 0.1, 0.1).bind(
+            '<Button-1>', lambda _: delay(self.select_options)
+        )
+        self.istemp = Radiogroup(self)
+        Radiobutton(self, self.istemp, 0, 'Permanent Charts', 0.3, 0.15, 0.25)
+        Radiobutton(self, self.istemp, 1, 'Temporary Charts', 0.5, 0.15, 0.25)
+        self.reports = Checkbutton(
+            self, 'Write Chart Reports', 0.3, 0.2, 0.3, focus=False
+        )
+        Button(self, 'Import', 0.2, 0.3, 0.2).bind(
+            '<Button-1>', lambda _: delay(self.import_file)
+        )
+        Button(self, 'Help', 0.4, 0.3, 0.2).bind(
+            '<Button-1>',
+            lambda _: delay(ShowHelp, os.path.join(HELP_PATH, 'import.txt')),
+        )
+        Button(self, 'Back', 0.6, 0.3, 0.2).bind(
+            '<Button-1>', lambda _: delay(self.destroy)
+        )
+        self.status = Label(self, '', 0, 0.4, 1)
+
+    def choose_file(self):
+        name = tkfiledialog.askopenfilename(
+            filetypes=[['Client Files', '.csv .jsonl']]
+        )
+        if name:
+            self.file.text = name
+
+    def select_options(self):
+        name = tkfiledialog.askopenfilename(
+            initialdir=OPTION_PATH, filetypes=[['Option Files', '.opt']]
+        )
+        if not name:
+            return
+        name = name.replace('/', os.path.sep)
+        if not name.startswith(OPTION_PATH):
+            return
+        text = name.replace(OPTION_PATH, '').replace('_', ' ')
+        self.options.text = text[1:-4]
+
+    def import_file(self):
+        self.status.text = ''
+        filename = self.file.text.strip()
+        if not os.path.exists(filename):
+            return self.status.error('Client file not found.', self.file)
+        options = self.options.text.strip() or 'Natal Default'
+        if not os.path.exists(
+            os.path.join(OPTION_PATH, options.replace(' ', '_') + '.opt')
+        ):
+            return self.status.error(
+                f"No options file '{options}'.", self.options
+            )
+        temporary = self.istemp.value == 1
+
+        try:
+            results = import_charts(
+                filename, temporary, options, self.reports.checked
+            )
+        except Exception as e:
+            return self.status.error(f'Unable to read client file: {e}')
+
+        counts = {
+            status: len(
+                [result for result in results if result.status == status]
+            )
+            for status in ImportStatus
+        }
+        self.status.text = (
+            f'{counts[ImportStatus.IMPORTED]} imported, '
+            f'{counts[ImportStatus.DUPLICATE]} duplicates skipped, '
+            f'{counts[ImportStatus.REJECTED]} rejected.'
+        )
+        if any(result.message for result in results):
+            report = os.path.splitext(filename)[0] + '_import_errors.csv'
+            try:
+                write_import_report(results, report)
+            except Exception as e:
+                return self.status.error(f'Unable to write report: {e}')
+            open_file(report)
@@ -17,6 +17,7 @@ from src.user_interfaces.biwheel import Biwheel
 from src.user_interfaces.quadwheel import Quadwheel
 from src.user_interfaces.triwheel import Triwheel
 from src.user_interfaces.uniwheel import Uniwheel
+from src.utils.chart_cache import radix_charts, transit_charts
 from src.utils.chart_utils import make_chart_path
 from src.user_interfaces.widgets import tkmessagebox
 
@@ -39,7 +40,7 @@ def assemble_charts(params, temporary, burst=False):
     if not os.path.exists(filename):
         os.makedirs(os.path.dirname(filename), exist_ok=True)
 
-    chart = ChartObject(params)
+    chart = transit_charts.get(params)
 
     try:
         chart.to_file(filename)
@@ -61,13 +62,13 @@ def assemble_charts(params, temporary, burst=False):
 
     if params.get('chart_type', None) == 'snq':
         if params.get('use_transit'):
-            transit_chart = ChartObject(params).with_role(
+            transit_chart = transit_charts.get(params).with_role(
                 ChartWheelRole.TRANSIT
             )
             progressed_chart = ChartObject(
                 params['progressed_chart']
             ).with_role(ChartWheelRole.PROGRESSED)
-            radix = ChartObject(params['base_chart']).with_role(
+            radix = radix_charts.get(params['base_chart']).with_role(
                 ChartWheelRole.RADIX
             )
             return Triwheel(
@@ -81,7 +82,7 @@ def assemble_charts(params, temporary, burst=False):
             progressed_chart = ChartObject(
                 params['progressed_chart']
             ).with_role(ChartWheelRole.PROGRESSED)
-            radix = ChartObject(params['base_chart']).with_role(
+            radix = radix_charts.get(params['base_chart']).with_role(
                 ChartWheelRole.RADIX
             )
 
@@ -95,8 +96,10 @@ def assemble_charts(params, temporary, burst=False):
     # Kinetic Anlunar
     if params.get('progressed_chart', None) and params.get('ssr_chart', None):
         progressed_chart = params['progressed_chart']
-        transit_chart = ChartObject(params).with_role(ChartWheelRole.TRANSIT)
-        radix = ChartObject(params['base_chart']).with_role(
+        transit_chart = transit_charts.get(params).with_role(
+            ChartWheelRole.TRANSIT
+        )
+        radix = radix_charts.get(params['base_chart']).with_role(
             ChartWheelRole.RADIX
         )
         ssr_chart = params['ssr_chart'].with_role(ChartWheelRole.SOLAR)
@@ -109,12 +112,14 @@ def assemble_charts(params, temporary, burst=False):
 
     # Anlunar
     elif params.get('ssr_chart', None):
-        return_chart = ChartObject(params).with_role(ChartWheelRole.TRANSIT)
+        return_chart = transit_charts.get(params).with_role(
+            ChartWheelRole.TRANSIT
+        )
 
         # This has to be pre-calculated
         ssr_chart = params['ssr_chart'].with_role(ChartWheelRole.SOLAR)
 
-        radix = ChartObject(params['base_chart']).with_role(
+        radix = radix_charts.get(params['base_chart']).with_role(
             ChartWheelRole.RADIX
         )
 
@@ -123,8 +128,10 @@ def assemble_charts(params, temporary, burst=False):
     # Kinetic Solar or Lunar
     elif params.get('progressed_chart', None):
         progressed_chart = params['progressed_chart']
-        transit_chart = ChartObject(params).with_role(ChartWheelRole.TRANSIT)
-        radix = ChartObject(params['base_chart']).with_role(
+        transit_chart = transit_charts.get(params).with_role(
+            ChartWheelRole.TRANSIT
+        )
+        radix = radix_charts.get(params['base_chart']).with_role(
             ChartWheelRole.RADIX
         )
 
@@ -134,12 +141,16 @@ def assemble_charts(params, temporary, burst=False):
 
     # Any other return
     elif params.get('base_chart', None):
-        return_chart = ChartObject(params).with_role(ChartWheelRole.TRANSIT)
-        radix = ChartObject(params['base_chart']).with_role(
+        return_chart = transit_charts.get(params).with_role(
+            ChartWheelRole.TRANSIT
+        )
+        radix = radix_charts.get(params['base_chart']).with_role(
             ChartWheelRole.RADIX
         )
 
         return Biwheel([return_chart, radix], temporary, options)
     else:
-        single_chart = ChartObject(params).with_role(ChartWheelRole.NATAL)
+        single_chart = transit_charts.get(params).with_role(
+            ChartWheelRole.NATAL
+        )
         return Uniwheel([single_chart], temporary, options)
@@ -0,0 +1,91 @@
+# Copyright 2026 James Eshelman, Mike Nelson, Mike Verducci
+
+# This file is part of Time Matters: A Sidereal Astrology Toolkit (TMSA).
+# TMSA is free software: you can redistribute it and/or modify it under the terms of the GNU Affero General Public License as published by the Free Software Foundation,
+# either version 3 of the License, or (at your option) any later version.
+# TMSA is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+# without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+# You should have received a copy of the GNU Affero General Public License along with TMSA. If not, see <https://www.gnu.org/licenses/>.
+
+import os
+
+from src import *
+from src.user_interfaces.widgets import *
+from src.utils.chart_migration import MigrationStatus, migrate_charts
+from src.utils.gui_utils import ShowHelp
+
+# Progress is shown every this many charts
+PROGRESS_STEP = 100
+
+
+class ChartMigration(Frame):
+    def __init__(self):
+        super().__init__()
+        Label(
+            self,
+            'Bring every saved chart up to date with this version.',
+            0,
+            0.05,
+            1,
+        )
+        self.temporary = Checkbutton(
+            self, 'Include Temporary Charts', 0.3, 0.1, 0.4, focus=False
+        )
+        self.temporary.checked = True
+        self.reports = Checkbutton(
+            self, 'Rewrite Chart Reports', 0.3, 0.15, 0.4, focus=False
+        )
+        self.restart = Checkbutton(
+            self, 'Start Over', 0.3, 0.2, 0.4, focus=False
+        )
+        Button(self, 'Migrate', 0.2, 0.3, 0.2).bind(
+            '<Button-1>', lambda _: delay(self.migrate)
+        )
+        Button(self, 'Help', 0.4, 0.3, 0.2).bind(
+            '<Button-1>',
+            lambda _: delay(ShowHelp, os.path.join(HELP_PATH, 'migrate.txt')),
+        )
+        Button(self, 'Back', 0.6, 0.3, 0.2).bind(
+            '<Button-1>', lambda _: delay(self.destroy)
+        )
+        self.status = Label(self, '', 0, 0.4, 1)
+        self.failures = Label(self, '', 0, 0.45, 1, 0.4, anchor=tk.NW)
+
+    def show_progress(self, done, total):
+        if done % PROGRESS_STEP == 0 or done == total:
+            self.status.text = f'Migrated {done} of {total} charts...'
+            self.update_idletasks()
+
+    def migrate(self):
+        self.status.text = 'Finding charts...'
+        self.failures.text = ''
+        self.update_idletasks()
+        try:
+            summary = migrate_charts(
+                include_temporary=self.temporary.checked,
+                write_reports=self.reports.checked,
+                restart=self.restart.checked,
+                progress=self.show_progress,
+            )
+        except Exception as e:
+            return self.status.error(f'Migration stopped: {e}')
+        self.restart.checked = False
+
+        text = (
+            f'{summary.total} charts: '
+            f'{summary.counts[MigrationStatus.MIGRATED]} migrated, '
+            f'{summary.counts[MigrationStatus.UNCHANGED]} already current'
+        )
+        if summary.resumed:
+            text += f', {summary.resumed} done before'
+        if summary.reports_written:
+            text += f', {summary.reports_written} reports rewritten'
+        if summary.failures:
+            text += f', {len(summary.failures)} failed'
+            self.status.error(text + '.')
+            self.failures.text = '\n'.join(
+                f'{os.path.basename(failure.path)}: {failure.message}'
+                for failure in summary.failures[:10]
+            )
+        else:
+            self.status.text = text + '.'
@@ -10,6 +10,7 @@
 import bisect
 import copy
 import math
+import os
 import tkinter.messagebox as tkmessagebox
 from abc import ABCMeta, abstractmethod
 from datetime import datetime
@@ -23,9 +24,12 @@ import src.models.charts as chart_models
 import src.models.options as option_models
 import src.utils.calculation_utils as calc_utils
 import src.utils.chart_utils as chart_utils
+from src.utils.aspect_index import AspectIndex
 from src.utils.format_utils import to360
 from src.utils.log_utils import Tracer
 from src.utils.novien import (
+    calc_novien_aspects,
+    calc_novien_chart,
     write_novien_aspectarian,
     write_novien_data_table_to_file,
 )
@@ -96,46 +100,58 @@ class CoreChart(object, metaclass=ABCMeta):
             or not chart.name,
         )
         self.filename = self.filename[0:-3] + 'txt'
+        # Written beside the report and moved over it when complete, so a
+        # report is never left half written
+        temporary_filename = self.filename + '.tmp'
         try:
-            chartfile = open(self.filename, 'w', encoding='utf-8-sig')
+            chartfile = open(temporary_filename, 'w', encoding='utf-8-sig')
         except Exception as e:
             tkmessagebox.showerror(f'Unable to open file:', f'{e}')
             return
 
-        with chartfile:
-            self.draw_chart(chartfile)
-            self.write_info_table(chartfile)
+        try:
+            with chartfile:
+                self.draw_chart(chartfile)
+                self.write_info_table(chartfile)
 
-            if self.options.enable_novien:
-                chartfile.write('\n' + '-' * self.table_width + '\n')
-                chartfile.write(
-                    chart_utils.center_align(
-                        'Novienic Equivalent', width=self.table_width
+                if self.options.enable_novien:
+                    chartfile.write('\n' + '-' * self.table_width + '\n')
+                    chartfile.write(
+                        chart_utils.center_align(
+                            'Novienic Equivalent', width=self.table_width
+                        )
+                    )
+                    chartfile.write('\n' + '-' * self.table_width)
+                    write_novien_data_table_to_file(
+                        self.charts[0], self.options, chartfile
+                    )
+                    novien_pseudo_chart = calc_novien_chart(
+                        self.charts[0], self.options
                     )
-                )
-                chartfile.write('\n' + '-' * self.table_width)
-                novien_data = write_novien_data_table_to_file(
-                    self.charts[0], self.options, chartfile
-                )
-                novien_pseudo_chart = chart_models.ChartObject(
-                    self.charts[0].to_dict()
-                ).with_role(chart_models.ChartWheelRole.NOVIEN)
-                for (planet, data) in novien_data.items():
-                    novien_pseudo_chart.planets[planet] = data
-
-                novien_aspects_by_class = calc_utils.calc_novien_aspects(
-                    self.charts[0], novien_pseudo_chart, self.options
-                )
-                write_novien_aspectarian(
-                    novien_aspects_by_class, chartfile, self.table_width
-                )
-                chartfile.write('-' * self.table_width + '\n')
 
-            else:
-                chartfile.write('\n' + '-' * self.table_width + '\n')
-            chartfile.write(
-                f"Created by Time Matters {constants.VERSION}  ({datetime.now().strftime('%d %b %Y')})"
-            )
+                    novien_aspects_by_class = calc_novien_aspects(
+                        self.charts[0], novien_pseudo_chart, self.options
+                    )
+                    write_novien_aspectarian(
+                        novien_aspects_by_class, chartfile, self.table_width
+                    )
+                    chartfile.write('-' * self.table_width + '\n')
+
+                else:
+                    chartfile.write('\n' + '-' * self.table_width + '\n')
+                chartfile.write(
+                    f"Created by Time Matters {constants.VERSION}  ({datetime.now().strftime('%d %b %Y')})"
+                )
+            os.replace(temporary_filename, self.filename)
+        except Exception as e:
+            try:
+                os.remove(temporary_filename)
+            except OSError:
+                pass
+            tkmessagebox.showerror('Unable to write file:', f'{e}')
+            # Raised on, so a migration or import counts the report as
+            # not written
+            raise
 
     def insert_planet_into_line(
         self,
@@ -1134,13 +1150,16 @@ class CoreChart(object, metaclass=ABCMeta):
         paran_aspect = None
 
         if self.options.paran_aspects.get('enabled', False):
-            paran_aspect = calc_utils.calc_major_angle_paran(
-                primary_planet_data,
-                secondary_planet_data,
-                self.options,
-                outermost_chart.geo_latitude,
-                whole_chart_is_dormant,
-            )
+            try:
+                paran_aspect = calc_utils.calc_major_angle_paran(
+                    primary_planet_data,
+                    secondary_planet_data,
+                    self.options,
+                    outermost_chart.geo_latitude,
+                    whole_chart_is_dormant,
+                )
+            except calc_utils.ParanCalculationError as e:
+                tkmessagebox.showerror('Paran calculation error', str(e))
 
         if (
             from_chart_type.value
@@ -1519,7 +1538,7 @@ class CoreChart(object, metaclass=ABCMeta):
         if not whole_chart_is_dormant:
             self.write_cosmic_state(
                 chartfile,
-                aspects_by_class,
+                AspectIndex(aspects_by_class),
                 angularities_as_aspects,
             )
 
@@ -1834,7 +1853,7 @@ class CoreChart(object, metaclass=ABCMeta):
     def write_cosmic_state(
         self,
         chartfile: TextIOWrapper,
-        aspects_by_class: list[list[chart_models.Aspect]],
+        aspects_by_point: AspectIndex,
         angularities_as_aspects: list[chart_models.AngleContactAspect],
     ):
         chartfile.write(
@@ -1925,7 +1944,7 @@ class CoreChart(object, metaclass=ABCMeta):
                     and chart.type.value == chart_models.ChartType.NATAL.value
                 ):
                     strength = calc_utils.calc_planetary_needs_strength(
-                        planet_data, chart, aspects_by_class
+                        planet_data, chart, aspects_by_point
                     )
                     chartfile.write((f'{round(strength): >3}%'))
                     strength_hierarchy_written = True
@@ -1984,28 +2003,19 @@ class CoreChart(object, metaclass=ABCMeta):
 
                 aspect_list = []
 
-                for class_index in range(3):
-                    for aspect in aspects_by_class[class_index]:
-                        if (
-                            aspect.from_planet_short_name == planet_short_name
-                            and aspect.from_planet_role.value
-                            == chart.role.value
-                        ) or (
-                            aspect.to_planet_short_name == planet_short_name
-                            and aspect.to_planet_role.value == chart.role.value
-                        ):
-                            # This lets us sort by strength descending, basically;
-                            # The sort is still ascending, but the strength is inverted.
-                            percent = str(200 - aspect.strength)
-                            aspect_list.append(
-                                [
-                                    aspect.cosmic_state_format(
-                                        planet_short_name
-                                    ),
-                                    percent,
-                                    aspect.orb,
-                                ]
-                            )
+                for (_, aspect) in aspects_by_point.aspects_of(
+                    planet_short_name, chart.role, class_count=3
+                ):
+                    # This lets us sort by strength descending, basically;
+                    # The sort is still ascending, but the strength is inverted.
+                    percent = str(200 - aspect.strength)
+                    aspect_list.append(
+                        [
+                            aspect.cosmic_state_format(planet_short_name),
+                            percent,
+                            aspect.orb,
+                        ]
+                    )
 
                 aspect_list.sort(key=lambda p: p[1] + str(p[2]))
 
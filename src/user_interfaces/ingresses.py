@@ -26,8 +26,15 @@ from src.user_interfaces.chart_assembler import assemble_charts
 from src.user_interfaces.locations import Locations
 from src.user_interfaces.more_charts import MoreCharts
 from src.user_interfaces.widgets import *
+from src.utils.burst_manifest import BurstManifest, burst_manifest_key
 from src.utils.format_utils import display_name, normalize_text
 from src.utils.gui_utils import ShowHelp, open_file
+from src.utils.ingress_almanac import (
+    MOON,
+    SUN,
+    calc_ingress_crossing,
+    cardinal_target,
+)
 
 
 class Ingresses(Frame):
@@ -689,18 +696,11 @@ class Ingresses(Frame):
             chart['style'],
         )
         for ing in ingresses:
-            if 'Ari' in ing:
-                target = 0
-            if 'Can' in ing:
-                target = 90
-            if 'Lib' in ing:
-                target = 180
-            if 'Cap' in ing:
-                target = 270
+            target = cardinal_target(ing)
             if 'solar' in ing:
-                date = calc_sun_crossing(target, start)
+                date = calc_ingress_crossing(SUN, target, start)
             if 'lunar' in ing:
-                date = calc_moon_crossing(target, start)
+                date = calc_ingress_crossing(MOON, target, start)
             self.make_chart(chart, date, ing)
 
     def bsearch(self, chart, ingresses):
@@ -712,22 +712,15 @@ class Ingresses(Frame):
             chart['style'],
         )
         for ing in ingresses:
-            if 'Ari' in ing:
-                target = 0
-            if 'Can' in ing:
-                target = 90
-            if 'Lib' in ing:
-                target = 180
-            if 'Cap' in ing:
-                target = 270
+            target = cardinal_target(ing)
             if 'solar' in ing:
-                date = calc_sun_crossing(target, start - 184)
+                date = calc_ingress_crossing(SUN, target, start - 184)
                 if date > start:
-                    date = calc_sun_crossing(target, start - 367)
+                    date = calc_ingress_crossing(SUN, target, start - 367)
             if 'lunar' in ing:
-                date = calc_moon_crossing(target, start - 15)
+                date = calc_ingress_crossing(MOON, target, start - 15)
                 if date > start:
-                    date = calc_moon_crossing(target, start - 29)
+                    date = calc_ingress_crossing(MOON, target, start - 29)
             self.make_chart(chart, date, ing)
 
     def burst(self, chart, ingresses):
@@ -740,31 +733,24 @@ class Ingresses(Frame):
         )
         if self.search.value == 2:
             start -= 366
+        # Charts an interrupted burst already made are not made again
+        manifests = {
+            ing: BurstManifest.load(
+                burst_manifest_key(None, ing, chart, self.istemp.value), start
+            )
+            for ing in ingresses
+        }
         for ing in ingresses:
             if 'solar' in ing:
-                if 'Ari' in ing:
-                    target = 0
-                if 'Can' in ing:
-                    target = 90
-                if 'Lib' in ing:
-                    target = 180
-                if 'Cap' in ing:
-                    target = 270
-                date = calc_sun_crossing(target, start)
-                self.make_chart(chart, date, ing, False)
+                target = cardinal_target(ing)
+                date = calc_ingress_crossing(SUN, target, start)
+                self.make_burst_chart(manifests[ing], chart, date, ing)
         for i in range(0, 366, 26):
             for ing in ingresses:
                 if 'lunar' in ing:
-                    if 'Ari' in ing:
-                        target = 0
-                    if 'Can' in ing:
-                        target = 90
-                    if 'Lib' in ing:
-                        target = 180
-                    if 'Cap' in ing:
-                        target = 270
-                    date = calc_moon_crossing(target, start + i)
-                    self.make_chart(chart, date, ing, False)
+                    target = cardinal_target(ing)
+                    date = calc_ingress_crossing(MOON, target, start + i)
+                    self.make_burst_chart(manifests[ing], chart, date, ing)
                     if date > start + 366:
                         continue
         self.status.text = 'Charts complete.'
@@ -779,25 +765,17 @@ class Ingresses(Frame):
             chart['style'],
         )
         for ing in ingresses:
-            cchart = deepcopy(chart)
-            if 'Ari' in ing:
-                target = 0
-            if 'Can' in ing:
-                target = 90
-            if 'Lib' in ing:
-                target = 180
-            if 'Cap' in ing:
-                target = 270
+            target = cardinal_target(ing)
             if 'solar' in ing:
-                date = calc_sun_crossing(target, start - 184)
+                date = calc_ingress_crossing(SUN, target, start - 184)
                 if date > start:
-                    date = calc_sun_crossing(target, start - 367)
+                    date = calc_ingress_crossing(SUN, target, start - 367)
                 found = True
                 self.make_chart(chart, date, ing)
             if 'lunar' in ing:
-                date = calc_moon_crossing(target, start - 15)
+                date = calc_ingress_crossing(MOON, target, start - 15)
                 if date > start:
-                    date = calc_moon_crossing(target, start - 29)
+                    date = calc_ingress_crossing(MOON, target, start - 29)
                 found = True
                 self.make_chart(chart, date, ing)
         if not found:
@@ -815,10 +793,18 @@ class Ingresses(Frame):
         cchart['class'] = 'I'
         cchart['correction'] = 0
         cchart['zone'] = 'UT'
+        chart_class = assemble_charts(cchart, self.istemp.value)
         if show:
-            assemble_charts(cchart, self.istemp.value).show()
-        else:
-            assemble_charts(cchart, self.istemp.value)
+            chart_class.show()
+        return chart_class
+
+    def make_burst_chart(self, manifest, chart, date, chtype):
+        manifest.add_return(date)
+        if manifest.has_chart(date):
+            return
+        chart_class = self.make_chart(chart, date, chtype, False)
+        if chart_class:
+            manifest.record_chart(date, chart_class.filename)
 
     def save_location(self, chart):
         try:
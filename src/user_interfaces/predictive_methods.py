@@ -23,7 +23,7 @@ from src import *
 from src import swe
 from src.constants import DQ, DS, MONTHS, VERSION
 from src.models.charts import ChartObject, ChartType, ChartWheelRole
-from src.models.options import ProgramOptions
+from src.models.options import Options, ProgramOptions
 from src.swe import *
 from src.user_interfaces.chart_assembler import assemble_charts
 from src.user_interfaces.locations import Locations
@@ -34,7 +34,13 @@ from src.utils.format_utils import (
     normalize_text,
     toDMS,
 )
-from src.utils.gui_utils import ShowHelp
+from src.utils.chart_utils import make_chart_path
+from src.utils.gui_utils import ShowHelp, open_file
+from src.utils.quotidian import (
+    calc_snq_timeline,
+    snq_progressed_params,
+    write_snq_timeline_to_file,
+)
 from src.utils.transits.progressions import (
     ProgressionTypes,
     get_progressed_jd_utc,
@@ -172,6 +178,17 @@ class PredictiveMethods(Frame):
         Radiobutton(self, self.istemp, 1, 'Temporary Charts', 0.5, 0.7, 0.25)
         self.istemp.value = 1
 
+        Label(self, 'SNQ Timeline Days', 0.15, 0.75, 0.15, anchor=tk.W)
+        self.timeline_days = Entry(self, '365', 0.3, 0.75, 0.1)
+        Label(self, 'Step Hours', 0.4, 0.75, 0.1)
+        self.timeline_step = Entry(self, '24', 0.5, 0.75, 0.1)
+        self.timeline_charts = Checkbutton(
+            self, 'Charts', 0.6, 0.75, 0.1, focus=False
+        )
+        Button(self, 'Timeline', 0.7, 0.75, 0.1).bind(
+            '<Button-1>', lambda _: delay(self.timeline)
+        )
+
         Button(self, 'Calculate', 0, 0.95, 0.2).bind(
             '<Button-1>', lambda _: delay(self.calculate)
         )
@@ -490,7 +507,7 @@ class PredictiveMethods(Frame):
         self.destroy()
         PredictiveMethods(self.base, self.filename)
 
-    def calculate(self):
+    def read_params(self):
         self.status.text = ''
         self.findbtn.disabled = False
         params = {}
@@ -610,6 +627,13 @@ class PredictiveMethods(Frame):
         params['type'] = ChartType.SIDEREAL_NATAL_QUOTIDIAN.value
         params['use_transit'] = False
 
+        return params
+
+    def calculate(self):
+        params = self.read_params()
+        if not params:
+            return
+
         radix = ChartObject(params['base_chart']).with_role(
             ChartWheelRole.RADIX
         )
@@ -629,43 +653,90 @@ class PredictiveMethods(Frame):
             progression_type=ProgressionTypes.Q2.value,
         )
 
-        (p_year, p_month, p_day, p_time) = swe.revjul(
-            progressed_jd, params['style']
+        params['name'] = params['base_chart']['name']
+        params['progressed_chart'] = snq_progressed_params(
+            params, progressed_jd
         )
 
-        p_hour = int(p_time)
-        p_min = int((p_time - (int(p_time))) * 60)
-        p_sec = int(
-            (
-                ((p_time - (int(p_time))) * 60)
-                - int((p_time - (int(p_time))) * 60)
-            )
-            * 60
+        self.make_chart(
+            params, progressed_jd, ChartType.SIDEREAL_NATAL_QUOTIDIAN, 'Q'
         )
 
-        print(
-            f'Derived progression date: {p_hour}:{p_min}:{p_sec} - {p_month} {p_day} {p_year}'
-        )
+    def timeline(self):
+        params = self.read_params()
+        if not params:
+            return
+        try:
+            days = float(self.timeline_days.text)
+            step_hours = float(self.timeline_step.text)
+        except Exception:
+            return self.status.error(
+                'Days and step must be numeric.', self.timeline_days
+            )
+        if days <= 0 or step_hours <= 0:
+            return self.status.error(
+                'Days and step must be greater than 0.', self.timeline_days
+            )
+        try:
+            optfile = params['options'].replace(' ', '_') + '.opt'
+            with open(os.path.join(OPTION_PATH, optfile)) as datafile:
+                options = Options(json.load(datafile))
+        except Exception:
+            return self.status.error(f"Unable to open '{optfile}'.")
 
         params['name'] = params['base_chart']['name']
+        radix = ChartObject(params['base_chart'])
+        start_jd = swe.julday(
+            params['year'],
+            params['month'],
+            params['day'],
+            params['time'],
+            params['style'],
+        )
+        timeline = calc_snq_timeline(
+            radix,
+            start_jd,
+            start_jd + days,
+            step_hours / 24,
+            params['latitude'],
+            params['longitude'],
+            options,
+        )
 
-        params['progressed_chart'] = {
-            'year': p_year,
-            'month': p_month,
-            'day': p_day,
-            'time': p_time,
-            'zone': 'UT',
-            'correction': 0,
-            'type': ChartType.SIDEREAL_NATAL_QUOTIDIAN.value,
-            'location': params['location'],
-            'longitude': params['longitude'],
-            'latitude': params['latitude'],
-            'name': params['base_chart']['name'],
-        }
-
-        self.make_chart(
-            params, progressed_jd, ChartType.SIDEREAL_NATAL_QUOTIDIAN, 'Q'
+        filename = make_chart_path(
+            {**params, 'type': 'SNQ Timeline'}, self.istemp.value
         )
+        filename = os.path.splitext(filename)[0] + '.txt'
+        try:
+            os.makedirs(os.path.dirname(filename), exist_ok=True)
+            with open(filename, 'w') as timelinefile:
+                write_snq_timeline_to_file(
+                    timeline, params['style'], timelinefile
+                )
+        except Exception as e:
+            return self.status.error(f'Unable to save timeline: {e}')
+
+        if self.timeline_charts.checked:
+            for step in timeline.flagged_steps():
+                (year, month, day, time) = revjul(
+                    timeline.julian_days[step], params['style']
+                )
+                assemble_charts(
+                    {
+                        **params,
+                        'year': year,
+                        'month': month,
+                        'day': day,
+                        'time': time,
+                        'progressed_chart': snq_progressed_params(
+                            params, timeline.progressed_julian_days[step]
+                        ),
+                    },
+                    self.istemp.value,
+                    burst=True,
+                )
+
+        open_file(filename)
 
     def make_chart(self, params, date, chtype, cclass, show=True):
         cchart = deepcopy(params)
@@ -86,6 +86,16 @@ class ProgramOptionsMenu(Frame):
         if os.path.exists(STUDENT_FILE):
             self.isstudent.value = 1
 
+        Label(self, 'Ingress Almanac Years', 0.2, 0.5, 0.2, anchor=tk.W)
+        self.almanac_start = Entry(self, '', 0.4, 0.5, 0.1)
+        self.almanac_start.bind(
+            '<KeyRelease>', lambda _: delay(check_num, self.almanac_start)
+        )
+        self.almanac_end = Entry(self, '', 0.5, 0.5, 0.1)
+        self.almanac_end.bind(
+            '<KeyRelease>', lambda _: delay(check_num, self.almanac_end)
+        )
+
         Label(self, 'Home Location', 0.15, 0.55, 0.15, anchor=tk.W)
         self.loc = Entry(self, '', 0.3, 0.55, 0.3)
         self.loc.bind('<KeyRelease>', lambda _: self.enable_find)
@@ -160,6 +170,10 @@ class ProgramOptionsMenu(Frame):
         self.quarti_returns_enabled.checked = (
             self.program_options.quarti_returns_enabled
         )
+        self.almanac_start.text = (
+            self.program_options.ingress_almanac_start_year
+        )
+        self.almanac_end.text = self.program_options.ingress_almanac_end_year
 
         if HOME_LOC:
             self.loc.text = HOME_LOC[0]
@@ -459,10 +473,28 @@ class ProgramOptionsMenu(Frame):
             return False
 
     def save_program_options(self):
+        try:
+            start_year = int(self.almanac_start.text)
+            end_year = int(self.almanac_end.text)
+        except ValueError:
+            self.status.error(
+                'Ingress almanac years must be whole numbers.',
+                self.almanac_start,
+            )
+            return False
+        if start_year >= end_year:
+            self.status.error(
+                'Ingress almanac must start before it ends.',
+                self.almanac_start,
+            )
+            return False
+
         try:
             self.program_options.quarti_returns_enabled = (
                 self.quarti_returns_enabled.checked
             )
+            self.program_options.ingress_almanac_start_year = start_year
+            self.program_options.ingress_almanac_end_year = end_year
 
             self.program_options.to_file(PROGRAM_OPTION_PATH)
         except:
@@ -14,7 +14,6 @@ import tkinter.filedialog as tkfiledialog
 import tkinter.messagebox as tkmessagebox
 
 from src import *
-from src.models.charts import INGRESSES
 from src.models.options import ProgramOptions
 from src.user_interfaces.more_charts import MoreCharts
 from src.user_interfaces.new_chart import NewChart
@@ -22,7 +21,11 @@ from src.user_interfaces.predictive_methods import PredictiveMethods
 from src.user_interfaces.solunars_all_in_one import SolunarsAllInOne
 from src.user_interfaces.widgets import *
 from src.user_interfaces.widgets import main
-from src.utils.chart_utils import make_chart_path
+from src.utils.chart_migration import (
+    MigrationStatus,
+    is_legacy_path,
+    migrate_chart_file,
+)
 from src.utils.format_utils import display_name, parse_version_from_txt_file
 from src.utils.gui_utils import (
     ShowHelp,
@@ -365,33 +368,16 @@ class SelectChart(Frame):
             return
 
     def migrate(self, filename):
-        if filename.count('~') > 1:
+        if not is_legacy_path(filename):
             return filename
-        path = os.path.join(CHART_PATH, filename[0], filename)
-        try:
-            with open(filename) as datafile:
-                chart = json.load(datafile)
-            newpath = make_chart_path(
-                chart,
-                False,
-                is_ingress=True
-                if chart.type in INGRESSES or not chart.name
-                else False,
-            )
-            if not os.path.exists(newpath):
-                os.makedirs(os.path.dirname(newpath), exist_ok=True)
-            shutil.move(path, newpath)
-            tpath = path[0:-3] + 'txt'
-            tnewpath = newpath[0:-3] + 'txt'
-            shutil.move(tpath, tnewpath)
-            self.recs[0] = newpath
-            self.recnames[0] = display_name(newpath)
-            self.save_files()
-            self.load_files()
-            return newpath
-        except Exception as e:
+        result = migrate_chart_file(filename, filename.startswith(TEMP_CHARTS))
+        if result.status == MigrationStatus.FAILED:
             self.status.error(
-                f"Unable to convert '{os.path.basename(filename)}' to new format ."
+                f"Unable to convert '{os.path.basename(filename)}' to new format: {result.message}"
             )
-            tkmessagebox.showinfo('?', str(e))
             return ''
+        self.recs[0] = result.new_path
+        self.recnames[0] = display_name(result.new_path)
+        self.save_files()
+        self.load_files()
+        return result.new_path
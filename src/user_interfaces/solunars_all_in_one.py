@@ -23,21 +23,9 @@ from geopy import Nominatim
 from src import *
 from src.constants import DQ, DS, MONTHS, VERSION
 from src.models.charts import (
-    ANLUNAR_FAMILY,
-    KAR_FAMILY,
-    KLR_FAMILY,
-    KSR_FAMILY,
-    LSR_FAMILY,
-    LUNAR_RETURN_FAMILY,
     LUNAR_RETURNS,
-    LUNISOLAR_FAMILY,
-    NLR_FAMILY,
-    NSR_FAMILY,
-    SOLAR_RETURN_FAMILY,
     SOLAR_RETURNS,
-    SOLILUNAR_FAMILY,
     SOLUNAR_FAMILIES,
-    ChartObject,
     ChartType,
     ChartWheelRole,
 )
@@ -47,19 +35,32 @@ from src.user_interfaces.chart_assembler import assemble_charts
 from src.user_interfaces.locations import Locations
 from src.user_interfaces.more_charts import MoreCharts
 from src.user_interfaces.widgets import *
+from src.utils.burst_manifest import BurstManifest, burst_manifest_key
+from src.utils.chart_cache import radix_charts
 from src.utils.chart_utils import includes_any
 from src.utils.format_utils import display_name, normalize_text, to360, toDMS
 from src.utils.gui_utils import ShowHelp
 from src.utils.os_utils import open_file
 from src.utils.solunars import (
-    append_applicable_returns,
-    find_novienic_crossings_until_date,
-    find_progressed_anlunar_crossings_until_date,
-    find_progressed_crossings_until_date,
-    find_solunar_crossings_until_date,
+    iter_burst_solunar_returns,
+    iter_solunar_returns,
+    search_solunars,
 )
 
 
+def is_duplicate_chart(
+    already_created_charts: dict, date: float, solunar_type: str
+) -> bool:
+    truncated_date = int(date)
+    if truncated_date in already_created_charts:
+        if solunar_type in already_created_charts[truncated_date]:
+            return True
+        already_created_charts[truncated_date].append(solunar_type)
+    else:
+        already_created_charts[truncated_date] = [solunar_type]
+    return False
+
+
 class SolunarsAllInOne(Frame):
     def __init__(self, base, filename, program_options: ProgramOptions):
         super().__init__()
@@ -891,7 +892,7 @@ class SolunarsAllInOne(Frame):
         params['notes'] = normalize_text(self.notes.text, True)
         params['options'] = self.options.text.strip()
         params['base_chart'] = self.base
-        params['radix'] = ChartObject(self.base).with_role(
+        params['radix'] = radix_charts.get(self.base).with_role(
             ChartWheelRole.RADIX
         )
 
@@ -929,23 +930,38 @@ class SolunarsAllInOne(Frame):
             if duration == 0:
                 duration = None
 
+        # Bursts pick up from the returns and charts they already made
+        burst_manifests = {}
+        if duration:
+            burst_manifests = {
+                solunar_type: BurstManifest.load(
+                    burst_manifest_key(
+                        self.base, solunar_type, params, self.istemp.value
+                    ),
+                    input_date,
+                )
+                for solunar_type in solars + lunars
+            }
+
         # Active
         if self.search.value == 0:
-            dates_and_chart_params = self.search_solunars(
+            dates_and_chart_params = search_solunars(
                 params, solars, lunars, active=True
             )
             if duration:
-                burst_chart_params = self.search_solunars(
-                    params, solars, lunars, burst_months=duration
+                burst_chart_params = list(
+                    iter_burst_solunar_returns(
+                        params, solars, lunars, duration, burst_manifests
+                    )
                 )
                 dates_and_chart_params += burst_chart_params
 
         # Nearest
         elif self.search.value == 1:
-            active_chart_params = self.search_solunars(
+            active_chart_params = search_solunars(
                 params, solars, lunars, active=True
             )
-            forward_chart_params = self.search_solunars(params, solars, lunars)
+            forward_chart_params = search_solunars(params, solars, lunars)
 
             for chart_type in solars + lunars:
                 active_chart_info = pydash.find(
@@ -968,15 +984,23 @@ class SolunarsAllInOne(Frame):
                     dates_and_chart_params.append(future_chart_info)
 
             if duration:
-                burst_chart_params = self.search_solunars(
-                    params, solars, lunars, burst_months=duration
+                burst_chart_params = list(
+                    iter_burst_solunar_returns(
+                        params, solars, lunars, duration, burst_manifests
+                    )
                 )
                 dates_and_chart_params += burst_chart_params
 
         # Next
         elif self.search.value == 2:
-            dates_and_chart_params = self.search_solunars(
-                params, solars, lunars, burst_months=duration
+            # Charts are made as each return is found, so earliest first
+            return self.make_charts_in_order(
+                iter_burst_solunar_returns(
+                    params, solars, lunars, duration, burst_manifests
+                )
+                if duration
+                else iter_solunar_returns(params, solars, lunars),
+                burst_manifests,
             )
         else:
             self.status.error('No search direction selected.')
@@ -986,6 +1010,7 @@ class SolunarsAllInOne(Frame):
             return
 
         charts_created = 0
+        charts_already_made = 0
 
         # Skip duplicates
         already_created_charts = {}
@@ -1039,423 +1064,95 @@ class SolunarsAllInOne(Frame):
                     continue
                 # Allow upcoming charts within 1 day
 
-            truncated_date = int(date)
-            if truncated_date in already_created_charts:
-                if solunar_type in already_created_charts[truncated_date]:
-                    continue
-                else:
-                    already_created_charts[truncated_date].append(solunar_type)
-            else:
-                already_created_charts[truncated_date] = [solunar_type]
+            if is_duplicate_chart(already_created_charts, date, solunar_type):
+                continue
 
-            self.make_chart(
+            if self.make_burst_chart(
+                burst_manifests,
                 chart_params,
                 date,
                 solunar_type,
                 chart_class,
-            )
+            ):
+                charts_created += 1
+            else:
+                charts_already_made += 1
 
             if chart_is_active:
                 active_charts_found.append(solunar_type)
 
-            charts_created += 1
-
-        s = '' if charts_created == 1 else 's'
-        self.status.text = f'{charts_created} chart{s} created.'
-
-    def search_solunars(
-        self,
-        params: dict,
-        solars: list[str],
-        lunars: list[str],
-        burst_months=None,
-        active=False,
-    ):
-        dates_and_chart_params: list[tuple[any]] = []
-
-        radix = params['radix']
-
-        base_start = julday(
-            params['year'],
-            params['month'],
-            params['day'],
-            params['time'],
-            params['style'],
+        self.status.text = self.charts_made_text(
+            charts_created, charts_already_made
         )
 
-        def _append_returns(
-            returns, chart_type, chart_class, override_params=None
-        ):
-            append_applicable_returns(
-                returns=returns,
-                return_args_list=dates_and_chart_params,
-                args=(
-                    override_params or params,
-                    None,
-                    chart_type,
-                    chart_class,
-                ),
-                burst=burst_months is not None and burst_months > 0,
-                active=active,
-                base_start=base_start,
-            )
-
-        def append_lunars(returns, chart_type, override_params=None):
-            _append_returns(
-                returns, chart_type, 'LR', override_params=override_params
-            )
-
-        def append_solars(returns, chart_type, override_params=None):
-            _append_returns(
-                returns, chart_type, 'SR', override_params=override_params
-            )
-
-        continue_until_date = None
-
-        if burst_months:
-            continue_until_date = base_start + (30 * burst_months)
-
-        sun_radix_longitude = radix.planets['Sun'].longitude
-        moon_radix_longitude = radix.planets['Moon'].longitude
-
-        for solar_return_type in solars:
-            cycle_length = 366
-
-            continue_until_date_solar = continue_until_date or (
-                base_start if active else base_start + 365
-            )
-
-            # Traditional Solar Returns
-            if solar_return_type in SOLAR_RETURN_FAMILY:
-                starting_date = base_start - 365 if active else base_start
-
-                returns = find_solunar_crossings_until_date(
-                    base_start=starting_date,
-                    continue_until_date=continue_until_date_solar,
-                    target_body='Sun',
-                    target_longitude=sun_radix_longitude,
-                    cycle_length=cycle_length,
-                    solunar_type=solar_return_type,
-                    grace_period=10,
-                )
-
-                append_solars(returns, solar_return_type)
-                continue
-
-            elif solar_return_type in NSR_FAMILY:
-                if solar_return_type == ChartType.NOVIENIC_SOLAR_RETURN.value:
-                    starting_date = base_start - 41 if active else base_start
-                else:
-                    starting_date = base_start - 11 if active else base_start
-
-                returns = find_novienic_crossings_until_date(
-                    base_start=starting_date,
-                    continue_until_date=continue_until_date_solar,
-                    target_body='Sun',
-                    target_longitude=sun_radix_longitude,
-                    cycle_length=cycle_length,
-                    solunar_type=solar_return_type,
-                    grace_period=1,
-                )
-
-                append_solars(returns, solar_return_type)
-                continue
-
-            elif solar_return_type in SOLILUNAR_FAMILY:
-                starting_date = base_start - 365 if active else base_start
-
-                returns = find_solunar_crossings_until_date(
-                    base_start=starting_date,
-                    continue_until_date=continue_until_date_solar,
-                    target_body='Sun',
-                    target_longitude=moon_radix_longitude,
-                    cycle_length=cycle_length,
-                    solunar_type=solar_return_type,
-                    grace_period=10,
-                )
-
-                append_solars(returns, solar_return_type)
-                continue
-
-            elif solar_return_type in KSR_FAMILY:
-                starting_date = base_start - 365 if active else base_start
-
-                returns = find_progressed_crossings_until_date(
-                    base_start=starting_date,
-                    radix_julian_day_utc=radix.julian_day_utc,
-                    continue_until_date=continue_until_date_solar,
-                    target_body='Sun',
-                    radix_sun_longitude=sun_radix_longitude,
-                    cycle_length=cycle_length,
-                    solunar_type=solar_return_type,
-                    grace_period=10,
-                )
-
-                append_solars(returns, solar_return_type)
-                continue
-
-        for lunar_return_type in lunars:
-            cycle_length = 29
-
-            continue_until_date_lunar = continue_until_date or (
-                base_start if active else base_start + 29
-            )
-
-            if lunar_return_type in LUNAR_RETURN_FAMILY:
-                starting_date = (base_start - 29) if active else base_start
-
-                returns = find_solunar_crossings_until_date(
-                    base_start=starting_date,
-                    continue_until_date=continue_until_date_lunar,
-                    target_body='Moon',
-                    target_longitude=moon_radix_longitude,
-                    cycle_length=cycle_length,
-                    solunar_type=lunar_return_type,
-                    grace_period=1,
-                )
-
-                append_lunars(returns, lunar_return_type)
-                continue
-
-            elif lunar_return_type in NLR_FAMILY:
-                starting_date = base_start - 3.5 if active else base_start
-
-                returns = find_novienic_crossings_until_date(
-                    base_start=starting_date,
-                    continue_until_date=continue_until_date_lunar,
-                    target_body='Moon',
-                    target_longitude=moon_radix_longitude,
-                    cycle_length=3.5,
-                    solunar_type=lunar_return_type,
-                    grace_period=0.5,
-                )
-
-                append_lunars(returns, lunar_return_type)
-                continue
-
-            elif lunar_return_type in LUNISOLAR_FAMILY:
-                starting_date = base_start - 29 if active else base_start
-
-                returns = find_solunar_crossings_until_date(
-                    base_start=starting_date,
-                    continue_until_date=continue_until_date_lunar,
-                    target_body='Moon',
-                    target_longitude=sun_radix_longitude,
-                    cycle_length=cycle_length,
-                    solunar_type=lunar_return_type,
-                    grace_period=1,
-                )
-
-                append_lunars(returns, lunar_return_type)
-                continue
-
-            elif lunar_return_type in ANLUNAR_FAMILY:
-                # Need to loop and periodically update the
-                # solar return date and get a new SSR
-
-                last_ssr_date = calc_sun_crossing(
-                    sun_radix_longitude, base_start - 364
-                )
-
-                starting_date = base_start - 29 if active else base_start
-
-                keep_looping = True
-                while keep_looping:
-                    (year, month, day, time) = revjul(
-                        last_ssr_date, params['style']
-                    )
-
-                    ssr_params = {**params}
-                    ssr_params.update(
-                        {
-                            'name': radix.name + ' Solar Return',
-                            'type': ChartType.SOLAR_RETURN.value,
-                            'year': year,
-                            'month': month,
-                            'day': day,
-                            'time': time,
-                        }
-                    )
-
-                    ssr_chart = ChartObject(ssr_params)
-
-                    solar_moon = ssr_chart.planets['Moon'].longitude
-
-                    next_ssr_date = calc_sun_crossing(
-                        sun_radix_longitude, last_ssr_date + 180
-                    )
-
-                    sar_continue_date = min(
-                        continue_until_date_lunar, next_ssr_date
-                    )
-
-                    returns = find_solunar_crossings_until_date(
-                        base_start=starting_date,
-                        continue_until_date=sar_continue_date,
-                        target_body='Moon',
-                        target_longitude=solar_moon,
-                        cycle_length=cycle_length,
-                        solunar_type=lunar_return_type,
-                        grace_period=1,
-                    )
-
-                    append_lunars(
-                        returns,
-                        lunar_return_type,
-                        override_params={**params, 'ssr_chart': ssr_chart},
-                    )
-
-                    if next_ssr_date > continue_until_date_lunar:
-                        keep_looping = False
-
-                    starting_date = next_ssr_date + 2
-                    last_ssr_date = next_ssr_date
-
-                continue
-
-            elif lunar_return_type in LSR_FAMILY:
-                precision = 5
+    def make_charts_in_order(self, dates_and_chart_params, burst_manifests):
+        charts_created = 0
+        charts_already_made = 0
 
-                natal_elongation = get_signed_orb_to_reference(
-                    moon_radix_longitude, sun_radix_longitude
-                )
-                natal_elongation = round(natal_elongation, precision)
-
-                start = base_start - 30 if active else base_start
-
-                while start <= continue_until_date_lunar:
-                    target_elongation = natal_elongation
-                    next_increment = 30
-
-                    if (
-                        lunar_return_type
-                        == ChartType.DEMI_LUNAR_SYNODIC_RETURN.value
-                    ):
-                        if natal_elongation > 0:
-                            target_elongation = natal_elongation - 180
-                        else:
-                            target_elongation = natal_elongation + 180
-
-                        next_increment = 15
-                    elif (
-                        lunar_return_type
-                        == ChartType.LAST_QUARTI_LUNAR_SYNODIC_RETURN.value
-                    ):
-                        target_elongation = natal_elongation - 90
-                        next_increment = 7.5
-                    elif (
-                        lunar_return_type
-                        == ChartType.FIRST_QUARTI_LUNAR_SYNODIC_RETURN.value
-                    ):
-
-                        target_elongation = natal_elongation + 90
-                        next_increment = 7.5
-
-                    if target_elongation > 180:
-                        diff = target_elongation - 180
-                        target_elongation = -1 * (180 - diff)
-
-                    elif target_elongation < -180:
-                        diff = target_elongation + 180
-                        target_elongation = -1 * (-180 - diff)
-
-                    lower_bound = start
-                    higher_bound = start + 30
-
-                    date = find_jd_utc_of_elongation(
-                        target_elongation, lower_bound, higher_bound
-                    )
-                    if date and date < continue_until_date_lunar:
-                        dates_and_chart_params.append(
-                            (params, date, lunar_return_type, 'LR')
-                        )
-                    start += next_increment
+        # Skip duplicates
+        already_created_charts = {}
 
+        for (
+            chart_params,
+            date,
+            solunar_type,
+            chart_class,
+        ) in dates_and_chart_params:
+            if is_duplicate_chart(already_created_charts, date, solunar_type):
                 continue
 
-            elif lunar_return_type in KAR_FAMILY:
-                # Need to loop and periodically update the
-                # solar return date and get a new SSR
-
-                last_ssr_date = calc_sun_crossing(
-                    sun_radix_longitude, base_start - 366
-                )
-
-                starting_date = base_start - 29 if active else base_start
-
-                keep_looping = True
-                while keep_looping:
-                    (year, month, day, time) = revjul(
-                        last_ssr_date, params['style']
-                    )
-
-                    ssr_params = {**params}
-                    ssr_params.update(
-                        {
-                            'name': radix.name + ' Solar Return',
-                            'type': ChartType.SOLAR_RETURN.value,
-                            'year': year,
-                            'month': month,
-                            'day': day,
-                            'time': time,
-                        }
-                    )
-
-                    ssr_chart = ChartObject(ssr_params)
-
-                    solar_moon = ssr_chart.planets['Moon'].longitude
-
-                    next_ssr_date = calc_sun_crossing(
-                        sun_radix_longitude, last_ssr_date + 363
-                    )
-
-                    sar_continue_date = min(
-                        continue_until_date_lunar, next_ssr_date
-                    )
-
-                    returns = find_progressed_anlunar_crossings_until_date(
-                        base_start=starting_date,
-                        continue_until_date=sar_continue_date,
-                        radix_sun_longitude=sun_radix_longitude,
-                        solunar_type=lunar_return_type,
-                        grace_period=1,
-                    )
-
-                    append_lunars(
-                        returns,
-                        lunar_return_type,
-                        override_params={**params, 'ssr_chart': ssr_chart},
-                    )
+            if self.make_burst_chart(
+                burst_manifests,
+                chart_params,
+                date,
+                solunar_type,
+                chart_class,
+            ):
+                charts_created += 1
+            else:
+                charts_already_made += 1
 
-                    if next_ssr_date > continue_until_date_lunar:
-                        keep_looping = False
+        if charts_created + charts_already_made == 0:
+            self.status.error('No charts found.')
+            return
 
-                    starting_date = next_ssr_date + 2
-                    last_ssr_date = next_ssr_date
+        self.status.text = self.charts_made_text(
+            charts_created, charts_already_made
+        )
 
-                continue
+    def charts_made_text(self, charts_created, charts_already_made):
+        s = '' if charts_created == 1 else 's'
+        text = f'{charts_created} chart{s} created.'
+        if charts_already_made:
+            text += f' {charts_already_made} already made by this burst.'
+        return text
 
-            elif lunar_return_type in KLR_FAMILY:
-                starting_date = base_start - 29 if active else base_start
-
-                returns = find_progressed_crossings_until_date(
-                    base_start=starting_date,
-                    radix_julian_day_utc=radix.julian_day_utc,
-                    continue_until_date=continue_until_date_lunar,
-                    target_body='Moon',
-                    radix_sun_longitude=sun_radix_longitude,
-                    cycle_length=cycle_length,
-                    solunar_type=lunar_return_type,
-                    grace_period=1,
-                )
+    def make_burst_chart(
+        self, burst_manifests, chart_params, date, solunar_type, chart_class
+    ):
+        """Makes the chart unless its burst already has. Returns whether
+        the chart was made."""
+        manifest = burst_manifests.get(solunar_type)
+        if manifest and manifest.has_chart(date):
+            return False
 
-                append_lunars(returns, lunar_return_type)
-                continue
+        chart = self.make_chart(
+            chart_params,
+            date,
+            solunar_type,
+            chart_class,
+        )
 
-        return dates_and_chart_params
+        if manifest and chart:
+            manifest.record_chart(date, chart.filename)
+        return True
 
     def make_chart(self, chart, date, chtype, cclass, show=True):
-        cchart = deepcopy(chart)
+        # The radix is only needed for the search, and the wheels take
+        # their own copy of it from the radix cache
+        cchart = deepcopy(
+            {key: value for key, value in chart.items() if key != 'radix'}
+        )
         (y, m, d, t) = revjul(date, cchart['style'])
         cchart['year'] = y
         cchart['month'] = m
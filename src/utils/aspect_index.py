@@ -0,0 +1,60 @@
+from src.models.charts import AngleContactAspect, Aspect, ChartWheelRole
+
+
+def aspect_point_keys(
+    aspect: Aspect | AngleContactAspect,
+) -> list[tuple[str, str]]:
+    keys = [
+        (aspect.from_planet_role.value, aspect.from_planet_short_name),
+        (aspect.to_planet_role.value, aspect.to_planet_short_name),
+    ]
+    return keys if keys[0] != keys[1] else keys[:1]
+
+
+class AspectIndex:
+    """The aspects found for a chart, listed under each point they touch.
+    Points are keyed by (role, short name), and also by short name alone
+    for uniwheel lookups that don't care about the role. Each point's
+    aspects keep their class and the order in which they were found."""
+
+    def __init__(self, aspects_by_class: list[list[Aspect]]):
+        self.aspects_by_class = aspects_by_class
+        self.by_point: dict[tuple[str, str], list[tuple[int, Aspect]]] = {}
+        self.by_name: dict[str, list[tuple[int, Aspect]]] = {}
+
+        for class_index, aspects in enumerate(aspects_by_class):
+            for aspect in aspects:
+                for key in aspect_point_keys(aspect):
+                    self.by_point.setdefault(key, []).append(
+                        (class_index, aspect)
+                    )
+
+                names = {
+                    aspect.from_planet_short_name,
+                    aspect.to_planet_short_name,
+                }
+                for name in names:
+                    self.by_name.setdefault(name, []).append(
+                        (class_index, aspect)
+                    )
+
+    def aspects_of(
+        self,
+        short_name: str,
+        role: ChartWheelRole | None = None,
+        class_count: int | None = None,
+    ) -> list[tuple[int, Aspect]]:
+        """Returns (class index, aspect) for every aspect to the point,
+        in class order, limited to the first class_count classes."""
+        if role:
+            found = self.by_point.get((role.value, short_name), [])
+        else:
+            found = self.by_name.get(short_name, [])
+
+        if class_count is None:
+            return found
+        return [
+            (class_index, aspect)
+            for (class_index, aspect) in found
+            if class_index < class_count
+        ]
@@ -0,0 +1,537 @@
+import csv
+import json
+import multiprocessing
+import os
+import re
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime as dt
+from enum import Enum
+from functools import partial
+
+import pytz
+from timezonefinder import TimezoneFinder
+
+import src
+from src.constants import DS, VERSION
+from src.core import initialize_chart_worker
+from src.models.charts import ChartObject, ChartType
+from src.swe import julday, revjul
+from src.utils.chart_migration import write_chart_report
+from src.utils.chart_utils import make_chart_path
+from src.utils.format_utils import normalize_text, version_str_to_tuple
+
+# Fewer records than this are cast in this process; starting the pool
+# takes longer than casting them
+POOL_THRESHOLD = 200
+CHUNK_SIZE = 50
+
+# Saved charts with the same file name are the same chart if they agree
+# to within a second of time and of arc
+SAME_TIME_HOURS = 1 / 3600
+SAME_PLACE_DEGREES = 1 / 3600
+
+TRUE_TEXT = ['1', 'true', 'yes', 'y', 'x', 'bc', 'bce']
+UNIVERSAL_ZONES = ['UT', 'UTC', 'GMT', 'Z']
+
+REPORT_FIELDS = ['Line', 'Name', 'Status', 'Message']
+
+_timezone_finder = None
+
+
+class BulkImportError(ValueError):
+    pass
+
+
+class ImportStatus(Enum):
+    IMPORTED = 'Imported'
+    DUPLICATE = 'Duplicate'
+    REJECTED = 'Rejected'
+
+
+@dataclass
+class ImportResult:
+    line: int
+    name: str
+    status: ImportStatus
+    message: str = ''
+    # The contents of the chart's data file
+    chart: dict = None
+    chart_file: str = None
+
+
+def _field(record: dict, name: str) -> str:
+    value = record.get(name)
+    return '' if value is None else str(value).strip()
+
+
+def _integer(text: str, message: str) -> int:
+    try:
+        return int(text)
+    except ValueError:
+        raise BulkImportError(message)
+
+
+def _float(text: str, message: str) -> float:
+    try:
+        return float(text)
+    except ValueError:
+        raise BulkImportError(message)
+
+
+def parse_hours(text: str, message: str) -> float:
+    """Hours from 'H', 'H:M' or 'H:M:S', or decimal hours. A leading
+    sign applies to the whole value."""
+    text = text.strip()
+    sign = -1 if text.startswith('-') else 1
+    parts = text.lstrip('+-').split(':')
+    if len(parts) == 1:
+        return sign * _float(parts[0], message)
+    if len(parts) > 3:
+        raise BulkImportError(message)
+    values = [_integer(part, message) for part in parts] + [0]
+    return sign * (values[0] + values[1] / 60 + values[2] / 3600)
+
+
+def _lmt_correction(longitude: float) -> float:
+    # Rounded to the second, as the new chart page enters it
+    seconds = round(abs(longitude) / 15 * 3600)
+    return -seconds / 3600 if longitude >= 0 else seconds / 3600
+
+
+def _named_zone(
+    zone: pytz.BaseTzInfo,
+    year: int,
+    month: int,
+    day: int,
+    time: float,
+) -> tuple[str, float]:
+    if year < 1:
+        raise BulkImportError(
+            'Must enter timezone information manually before 1 CE.'
+        )
+    seconds = min(round(time * 3600), 24 * 3600 - 1)
+    moment = dt(
+        year, month, day, seconds // 3600, seconds // 60 % 60, seconds % 60
+    )
+    offset = zone.utcoffset(moment)
+    return (
+        zone.localize(moment).tzname(),
+        -offset.total_seconds() / 3600,
+    )
+
+
+def resolve_zone(
+    zone: str,
+    utc_offset: str,
+    year: int,
+    month: int,
+    day: int,
+    time: float,
+    latitude: float,
+    longitude: float,
+) -> tuple[str, float]:
+    """The zone abbreviation and correction, in hours to add to the
+    clock time for UT, of a birth record. zone may be an abbreviation
+    with a UTC offset, LMT or LAT, UT, or a tz database name; with
+    neither, the zone is LMT before 1880 and found from the coordinates
+    from 1970, as the new chart page's Find button does."""
+    global _timezone_finder
+
+    if zone.upper() in ['LMT', 'LAT']:
+        return (zone.upper(), _lmt_correction(longitude))
+
+    named_zone = None
+    # Abbreviations like EST are in the database too, but are taken as
+    # abbreviations here, which need an offset
+    if '/' in zone and zone in pytz.all_timezones_set:
+        named_zone = pytz.timezone(zone)
+    elif not zone and not utc_offset:
+        if year < 1880:
+            return ('LMT', _lmt_correction(longitude))
+        if year < 1970:
+            raise BulkImportError('Must enter timezone information manually.')
+        if _timezone_finder is None:
+            _timezone_finder = TimezoneFinder()
+        name = _timezone_finder.timezone_at(lng=longitude, lat=latitude)
+        if not name:
+            raise BulkImportError('No time zone found for the coordinates.')
+        named_zone = pytz.timezone(name)
+
+    if utc_offset:
+        correction = -parse_hours(
+            utc_offset, 'UTC offset must be numeric, as H or H:M.'
+        )
+        if abs(correction) >= 24:
+            raise BulkImportError(
+                'UTC offset must be between -23:59:59 and 23:59:59.'
+            )
+        if named_zone:
+            return (
+                _named_zone(named_zone, year, month, day, time)[0],
+                correction,
+            )
+        return (normalize_text(zone) or 'UT', correction)
+
+    if named_zone:
+        return _named_zone(named_zone, year, month, day, time)
+    if zone.upper() in UNIVERSAL_ZONES:
+        return ('UT', 0.0)
+    raise BulkImportError(f"Time zone '{zone}' needs a UTC offset.")
+
+
+def normalize_import_record(
+    record: dict, default_options: str = 'Natal Default'
+) -> dict:
+    """The chart params for a birth record, checked with the new chart
+    page's rules. Raises BulkImportError for the first problem found."""
+    chart = {}
+
+    first_name = normalize_text(_field(record, 'first_name'))
+    last_name = normalize_text(_field(record, 'last_name'))
+    if first_name and last_name:
+        name = last_name + ', ' + first_name
+    else:
+        name = (
+            first_name or last_name or normalize_text(_field(record, 'name'))
+        )
+    if not name:
+        raise BulkImportError('Name must be specified.')
+    chart['name'] = name
+
+    chart_type = normalize_text(_field(record, 'type')) or 'Natal'
+    try:
+        ChartType(chart_type)
+    except ValueError:
+        raise BulkImportError(f"Unknown chart type '{chart_type}'.")
+    chart['type'] = chart_type
+    chart['class'] = 'N'
+
+    date = _field(record, 'date')
+    if date and not _field(record, 'year'):
+        parts = date.split('-')
+        if date.startswith('-') or len(parts) != 3:
+            raise BulkImportError('Date must be given as Y-M-D.')
+        (year, month, day) = parts
+    else:
+        (year, month, day) = (
+            _field(record, 'year'),
+            _field(record, 'month'),
+            _field(record, 'day'),
+        )
+    y = _integer(year, 'Date must be numeric.')
+    m = _integer(month, 'Date must be numeric.')
+    d = _integer(day, 'Date must be numeric.')
+    # Years below 1 are already astronomical; BCE years count back from 1
+    if y >= 1 and _field(record, 'bce').lower() in TRUE_TEXT:
+        y = -y + 1
+    if m < 1 or m > 12:
+        raise BulkImportError('Month must be between 1 and 12.')
+    if d < 1 or d > 31:
+        raise BulkImportError('Day must be between 1 and 31.')
+
+    style = _field(record, 'style').upper()
+    if not style:
+        style = 0 if y < 1583 else 1
+    elif style in ['OS', 'JULIAN', '0']:
+        style = 0
+    elif style in ['NS', 'GREGORIAN', '1']:
+        style = 1
+    else:
+        raise BulkImportError('Style must be OS or NS.')
+    if revjul(julday(y, m, d, 12, style), style)[0:3] != (y, m, d):
+        raise BulkImportError(f'{d} {m} {y} is not a date in the calendar.')
+    chart['year'] = y
+    chart['month'] = m
+    chart['day'] = d
+    chart['style'] = style
+
+    time = _field(record, 'time')
+    meridiem = _field(record, 'am_pm').upper()
+    if time[-2:].upper() in ['AM', 'PM']:
+        (time, meridiem) = (time[:-2].strip(), time[-2:].upper())
+    if not time:
+        raise BulkImportError('Time must be specified.')
+    if ':' not in time:
+        raise BulkImportError('Time must be given as H:M or H:M:S.')
+    time = parse_hours(time, 'Time must be numeric.')
+    if not meridiem:
+        if time < 0 or time >= 24:
+            raise BulkImportError('Time must be between 0:0:0 and 23:59:59')
+    elif meridiem in ['AM', 'PM']:
+        if time < 0 or time >= 13:
+            raise BulkImportError('Time must be between 0:0:0 and 12:59:59')
+        # 12:00 AM is midnight at the beginning of the day, 12:00 PM noon
+        if time >= 12:
+            time -= 12
+        if meridiem == 'PM':
+            time += 12
+    else:
+        raise BulkImportError('AM/PM must be AM or PM.')
+    chart['time'] = time
+
+    chart['location'] = normalize_text(_field(record, 'location'))
+    if not chart['location']:
+        raise BulkImportError('Location must be specified.')
+    lat = _float(_field(record, 'latitude'), 'Latitude must be numeric.')
+    if abs(lat) > 89.99:
+        raise BulkImportError(
+            f'Latitude must be between 0{DS} and 89{DS}59\'59".'
+        )
+    chart['latitude'] = lat
+    long = _float(_field(record, 'longitude'), 'Longitude must be numeric.')
+    if abs(long) > 180:
+        raise BulkImportError(f'Longitude must be between 0{DS} and 180{DS}.')
+    chart['longitude'] = long
+
+    (chart['zone'], chart['correction']) = resolve_zone(
+        _field(record, 'zone'),
+        _field(record, 'utc_offset'),
+        y,
+        m,
+        d,
+        time,
+        lat,
+        long,
+    )
+
+    chart['notes'] = normalize_text(_field(record, 'notes'), True)
+    chart['options'] = _field(record, 'options') or default_options
+    if chart['options'] == 'Default Natal':
+        chart['options'] = 'Natal Default'
+
+    return chart
+
+
+def _header_key(name: str) -> str:
+    # 'First Name', 'first-name' and 'AM/PM' are read as first_name and
+    # am_pm
+    return re.sub('[^a-z0-9]+', '_', name.strip().lower()).strip('_')
+
+
+def read_import_records(
+    path: str,
+) -> tuple[list[tuple[int, dict]], list[ImportResult]]:
+    """The birth records in a CSV file with a header row, or a JSONL
+    file of objects, each with its line number; and rejects for the
+    JSONL lines that are not objects."""
+    records = []
+    rejects = []
+    if path.lower().endswith(('.jsonl', '.json')):
+        with open(path, encoding='utf-8-sig') as datafile:
+            for line, text in enumerate(datafile, start=1):
+                if not text.strip():
+                    continue
+                try:
+                    record = json.loads(text)
+                    if not isinstance(record, dict):
+                        raise ValueError
+                except ValueError:
+                    rejects.append(
+                        ImportResult(
+                            line,
+                            '',
+                            ImportStatus.REJECTED,
+                            'Line is not a JSON object.',
+                        )
+                    )
+                    continue
+                records.append(
+                    (
+                        line,
+                        {
+                            _header_key(key): value
+                            for (key, value) in record.items()
+                        },
+                    )
+                )
+    else:
+        with open(path, newline='', encoding='utf-8-sig') as datafile:
+            reader = csv.DictReader(datafile)
+            reader.fieldnames = [
+                _header_key(name) for name in reader.fieldnames or []
+            ]
+            for record in reader:
+                if not any((value or '').strip() for value in record.values()):
+                    continue
+                records.append((reader.line_num, record))
+    return (records, rejects)
+
+
+def cast_import_record(item: tuple[int, dict, str]) -> ImportResult:
+    """Checks one record and casts its chart. Runs in the pool workers."""
+    (line, record, default_options) = item
+    name = (
+        _field(record, 'name')
+        or ' '.join(
+            [_field(record, 'first_name'), _field(record, 'last_name')]
+        ).strip()
+    )
+    try:
+        params = normalize_import_record(record, default_options)
+        # Charts without a report are opened by the version saved here
+        chart = {
+            **ChartObject(params).to_dict(),
+            'version': list(version_str_to_tuple(VERSION)),
+        }
+    except BulkImportError as error:
+        return ImportResult(line, name, ImportStatus.REJECTED, str(error))
+    except Exception as error:
+        return ImportResult(
+            line, name, ImportStatus.REJECTED, f'Unable to cast: {error!r}'
+        )
+    return ImportResult(
+        line, chart['name'], ImportStatus.IMPORTED, chart=chart
+    )
+
+
+def same_chart(chart: dict, other: dict) -> bool:
+    return (
+        all(
+            chart.get(key) == other.get(key)
+            for key in ['name', 'type', 'year', 'month', 'day', 'style']
+        )
+        and abs(
+            chart['time']
+            + chart['correction']
+            - other['time']
+            - other.get('correction', 0)
+        )
+        < SAME_TIME_HOURS
+        and abs(chart['latitude'] - float(other['latitude']))
+        < SAME_PLACE_DEGREES
+        and abs(chart['longitude'] - float(other['longitude']))
+        < SAME_PLACE_DEGREES
+    )
+
+
+def _default_workers() -> int:
+    return max(1, (os.cpu_count() or 2) - 1)
+
+
+def save_imported_charts(
+    cast: list[ImportResult], temporary: bool
+) -> list[ImportResult]:
+    """Saves each chart cast unless one with its file name is already
+    saved or earlier in the file, which is a duplicate if it is the same
+    chart and a reject if not. Returns the results of the charts saved."""
+    saved = {}
+    for result in cast:
+        if result.status != ImportStatus.IMPORTED:
+            continue
+
+        chart_file = make_chart_path(result.chart, temporary)
+        if chart_file in saved:
+            earlier = saved[chart_file]
+            if same_chart(result.chart, earlier.chart):
+                result.status = ImportStatus.DUPLICATE
+                result.message = f'Same chart as line {earlier.line}.'
+            else:
+                result.status = ImportStatus.REJECTED
+                result.message = (
+                    f'Same name, date and type as line {earlier.line}.'
+                )
+            continue
+
+        if os.path.exists(chart_file):
+            try:
+                with open(chart_file) as datafile:
+                    existing = json.load(datafile)
+                is_same = same_chart(result.chart, existing)
+            except Exception:
+                is_same = False
+            if is_same:
+                result.status = ImportStatus.DUPLICATE
+                result.message = 'Chart is already saved.'
+            else:
+                result.status = ImportStatus.REJECTED
+                result.message = (
+                    'A different chart is already saved as '
+                    f"'{os.path.basename(chart_file)}'."
+                )
+            continue
+
+        try:
+            os.makedirs(os.path.dirname(chart_file), exist_ok=True)
+            with open(chart_file, 'w') as datafile:
+                json.dump(result.chart, datafile, indent=4)
+        except Exception as error:
+            result.status = ImportStatus.REJECTED
+            result.message = f'Unable to save file: {error}'
+            continue
+        result.chart_file = chart_file
+        saved[chart_file] = result
+
+    return list(saved.values())
+
+
+def write_imported_chart_report(item: tuple[dict, bool]) -> str:
+    """Writes a saved chart's report, returning why it could not be.
+    Runs in the pool workers."""
+    try:
+        write_chart_report(*item)
+    except Exception as error:
+        return repr(error)
+    return ''
+
+
+def import_charts(
+    path: str,
+    temporary: bool = False,
+    default_options: str = 'Natal Default',
+    write_reports: bool = False,
+    workers: int = None,
+    executor: Executor = None,
+) -> list[ImportResult]:
+    """Imports the birth records in a CSV or JSONL file as chart data
+    files. Records are checked and cast across a process pool, and the
+    charts that are not duplicates or rejects are saved. With
+    write_reports, the pool then writes each saved chart's report.
+    Returns a result for every record, by line."""
+    (records, results) = read_import_records(path)
+    items = [(line, record, default_options) for (line, record) in records]
+
+    pool = None
+    map_items = map
+    if executor is not None or len(items) >= POOL_THRESHOLD:
+        pool = executor or ProcessPoolExecutor(
+            max_workers=workers or _default_workers(),
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=initialize_chart_worker,
+            initargs=(src.CHART_PATH, src.TEMP_CHARTS, src.OPTION_PATH),
+        )
+        map_items = partial(pool.map, chunksize=CHUNK_SIZE)
+    try:
+        cast = list(map_items(cast_import_record, items))
+        saved = save_imported_charts(cast, temporary)
+        if write_reports:
+            errors = map_items(
+                write_imported_chart_report,
+                [(result.chart, temporary) for result in saved],
+            )
+            for (result, error) in zip(saved, errors):
+                if error:
+                    result.message = f'Unable to write report: {error}'
+    finally:
+        if pool and executor is None:
+            pool.shutdown()
+
+    return sorted(results + cast, key=lambda result: result.line)
+
+
+def write_import_report(results: list[ImportResult], report_path: str):
+    """A CSV of the records that were not imported, or whose report
+    was not written, and why."""
+    with open(report_path, 'w', newline='', encoding='utf-8-sig') as datafile:
+        writer = csv.writer(datafile)
+        writer.writerow(REPORT_FIELDS)
+        for result in results:
+            if result.message:
+                writer.writerow(
+                    [
+                        result.line,
+                        result.name,
+                        result.status.value,
+                        result.message,
+                    ]
+                )
@@ -0,0 +1,165 @@
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass, field
+
+import src
+from src.utils.chart_cache import chart_cache_key
+
+# After each return is found the search is checkpointed just past it,
+# well short of the closest any two returns of one type can fall
+CHECKPOINT_DAYS = 1 / 1440
+# Dates within this many days are the same return
+SAME_RETURN_DAYS = 1 / 1440
+
+
+def burst_manifest_key(
+    radix_params: dict, return_type: str, params: dict, temporary: bool
+) -> dict:
+    """What a burst's returns and chart files depend on: the radix and
+    whose it is, the return type, the options, where the charts are cast
+    and whether they are temporary. Ingress bursts have no radix."""
+    return json.loads(
+        json.dumps(
+            {
+                'radix': (
+                    chart_cache_key(radix_params) if radix_params else None
+                ),
+                # Charts are filed by name, so clients born together each
+                # have their own
+                'radix_name': (radix_params['name'] if radix_params else None),
+                'return_type': return_type,
+                'options': params['options'],
+                'latitude': float(params['latitude']),
+                'longitude': float(params['longitude']),
+                'temporary': bool(temporary),
+            }
+        )
+    )
+
+
+@dataclass
+class BurstReturn:
+    date: float
+    # Of kinetic returns
+    progressed_date: float = None
+    chart_file: str = None
+
+
+@dataclass
+class BurstManifest:
+    """Returns a burst has found from start_jd up to searched_until, and
+    the chart files made for them. Saved after every change, so a burst
+    that is extended only searches past searched_until, and one that
+    was interrupted picks up where it stopped."""
+
+    path: str
+    key: dict
+    start_jd: float
+    searched_until: float
+    returns: list[BurstReturn] = field(default_factory=list)
+
+    @classmethod
+    def load(
+        cls, key: dict, start_jd: float, directory: str = None
+    ) -> 'BurstManifest':
+        """The saved manifest for the key, if it covers start_jd;
+        otherwise an empty one starting there."""
+        directory = directory or src.BURST_PATH
+        digest = hashlib.sha1(
+            json.dumps(key, sort_keys=True).encode()
+        ).hexdigest()
+        path = os.path.join(directory, f'{digest}.json')
+
+        try:
+            with open(path) as datafile:
+                data = json.load(datafile)
+            if (
+                data['key'] == key
+                and data['start_jd'] <= start_jd <= data['searched_until']
+            ):
+                return cls(
+                    path=path,
+                    key=key,
+                    start_jd=data['start_jd'],
+                    searched_until=data['searched_until'],
+                    returns=[
+                        BurstReturn(**burst_return)
+                        for burst_return in data['returns']
+                    ],
+                )
+        except Exception:
+            pass
+
+        return cls(
+            path=path, key=key, start_jd=start_jd, searched_until=start_jd
+        )
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temporary_path = self.path + '.tmp'
+        with open(temporary_path, 'w') as datafile:
+            json.dump(
+                {
+                    'key': self.key,
+                    'start_jd': self.start_jd,
+                    'searched_until': self.searched_until,
+                    'returns': [
+                        asdict(burst_return) for burst_return in self.returns
+                    ],
+                },
+                datafile,
+                indent=4,
+            )
+        # A burst stopped partway through a save keeps the last manifest
+        os.replace(temporary_path, self.path)
+
+    def returns_between(
+        self, start_jd: float, end_jd: float
+    ) -> list[BurstReturn]:
+        return sorted(
+            (
+                burst_return
+                for burst_return in self.returns
+                if start_jd <= burst_return.date < end_jd
+            ),
+            key=lambda burst_return: burst_return.date,
+        )
+
+    def add_return(
+        self, date: float, progressed_date: float = None
+    ) -> BurstReturn:
+        burst_return = self.find(date)
+        if burst_return is None:
+            burst_return = BurstReturn(date, progressed_date)
+            self.returns.append(burst_return)
+        self.searched_until = max(self.searched_until, date + CHECKPOINT_DAYS)
+        self.save()
+        return burst_return
+
+    def finish_search(self, end_jd: float):
+        if end_jd > self.searched_until:
+            self.searched_until = end_jd
+            self.save()
+
+    def find(self, date: float) -> BurstReturn | None:
+        for burst_return in self.returns:
+            if abs(burst_return.date - date) < SAME_RETURN_DAYS:
+                return burst_return
+        return None
+
+    def has_chart(self, date: float) -> bool:
+        burst_return = self.find(date)
+        return bool(
+            burst_return
+            and burst_return.chart_file
+            and os.path.exists(burst_return.chart_file)
+        )
+
+    def record_chart(self, date: float, chart_file: str):
+        # Charts made alongside the burst, like active returns, are not
+        # part of it
+        burst_return = self.find(date)
+        if burst_return is not None:
+            burst_return.chart_file = chart_file
+            self.save()
@@ -1,20 +1,40 @@
 import bisect
-from copy import deepcopy
+from collections import OrderedDict
 from io import TextIOWrapper
 import math
+import threading
 
 import src.models.charts as chart_models
-from src import *
 from src import constants
 from src.models.angles import ForegroundAngles
 from src.models.options import Options, ShowAspect
+from src.utils.aspect_index import AspectIndex
 from src.utils.chart_utils import (
     POS_SIGN,
     calc_aspect_strength_percent,
     in_harmonic_range,
 )
 from src.utils.format_utils import to360
-from src.user_interfaces.widgets import tkmessagebox
+
+
+def calc_halfsum_points(
+    options: Options, chart: chart_models.ChartObject
+) -> list[chart_models.PlanetData | chart_models.AngleData]:
+    # Angles are wrapped once per chart and shared by all of their halfsums
+    points = []
+    for point_name, point in chart.iterate_points(
+        options, include_angles=True
+    ):
+        if point_name in constants.ANGLE_ABBREVIATIONS:
+            point = chart_models.AngleData(
+                name=point_name,
+                short_name=point_name,
+                longitude=point,
+                role=chart.role,
+                is_angle=True,
+            )
+        points.append(point)
+    return points
 
 
 def calc_halfsums(
@@ -23,87 +43,85 @@ def calc_halfsums(
 ) -> list[chart_models.HalfSum]:
     halfsums = []
     cross_wheel_enabled = options.midpoints.get('cross_wheel_enabled', False)
+    points_by_chart = [calc_halfsum_points(options, chart) for chart in charts]
+
     for (from_index, from_chart) in enumerate(charts):
         for (to_index, to_chart) in enumerate(charts):
             if to_index < from_index:
                 continue
-            for (
-                primary_index,
-                (primary_point_name, primary_point),
-            ) in enumerate(
-                from_chart.iterate_points(options, include_angles=True)
+            if (
+                not cross_wheel_enabled
+                and from_chart.role.value != to_chart.role.value
             ):
-                for (
-                    secondary_index,
-                    (secondary_point_name, secondary_point),
-                ) in enumerate(
-                    to_chart.iterate_points(options, include_angles=True)
-                ):
-                    if (
-                        not cross_wheel_enabled
-                        and from_chart.role.value != to_chart.role.value
-                    ):
-                        break
+                continue
 
-                    if (
-                        secondary_index <= primary_index
-                        and from_chart == to_chart
-                    ):
+            same_chart = from_chart == to_chart
+            for (primary_index, primary_data) in enumerate(
+                points_by_chart[from_index]
+            ):
+                for (secondary_index, secondary_data) in enumerate(
+                    points_by_chart[to_index]
+                ):
+                    if secondary_index <= primary_index and same_chart:
                         continue
 
-                    primary_point_is_angle = (
-                        primary_point_name in constants.ANGLE_ABBREVIATIONS
-                    )
-                    secondary_point_is_angle = (
-                        secondary_point_name in constants.ANGLE_ABBREVIATIONS
-                    )
-
-                    primary_data = primary_point
-                    secondary_data = secondary_point
-
-                    if primary_point_is_angle:
-                        primary_data = chart_models.AngleData(
-                            name=primary_point_name,
-                            short_name=primary_point_name,
-                            longitude=primary_point,
-                            role=from_chart.role,
-                            is_angle=True,
-                        )
-
-                    if secondary_point_is_angle:
-                        secondary_data = chart_models.AngleData(
-                            name=secondary_point_name,
-                            short_name=secondary_point_name,
-                            longitude=secondary_point,
-                            role=to_chart.role,
-                            is_angle=True,
-                        )
-
-                    longitude = (
-                        primary_data.longitude + secondary_data.longitude
-                    ) / 2
-                    prime_vertical_longitude = (
-                        primary_data.prime_vertical_longitude
-                        + secondary_data.prime_vertical_longitude
-                    ) / 2
-                    right_ascension = (
-                        primary_data.right_ascension
-                        + secondary_data.right_ascension
-                    ) / 2
-
                     halfsums.append(
                         chart_models.HalfSum(
                             point_a=primary_data,
                             point_b=secondary_data,
-                            longitude=longitude,
-                            prime_vertical_longitude=prime_vertical_longitude,
-                            right_ascension=right_ascension,
+                            longitude=(
+                                primary_data.longitude
+                                + secondary_data.longitude
+                            )
+                            / 2,
+                            prime_vertical_longitude=(
+                                primary_data.prime_vertical_longitude
+                                + secondary_data.prime_vertical_longitude
+                            )
+                            / 2,
+                            right_ascension=(
+                                primary_data.right_ascension
+                                + secondary_data.right_ascension
+                            )
+                            / 2,
                         )
                     )
 
     return halfsums
 
 
+# Ecliptic contacts between a chart's own points and its own halfsums,
+# keyed by role, point longitudes and midpoint options. Longitudes don't
+# change when a radix is precessed to a transit, so every wheel of a burst
+# shares one entry; mundane and RA contacts are frame-dependent and are
+# always recomputed.
+OWN_MIDPOINT_CONTACTS: OrderedDict[tuple, dict] = OrderedDict()
+OWN_MIDPOINT_CONTACTS_LOCK = threading.Lock()
+MAX_OWN_MIDPOINT_CONTACTS = 64
+
+
+def own_midpoint_contacts_key(
+    options: Options,
+    chart: chart_models.ChartObject,
+    points: list[tuple[str, chart_models.PlanetData | float]],
+) -> tuple:
+    return (
+        chart.role.value,
+        tuple(
+            (
+                point_name,
+                point.longitude if hasattr(point, 'longitude') else point,
+            )
+            for (point_name, point) in points
+        ),
+        tuple(
+            sorted(
+                (key, str(value)) for key, value in options.midpoints.items()
+            )
+        ),
+    )
+
+
 def parse_midpoint(
     options: Options,
     point_data: chart_models.PlanetData | chart_models.AngleData,
@@ -234,10 +252,27 @@ def calc_midpoints_3(
 
     # Iterate over each point in each chart, checking it against all halfsums
     for chart in charts:
-        for (point_name, point) in chart.iterate_points(
-            options,
-            include_angles=True,
-        ):
+        points = list(chart.iterate_points(options, include_angles=True))
+
+        own_halfsum_indices = {
+            id(halfsum): index
+            for (index, halfsum) in enumerate(
+                halfsum
+                for halfsum in halfsums
+                if halfsum.point_a.role.value == chart.role.value
+                and halfsum.point_b.role.value == chart.role.value
+            )
+        }
+        contacts_key = own_midpoint_contacts_key(options, chart, points)
+        with OWN_MIDPOINT_CONTACTS_LOCK:
+            own_contacts = OWN_MIDPOINT_CONTACTS.get(contacts_key)
+            found_contacts = None
+            if own_contacts is None:
+                found_contacts = {}
+            else:
+                OWN_MIDPOINT_CONTACTS.move_to_end(contacts_key)
+
+        for (point_index, (point_name, point)) in enumerate(points):
             point_short_name = (
                 point.short_name
                 if hasattr(point, 'short_name')
@@ -246,32 +281,53 @@ def calc_midpoints_3(
             key = make_midpoint_key(point_short_name, chart.role)
             midpoints[key] = []
 
-            for halfsum in halfsums:
-                if halfsum.contains(point_short_name, role=chart.role):
-                    continue
+            point_longitude = (
+                point.longitude if hasattr(point, 'longitude') else point
+            )
 
-                point_longitude = (
-                    point.longitude if hasattr(point, 'longitude') else point
-                )
+            point_is_angle = False
+            planet_data = point
 
-                point_is_angle = False
-                planet_data = point
+            if point_short_name in constants.ANGLE_ABBREVIATIONS:
+                point_is_angle = True
+                planet_data = chart_models.AngleData(
+                    name=point_name,
+                    short_name=point_short_name,
+                    longitude=point_longitude,
+                    role=chart.role,
+                )
 
-                if point_short_name in constants.ANGLE_ABBREVIATIONS:
-                    point_is_angle = True
-                    planet_data = chart_models.AngleData(
-                        name=point_name,
-                        short_name=point_short_name,
-                        longitude=point_longitude,
-                        role=chart.role,
-                    )
+            for halfsum in halfsums:
+                if halfsum.contains(point_short_name, role=chart.role):
+                    continue
 
                 ecliptical_midpoint = None
 
                 if not only_mundane_enabled:
-                    ecliptical_midpoint = parse_midpoint(
-                        options, planet_data, halfsum, 'longitude'
-                    )
+                    own_index = own_halfsum_indices.get(id(halfsum))
+
+                    if own_index is not None and own_contacts is not None:
+                        contact = own_contacts.get((point_index, own_index))
+                        if contact:
+                            (midpoint_type, orb_minutes) = contact
+                            ecliptical_midpoint = chart_models.MidpointAspect(
+                                midpoint_type=midpoint_type,
+                                orb_minutes=orb_minutes,
+                                framework=(
+                                    chart_models.AspectFramework.ECLIPTICAL
+                                ),
+                                from_point_data=planet_data,
+                                to_midpoint=halfsum,
+                            )
+                    else:
+                        ecliptical_midpoint = parse_midpoint(
+                            options, planet_data, halfsum, 'longitude'
+                        )
+                        if ecliptical_midpoint and own_index is not None:
+                            found_contacts[(point_index, own_index)] = (
+                                ecliptical_midpoint.midpoint_type,
+                                ecliptical_midpoint.orb_minutes,
+                            )
 
                 mundane_midpoint = None
 
@@ -318,6 +374,12 @@ def calc_midpoints_3(
                         )
                         insert_sorted(key, pseudo_mundane_midpoint)
 
+        if found_contacts is not None:
+            with OWN_MIDPOINT_CONTACTS_LOCK:
+                OWN_MIDPOINT_CONTACTS[contacts_key] = found_contacts
+                if len(OWN_MIDPOINT_CONTACTS) > MAX_OWN_MIDPOINT_CONTACTS:
+                    OWN_MIDPOINT_CONTACTS.popitem(last=False)
+
         mundane_angle = chart_models.AngleData(
             name='Angle',
             short_name='Angle',
@@ -489,7 +551,7 @@ def parse_aspect(
 def calc_planetary_needs_strength(
     planet: chart_models.PlanetData,
     chart: chart_models.ChartObject,
-    aspects_by_class: list[list[chart_models.Aspect]],
+    aspects_by_point: AspectIndex,
 ) -> int:
 
     rulership_strength = 0
@@ -503,32 +565,30 @@ def calc_planetary_needs_strength(
     sun_aspect_score = 0
     moon_aspect_score = 0
 
-    for [class_index_zeroed, aspects_of_class] in enumerate(aspects_by_class):
-        for aspect in aspects_of_class:
-            if (
-                aspect.includes_planet(planet.short_name)
-                and aspect.is_hard_aspect()
-            ):
-                if aspect.type.value in [
-                    chart_models.AspectType.CONJUNCTION.value,
-                    chart_models.AspectType.OPPOSITION.value,
-                    chart_models.AspectType.SQUARE.value,
-                ]:
-                    if planet.name != 'Sun' and aspect.includes_planet('Su'):
-                        sun_aspect_score = aspect.strength
-                        if rules_sun_sign:
-                            if class_index_zeroed == 0:
-                                sun_aspect_score = max(95, aspect.strength)
-                            elif class_index_zeroed == 1:
-                                sun_aspect_score = max(92, aspect.strength)
-
-                    if planet.name != 'Moon' and aspect.includes_planet('Mo'):
-                        moon_aspect_score = aspect.strength
-                        if rules_moon_sign:
-                            if class_index_zeroed == 0:
-                                moon_aspect_score = max(95, aspect.strength)
-                            elif class_index_zeroed == 1:
-                                moon_aspect_score = max(92, aspect.strength)
+    for (class_index_zeroed, aspect) in aspects_by_point.aspects_of(
+        planet.short_name
+    ):
+        if aspect.is_hard_aspect():
+            if aspect.type.value in [
+                chart_models.AspectType.CONJUNCTION.value,
+                chart_models.AspectType.OPPOSITION.value,
+                chart_models.AspectType.SQUARE.value,
+            ]:
+                if planet.name != 'Sun' and aspect.includes_planet('Su'):
+                    sun_aspect_score = aspect.strength
+                    if rules_sun_sign:
+                        if class_index_zeroed == 0:
+                            sun_aspect_score = max(95, aspect.strength)
+                        elif class_index_zeroed == 1:
+                            sun_aspect_score = max(92, aspect.strength)
+
+                if planet.name != 'Moon' and aspect.includes_planet('Mo'):
+                    moon_aspect_score = aspect.strength
+                    if rules_moon_sign:
+                        if class_index_zeroed == 0:
+                            moon_aspect_score = max(95, aspect.strength)
+                        elif class_index_zeroed == 1:
+                            moon_aspect_score = max(92, aspect.strength)
 
     stationary_strength = 75 if planet.is_stationary else 0
     if stationary_strength > 0 and (rules_moon_sign or rules_sun_sign):
@@ -547,6 +607,10 @@ def calc_planetary_needs_strength(
     return min(strength, 100)
 
 
+class ParanCalculationError(ValueError):
+    pass
+
+
 def find_angle_crossings(
     planet: chart_models.PlanetData, geo_latitude: float
 ) -> tuple[float, float, float, float]:
@@ -583,11 +647,9 @@ def find_angle_crossings(
             to360(planet.right_ascension + 180),
         )
     except ValueError:
-        tkmessagebox.showerror(
-            'Paran calculation error',
-            f"Error calculating parans for planet {planet.name}; it probably doesn't rise or set at the given latitude",
+        raise ParanCalculationError(
+            f"Error calculating parans for planet {planet.name}; it probably doesn't rise or set at the given latitude"
         )
-        return None
 
 
 def calc_major_angle_paran(
@@ -708,149 +770,3 @@ def calc_major_angle_paran(
         )
 
     return aspect
-
-
-def get_signed_orb_to_reference(longitude: float, reference: float) -> float:
-    if longitude >= reference:
-        if longitude - reference >= 180:
-            diff = 360 - longitude
-            return (reference + diff) * -1
-
-        return longitude - reference
-
-    if reference - longitude >= 180:
-        diff = 360 - reference
-        return longitude + diff
-
-    return longitude - reference
-
-
-def calc_novien_aspects(
-    radix: chart_models.ChartObject,
-    novien_data: chart_models.ChartObject,
-    options: Options,
-) -> list[list[chart_models.Aspect]]:
-    aspects_by_class = [[], [], []]
-    charts = [novien_data, radix]
-
-    novien_options = deepcopy(options)
-
-    novien_options.ecliptic_aspects = {
-        '0': options.ecliptic_aspects['0'],
-        '90': options.ecliptic_aspects['90'],
-        '180': options.ecliptic_aspects['180'],
-    }
-
-    novien_to_natal_options = deepcopy(novien_options)
-
-    # Only use class 1 aspects for novien-to-natal
-    for key in novien_to_natal_options.ecliptic_aspects:
-        novien_to_natal_options.ecliptic_aspects[key] = [
-            novien_to_natal_options.ecliptic_aspects[key][0],
-            0,
-            0,
-        ]
-
-    for (from_index, from_chart) in enumerate(charts):
-        for to_index in range(from_index, 2):
-            to_chart = charts[to_index]
-            for (
-                primary_index,
-                (primary_planet_long_name, _),
-            ) in enumerate(from_chart.iterate_points(options)):
-                for (
-                    secondary_index,
-                    (secondary_planet_long_name, _),
-                ) in enumerate(to_chart.iterate_points(options)):
-
-                    # Skip natal-natal aspects
-                    if from_index == 1 and to_index == 1:
-                        break
-
-                    if (
-                        secondary_index <= primary_index
-                        and from_chart == to_chart
-                    ):
-                        continue
-
-                    is_novien_to_natal = from_index == 0 and to_index == 1
-
-                    primary_planet = (
-                        from_chart.planets[primary_planet_long_name]
-                        if hasattr(from_chart, 'planets')
-                        else from_chart[primary_planet_long_name]
-                    )
-                    secondary_planet = (
-                        to_chart.planets[secondary_planet_long_name]
-                        if hasattr(to_chart, 'planets')
-                        else to_chart[secondary_planet_long_name]
-                    )
-
-                    raw_orb = (
-                        abs(
-                            primary_planet.longitude
-                            - secondary_planet.longitude
-                        )
-                        % 360
-                    )
-
-                    (
-                        aspect_type,
-                        aspect_class,
-                        aspect_orb,
-                        aspect_strength,
-                    ) = parse_aspect(
-                        value=raw_orb,
-                        options=novien_to_natal_options
-                        if is_novien_to_natal
-                        else novien_options,
-                    )
-
-                    if not aspect_type:
-                        continue
-
-                    if aspect_class > 2:
-                        continue
-
-                    if is_novien_to_natal:
-                        aspect_class = 3
-
-                    from_planet = (
-                        primary_planet
-                        if primary_planet.role >= secondary_planet.role
-                        else secondary_planet
-                    )
-
-                    to_planet = (
-                        primary_planet
-                        if from_planet == secondary_planet
-                        else secondary_planet
-                    )
-
-                    from_planet_role = (
-                        chart_models.ChartWheelRole.RADIX
-                        if from_index == 1
-                        else chart_models.ChartWheelRole.NOVIEN
-                    )
-                    to_planet_role = (
-                        chart_models.ChartWheelRole.RADIX
-                        if to_index == 1
-                        else chart_models.ChartWheelRole.NOVIEN
-                    )
-
-                    aspect = (
-                        chart_models.Aspect()
-                        .from_planet(
-                            from_planet.short_name, role=from_planet_role
-                        )
-                        .to_planet(to_planet.short_name, role=to_planet_role)
-                        .as_type(aspect_type)
-                        .with_class(aspect_class)
-                        .as_ecliptical()
-                        .with_strength(aspect_strength)
-                        .with_orb(aspect_orb)
-                    )
-
-                    aspects_by_class[aspect.aspect_class - 1].append(aspect)
-
-    return aspects_by_class
@@ -0,0 +1,85 @@
+import threading
+from collections import OrderedDict
+
+from src.constants import VERSION
+from src.models.charts import ChartObject, ChartType
+from src.utils.format_utils import version_str_to_tuple
+
+DEFAULT_MAX_CHARTS = 256
+
+
+def chart_cache_key(params: dict) -> tuple:
+    # Everything that decides the julian day, the location and the style;
+    # names, notes and chart types can differ between clients
+    return (
+        params['year'],
+        params['month'],
+        params['day'],
+        params['time'],
+        params.get('zone', '').upper(),
+        params.get('correction', 0),
+        params.get('style', 1),
+        float(params['latitude']),
+        float(params['longitude']),
+    )
+
+
+class ChartCache:
+    """Charts cast for the same moment and place, shared across every
+    client that needs them. The cached charts are never handed out;
+    get() returns a copy carrying the caller's name and chart type,
+    which is free to be precessed into the caller's frame.
+    Safe to share between threads."""
+
+    def __init__(self, max_charts: int = DEFAULT_MAX_CHARTS):
+        self.max_charts = max_charts
+        self.charts: OrderedDict[tuple, ChartObject] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, params: dict) -> ChartObject:
+        key = chart_cache_key(params)
+        with self.lock:
+            chart = self.charts.get(key)
+            if chart is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.charts.move_to_end(key)
+
+        if chart is None:
+            # Cast without the lock, so other threads' hits don't wait;
+            # a chart cast twice concurrently keeps the first one stored
+            chart = ChartObject(params)
+            with self.lock:
+                chart = self.charts.setdefault(key, chart)
+                self.charts.move_to_end(key)
+                if len(self.charts) > self.max_charts:
+                    self.charts.popitem(last=False)
+
+        chart = chart.copy()
+        chart.type = ChartType(params['type'])
+        chart.name = params.get('name', None)
+        chart.location = params['location']
+        chart.chart_class = params.get('class', '')
+        chart.options_file = params.get('options', '')
+        chart.notes = params.get('notes', None)
+        chart.version = (
+            version_str_to_tuple(VERSION)
+            if 'version' not in params
+            else params['version']
+        )
+
+        return chart
+
+    def clear(self):
+        with self.lock:
+            self.charts.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+transit_charts = ChartCache()
+# Kept apart so a long burst of transit charts cannot evict the radix
+radix_charts = ChartCache(max_charts=64)
@@ -0,0 +1,273 @@
+import json
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Callable
+
+import src
+from src.constants import VERSION
+from src.core import initialize_chart_worker
+from src.models.charts import INGRESSES, ChartObject, ChartWheelRole
+from src.models.options import Options
+from src.utils.chart_utils import make_chart_path
+from src.utils.format_utils import (
+    parse_version_from_txt_file,
+    version_str_to_tuple,
+)
+
+# Fewer charts than this are migrated in this process
+POOL_THRESHOLD = 200
+CHUNK_SIZE = 64
+
+
+class MigrationStatus(Enum):
+    UNCHANGED = 'Unchanged'
+    MIGRATED = 'Migrated'
+    FAILED = 'Failed'
+
+
+@dataclass
+class MigrationResult:
+    path: str
+    status: MigrationStatus
+    new_path: str = None
+    from_version: tuple = None
+    report_written: bool = False
+    message: str = ''
+
+
+@dataclass
+class MigrationSummary:
+    total: int = 0
+    # Already done by an earlier, interrupted run
+    resumed: int = 0
+    counts: dict[MigrationStatus, int] = field(
+        default_factory=lambda: {status: 0 for status in MigrationStatus}
+    )
+    reports_written: int = 0
+    failures: list[MigrationResult] = field(default_factory=list)
+
+
+def write_json_atomically(path: str, data: dict):
+    temporary_path = path + '.tmp'
+    with open(temporary_path, 'w') as datafile:
+        json.dump(data, datafile, indent=4)
+    os.replace(temporary_path, path)
+
+
+def saved_version(path: str, data: dict) -> tuple:
+    """The version a chart was saved by: from its data file, else from
+    the footer of its report, as the select chart page reads it."""
+    if 'version' in data:
+        return tuple(data['version'])
+    try:
+        return tuple(parse_version_from_txt_file(path[0:-3] + 'txt'))
+    except Exception:
+        return (0, 0, 0)
+
+
+def is_legacy_path(path: str) -> bool:
+    # Before charts were filed by name, date and type
+    return os.path.basename(path).count('~') <= 1
+
+
+def current_chart_data(data: dict) -> dict:
+    """A data file's contents in the current format: what the chart is
+    cast from, and the version that saved it."""
+    return {
+        **ChartObject(data).to_dict(),
+        'version': list(version_str_to_tuple(VERSION)),
+    }
+
+
+def has_single_wheel_report(data: dict) -> bool:
+    # Return and progressed reports are drawn with their radix, which
+    # data files don't keep
+    return data.get('class') in ['N', 'I', '', None] and not data.get(
+        'base_chart'
+    )
+
+
+def write_chart_report(data: dict, temporary: bool):
+    """Writes the report the chart's Calculate button would write."""
+    from src.user_interfaces.uniwheel import Uniwheel
+
+    optfile = data['options'].replace(' ', '_') + '.opt'
+    with open(os.path.join(src.OPTION_PATH, optfile)) as datafile:
+        options = Options(json.load(datafile))
+
+    chart = ChartObject(data).with_role(ChartWheelRole.NATAL)
+    Uniwheel([chart], temporary, options)
+
+
+def migrate_chart_file(
+    path: str, temporary: bool, write_report: bool = False
+) -> MigrationResult:
+    """Brings one data file to the current format, moving files saved
+    before charts were filed by name into their folders. Files are
+    written beside their destination and moved over it, so a file is
+    either the old one or the new one."""
+    try:
+        with open(path) as datafile:
+            data = json.load(datafile)
+        from_version = saved_version(path, data)
+        migrated = current_chart_data(data)
+    except Exception as error:
+        return MigrationResult(
+            path, MigrationStatus.FAILED, message=f'Unable to read: {error!r}'
+        )
+
+    new_path = path
+    if is_legacy_path(path):
+        new_path = make_chart_path(
+            migrated,
+            temporary,
+            is_ingress=migrated['type'] in INGRESSES or not migrated['name'],
+        )
+
+    result = MigrationResult(
+        path, MigrationStatus.UNCHANGED, new_path, from_version
+    )
+    try:
+        if new_path != path:
+            os.makedirs(os.path.dirname(new_path), exist_ok=True)
+            if os.path.exists(new_path):
+                with open(new_path) as datafile:
+                    existing = json.load(datafile)
+                # Moved by a run that stopped before removing the old file
+                if {**existing, 'version': None} != {
+                    **migrated,
+                    'version': None,
+                }:
+                    result.status = MigrationStatus.FAILED
+                    result.message = (
+                        'A different chart is already saved as '
+                        f"'{os.path.basename(new_path)}'."
+                    )
+                    return result
+            else:
+                write_json_atomically(new_path, migrated)
+            report = path[0:-3] + 'txt'
+            if os.path.exists(report):
+                os.replace(report, new_path[0:-3] + 'txt')
+            os.remove(path)
+            result.status = MigrationStatus.MIGRATED
+        elif data != migrated:
+            write_json_atomically(path, migrated)
+            result.status = MigrationStatus.MIGRATED
+
+        if write_report and has_single_wheel_report(data):
+            write_chart_report(migrated, temporary)
+            result.report_written = True
+    except Exception as error:
+        result.status = MigrationStatus.FAILED
+        result.message = repr(error)
+    return result
+
+
+def _migrate_item(item: tuple[str, bool, bool]) -> MigrationResult:
+    return migrate_chart_file(*item)
+
+
+def find_chart_files(include_temporary: bool = True) -> list[tuple[str, bool]]:
+    """Every data file under the chart folder, with whether it is a
+    temporary chart."""
+    temporary_root = os.path.abspath(src.TEMP_CHARTS)
+    files = []
+    for root, temporary in [
+        (src.CHART_PATH, False),
+        (src.TEMP_CHARTS, True),
+    ]:
+        if temporary and not include_temporary:
+            continue
+        for directory, subdirectories, filenames in os.walk(root):
+            if not temporary and os.path.abspath(directory) == temporary_root:
+                subdirectories.clear()
+                continue
+            subdirectories.sort()
+            files.extend(
+                (os.path.join(directory, filename), temporary)
+                for filename in sorted(filenames)
+                if filename.endswith('.dat')
+            )
+    return files
+
+
+def _read_journal(journal_path: str, header: str) -> set[str]:
+    try:
+        with open(journal_path) as journal:
+            if journal.readline().rstrip('\n') != header:
+                return set()
+            # A line cut short by a crash has no newline, and is redone
+            return {
+                line[:-1] for line in journal.readlines() if line[-1:] == '\n'
+            }
+    except FileNotFoundError:
+        return set()
+
+
+def migrate_charts(
+    include_temporary: bool = True,
+    write_reports: bool = False,
+    restart: bool = False,
+    progress: Callable[[int, int], None] = None,
+    workers: int = None,
+    executor: Executor = None,
+    journal_path: str = None,
+) -> MigrationSummary:
+    """Migrates every saved chart to the current format across a
+    process pool, optionally rewriting the reports of single wheel
+    charts. Each file done is appended to a journal, so a run that was
+    stopped skips what it finished when started again; restart starts
+    over. progress is called with the number of files done and the
+    total after each one."""
+    journal_path = journal_path or src.MIGRATION_JOURNAL_FILE
+    header = json.dumps({'version': VERSION, 'reports': write_reports})
+    done = set() if restart else _read_journal(journal_path, header)
+
+    files = find_chart_files(include_temporary)
+    items = [
+        (path, temporary, write_reports)
+        for (path, temporary) in files
+        if path not in done
+    ]
+    summary = MigrationSummary(
+        total=len(files), resumed=len(files) - len(items)
+    )
+
+    pool = None
+    if executor is None and len(items) < POOL_THRESHOLD:
+        results = map(_migrate_item, items)
+    else:
+        pool = executor or ProcessPoolExecutor(
+            max_workers=workers or max(1, (os.cpu_count() or 2) - 1),
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=initialize_chart_worker,
+            initargs=(src.CHART_PATH, src.TEMP_CHARTS, src.OPTION_PATH),
+        )
+        results = pool.map(_migrate_item, items, chunksize=CHUNK_SIZE)
+
+    os.makedirs(os.path.dirname(journal_path), exist_ok=True)
+    mode = 'a' if done else 'w'
+    try:
+        with open(journal_path, mode) as journal:
+            # Past the header, or any line a crash cut short
+            journal.write(header + '\n' if mode == 'w' else '\n')
+            for count, result in enumerate(results, start=1):
+                summary.counts[result.status] += 1
+                if result.report_written:
+                    summary.reports_written += 1
+                if result.status == MigrationStatus.FAILED:
+                    summary.failures.append(result)
+                else:
+                    journal.write(result.new_path + '\n')
+                    journal.flush()
+                if progress:
+                    progress(summary.resumed + count, summary.total)
+    finally:
+        if pool and executor is None:
+            pool.shutdown(cancel_futures=True)
+
+    return summary
@@ -11,10 +11,9 @@ import math
 import os
 from io import TextIOWrapper
 
-from src import *
+import src
 from src import constants, swe
 from src.models.options import Options
-from src.user_interfaces.widgets import *
 from src.utils.format_utils import to360
 
 SIGNS_SHORT = [
@@ -557,7 +556,7 @@ def make_chart_path(params, temporary, is_ingress=False):
         )
     else:
         filepath = os.path.join(first[0], first, filename)
-    path = TEMP_CHARTS if temporary else CHART_PATH
+    path = src.TEMP_CHARTS if temporary else src.CHART_PATH
 
     return os.path.abspath(os.path.join(path, filepath))
 
@@ -0,0 +1,145 @@
+import numpy as np
+
+# Array versions of the Swiss Ephemeris coordinate transforms used for
+# house positions, angles and horizon coordinates, for evaluating many
+# points, times or locations at once without a round trip into the
+# ephemeris per point. All angles are in degrees, and any argument may be
+# a scalar or an array; results broadcast.
+#
+# Given the same RAMC, obliquity and tropical positions, results agree
+# with swe.cotrans, swe.calc_house_pos, swe.calc_azimuth and
+# swe.calc_meridian_longitude to within TOLERANCE degrees
+# (see test/test_coordinates.py).
+TOLERANCE = 1e-6
+
+# Swiss Ephemeris nudges house positions forward by this much so that a
+# point exactly on a cusp falls inside the house
+MILLIARCSECOND = 1 / 3600000
+
+
+def rotate_polar(longitude, latitude, angle):
+    """Rotates polar coordinates about the x axis, like swe_cotrans."""
+    longitude = np.radians(longitude)
+    latitude = np.radians(latitude)
+    angle = np.radians(angle)
+
+    x = np.cos(latitude) * np.cos(longitude)
+    y = np.cos(latitude) * np.sin(longitude)
+    z = np.sin(latitude)
+
+    rotated_y = y * np.cos(angle) + z * np.sin(angle)
+    rotated_z = -y * np.sin(angle) + z * np.cos(angle)
+
+    rotated_longitude = np.degrees(np.arctan2(rotated_y, x)) % 360
+    rotated_latitude = np.degrees(
+        np.arctan2(rotated_z, np.hypot(x, rotated_y))
+    )
+    return (rotated_longitude, rotated_latitude)
+
+
+def ecliptic_to_equatorial(tropical_longitude, latitude, obliquity):
+    """Returns (right ascension, declination)."""
+    return rotate_polar(tropical_longitude, latitude, -obliquity)
+
+
+def campanus_house_position(
+    ramc, geo_latitude, obliquity, tropical_longitude, latitude
+):
+    """Campanus house position on a 0-360 scale, like swe.calc_house_pos."""
+    (right_ascension, declination) = ecliptic_to_equatorial(
+        tropical_longitude, latitude, obliquity
+    )
+    meridian_distance = (right_ascension - ramc - 90) % 360
+    (house_position, _) = rotate_polar(
+        meridian_distance, declination, -geo_latitude
+    )
+    return (house_position + MILLIARCSECOND) % 360
+
+
+def midheaven_longitude(ramc, obliquity):
+    """Tropical longitude of the MC."""
+    ramc = np.radians(ramc)
+    return (
+        np.degrees(
+            np.arctan2(
+                np.sin(ramc), np.cos(ramc) * np.cos(np.radians(obliquity))
+            )
+        )
+        % 360
+    )
+
+
+def ascendant_longitude(ramc, geo_latitude, obliquity):
+    """Tropical longitude of the ascendant. Not defined inside the polar
+    circles, where the ecliptic can lie along the horizon."""
+    ramc = np.radians(ramc)
+    obliquity = np.radians(obliquity)
+    return (
+        np.degrees(
+            np.arctan2(
+                np.cos(ramc),
+                -(
+                    np.sin(ramc) * np.cos(obliquity)
+                    + np.tan(np.radians(geo_latitude)) * np.sin(obliquity)
+                ),
+            )
+        )
+        % 360
+    )
+
+
+def horizontal_coordinates(
+    ramc, geo_latitude, obliquity, tropical_longitude, latitude
+):
+    """Returns (azimuth, true altitude), with azimuth measured from north
+    like swe.calc_azimuth."""
+    (right_ascension, declination) = ecliptic_to_equatorial(
+        tropical_longitude, latitude, obliquity
+    )
+    meridian_distance = (right_ascension - ramc - 90) % 360
+    (azimuth, altitude) = rotate_polar(
+        meridian_distance, declination, 90 - geo_latitude
+    )
+    # Swiss Ephemeris measures azimuth from the south, clockwise
+    south_azimuth = 360 - (azimuth + 90) % 360
+    return ((south_azimuth + 180) % 360, altitude)
+
+
+def meridian_longitude(azimuth, altitude):
+    """Array version of swe.calc_meridian_longitude."""
+    azimuth = np.asarray(azimuth, dtype=float)
+    altitude = np.asarray(altitude, dtype=float)
+
+    with np.errstate(divide='ignore'):
+        ratio = 1 / np.tan(np.radians(altitude)) / np.cos(np.radians(azimuth))
+        longitude = np.degrees(np.arctan(1 / ratio))
+    longitude = np.where(longitude < 0, longitude + 360, longitude)
+
+    above = altitude >= 0
+    north = (azimuth > 270) | (azimuth < 90)
+    south = (azimuth > 90) & (azimuth < 270)
+
+    # Same above/below and north/south corrections, in the same order
+    above_below_error = (above & (longitude > 270)) | (
+        ~above & (longitude < 90)
+    )
+    north_south_error = ~above_below_error & (
+        (((longitude > 270) | (longitude < 90)) & north)
+        | ((longitude > 90) & (longitude < 270) & south)
+    )
+    flipped = 180 - longitude
+    flipped = np.where(flipped < 0, flipped + 360, flipped)
+    longitude = np.where(
+        above_below_error | north_south_error, flipped, longitude
+    )
+
+    shifted = longitude - 180
+    return np.where(
+        above & (longitude > 180),
+        shifted,
+        np.where(
+            ~above & (longitude < 180),
+            np.where(shifted < 0, shifted + 360, shifted),
+            longitude,
+        ),
+    )
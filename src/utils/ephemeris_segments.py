@@ -0,0 +1,334 @@
+import sys
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from src.swe import calc_planet_longitude
+
+SUN = 0
+MOON = 1
+
+# Sample spacing in days; cubic interpolation between samples stays well
+# under a second of time for crossings at these spacings
+SAMPLE_DAYS = {SUN: 2.0, MOON: 0.5}
+PLANET_SAMPLE_DAYS = 1.0
+
+NEWTON_ITERATIONS = 6
+BISECTION_ITERATIONS = 40
+
+# A shared segment is laid out as float64 planet number, start julian
+# day, step and sample count, then the longitudes, then the speeds
+SHARED_HEADER_SIZE = 4
+
+
+@dataclass
+class EphemerisSegment:
+    """Sidereal longitudes and speeds of one body, sampled at a fixed
+    spacing over a span of julian days."""
+
+    planet: int
+    start_jd: float
+    step: float
+    longitudes: np.ndarray
+    speeds: np.ndarray
+    # The shared memory block holding the arrays, if they are views of one
+    shared: shared_memory.SharedMemory = field(
+        default=None, repr=False, compare=False
+    )
+
+    @property
+    def end_jd(self) -> float:
+        return self.start_jd + self.step * (len(self.longitudes) - 1)
+
+    def share(self, name: str = None) -> 'EphemerisSegment':
+        """Copies the samples into a new shared memory block, and returns
+        the segment read from it. Other processes attach to the block by
+        its name; the creator unlinks it with close(unlink=True)."""
+        count = len(self.longitudes)
+        block = shared_memory.SharedMemory(
+            name=name,
+            create=True,
+            size=(SHARED_HEADER_SIZE + 2 * count) * 8,
+        )
+        data = np.ndarray(
+            (SHARED_HEADER_SIZE + 2 * count,),
+            dtype=np.float64,
+            buffer=block.buf,
+        )
+        data[:SHARED_HEADER_SIZE] = [
+            self.planet,
+            self.start_jd,
+            self.step,
+            count,
+        ]
+        data[SHARED_HEADER_SIZE : SHARED_HEADER_SIZE + count] = self.longitudes
+        data[SHARED_HEADER_SIZE + count :] = self.speeds
+        del data
+
+        return EphemerisSegment.attach(block)
+
+    @staticmethod
+    def attach(block: str | shared_memory.SharedMemory) -> 'EphemerisSegment':
+        """The segment in a shared memory block, by name or block. The
+        arrays are views of the block; nothing is copied.
+
+        Before Python 3.13, attaching registers the block with this
+        process's resource tracker, which unlinks it when the process
+        exits. Pool workers share their parent's tracker, so attach from
+        workers of the process that created the block."""
+        if isinstance(block, str):
+            block = shared_memory.SharedMemory(
+                name=block,
+                **({'track': False} if sys.version_info >= (3, 13) else {}),
+            )
+
+        header = np.ndarray(
+            (SHARED_HEADER_SIZE,), dtype=np.float64, buffer=block.buf
+        )
+        (planet, start_jd, step, count) = header.tolist()
+        count = int(count)
+        samples = np.ndarray(
+            (2, count),
+            dtype=np.float64,
+            buffer=block.buf,
+            offset=SHARED_HEADER_SIZE * 8,
+        )
+
+        return EphemerisSegment(
+            planet=int(planet),
+            start_jd=start_jd,
+            step=step,
+            longitudes=samples[0],
+            speeds=samples[1],
+            shared=block,
+        )
+
+    def close(self, unlink: bool = False):
+        """Lets go of the shared memory block, if any. The segment can't
+        be read afterwards."""
+        if self.shared is None:
+            return
+
+        # The block can't be closed while arrays still point into it
+        self.longitudes = self.speeds = None
+        self.shared.close()
+        if unlink:
+            self.shared.unlink()
+        self.shared = None
+
+    def interpolate(
+        self, julian_days: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Longitudes and speeds at the given julian days, from the cubic
+        Hermite curve through the samples either side of each."""
+        julian_days = np.asarray(julian_days, dtype=float)
+        if (julian_days < self.start_jd).any() or (
+            julian_days > self.end_jd
+        ).any():
+            raise ValueError(
+                f'Dates outside the segment {self.start_jd} - {self.end_jd}'
+            )
+
+        position = (julian_days - self.start_jd) / self.step
+        index = np.clip(
+            np.floor(position).astype(int), 0, len(self.longitudes) - 2
+        )
+        s = position - index
+
+        h = self.step
+        y0 = self.longitudes[index]
+        y1 = y0 + _signed_difference(self.longitudes[index + 1] - y0)
+        (longitudes, slopes) = _hermite(
+            s, y0, self.speeds[index] * h, y1, self.speeds[index + 1] * h
+        )
+
+        return (longitudes % 360, slopes / h)
+
+    def unwrapped_longitudes(self) -> np.ndarray:
+        return self.longitudes[0] + np.concatenate(
+            ([0], np.cumsum(_signed_difference(np.diff(self.longitudes))))
+        )
+
+    def crossings(
+        self, targets: np.ndarray, start_jd: float = None, end_jd: float = None
+    ) -> list[np.ndarray]:
+        """Julian days at which the body reaches each target longitude,
+        for all targets at once. Returns one sorted array per target of
+        the crossings in [start_jd, end_jd), which default to the whole
+        segment."""
+        start_jd = self.start_jd if start_jd is None else start_jd
+        end_jd = self.end_jd if end_jd is None else end_jd
+        targets = np.asarray(targets, dtype=float) % 360
+
+        unwrapped = self.unwrapped_longitudes()
+        if (np.diff(unwrapped) <= 0).any():
+            return self._retrograde_crossings(
+                unwrapped, targets, start_jd, end_jd
+            )
+
+        first_turn = np.ceil((unwrapped[0] - targets) / 360)
+        last_turn = np.floor((unwrapped[-1] - targets) / 360)
+        turns = int((last_turn - first_turn).max(initial=-1)) + 1
+
+        if turns <= 0:
+            return [np.array([]) for _ in targets]
+
+        # [target, turn]
+        values = targets[:, None] + 360 * (
+            first_turn[:, None] + np.arange(turns)[None, :]
+        )
+        valid = values <= unwrapped[-1]
+        index = np.clip(
+            np.searchsorted(unwrapped, values) - 1, 0, len(unwrapped) - 2
+        )
+
+        dates = self._interpolate_crossing(unwrapped, index, values)
+        valid &= (dates >= start_jd) & (dates < end_jd)
+
+        return [dates[row][valid[row]] for row in range(len(targets))]
+
+    def _interpolate_crossing(
+        self, unwrapped: np.ndarray, index: np.ndarray, values: np.ndarray
+    ) -> np.ndarray:
+        # Newton's method on the cubic Hermite curve through the samples
+        # bracketing each value, using the sampled speeds as slopes
+        h = self.step
+        y0 = unwrapped[index]
+        y1 = unwrapped[index + 1]
+        m0 = self.speeds[index] * h
+        m1 = self.speeds[index + 1] * h
+
+        s = np.clip((values - y0) / (y1 - y0), 0, 1)
+        for _ in range(NEWTON_ITERATIONS):
+            (y, slope) = _hermite(s, y0, m0, y1, m1)
+            s = np.clip(s - (y - values) / slope, 0, 1)
+
+        return self.start_jd + (index + s) * h
+
+    def _retrograde_crossings(
+        self,
+        unwrapped: np.ndarray,
+        targets: np.ndarray,
+        start_jd: float,
+        end_jd: float,
+    ) -> list[np.ndarray]:
+        # A body that turns back can reach a value more than once, so
+        # every sample interval bracketing it is solved by bisection,
+        # which the stations' near zero speeds can't throw off
+        low = np.minimum(unwrapped[:-1], unwrapped[1:])
+        high = np.maximum(unwrapped[:-1], unwrapped[1:])
+        h = self.step
+
+        crossings = []
+        for target in targets:
+            values = target + 360 * np.arange(
+                np.ceil((low.min() - target) / 360),
+                np.floor((high.max() - target) / 360) + 1,
+            )
+            (turn, index) = np.nonzero(
+                (low[None, :] <= values[:, None])
+                & (values[:, None] < high[None, :])
+            )
+            values = values[turn]
+            y0 = unwrapped[index]
+            y1 = unwrapped[index + 1]
+            m0 = self.speeds[index] * h
+            m1 = self.speeds[index + 1] * h
+
+            below = np.zeros(len(index))
+            above = np.ones(len(index))
+            start_sign = np.sign(y0 - values)
+            for _ in range(BISECTION_ITERATIONS):
+                middle = (below + above) / 2
+                y = _hermite(middle, y0, m0, y1, m1)[0]
+                before = np.sign(y - values) == start_sign
+                below = np.where(before, middle, below)
+                above = np.where(before, above, middle)
+
+            dates = self.start_jd + (index + (below + above) / 2) * h
+            crossings.append(
+                np.sort(dates[(dates >= start_jd) & (dates < end_jd)])
+            )
+
+        return crossings
+
+
+def _signed_difference(difference: np.ndarray) -> np.ndarray:
+    # The shorter way round; no body moves half a circle between samples
+    return (difference + 180) % 360 - 180
+
+
+def _hermite(
+    s: np.ndarray,
+    y0: np.ndarray,
+    m0: np.ndarray,
+    y1: np.ndarray,
+    m1: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Values and slopes, per unit of s, of the cubic Hermite curves
+    from y0 to y1 with end slopes m0 and m1."""
+    s2 = s * s
+    s3 = s2 * s
+    values = (
+        (2 * s3 - 3 * s2 + 1) * y0
+        + (s3 - 2 * s2 + s) * m0
+        + (-2 * s3 + 3 * s2) * y1
+        + (s3 - s2) * m1
+    )
+    slopes = (
+        (6 * s2 - 6 * s) * y0
+        + (3 * s2 - 4 * s + 1) * m0
+        + (-6 * s2 + 6 * s) * y1
+        + (3 * s2 - 2 * s) * m1
+    )
+    return (values, slopes)
+
+
+def calc_ephemeris_segment(
+    planet: int, start_jd: float, end_jd: float, step: float = None
+) -> EphemerisSegment:
+    step = step or SAMPLE_DAYS.get(planet, PLANET_SAMPLE_DAYS)
+    count = int(np.ceil((end_jd - start_jd) / step)) + 1
+
+    samples = np.array(
+        [
+            calc_planet_longitude(start_jd + index * step, planet)
+            for index in range(count)
+        ]
+    )
+
+    return EphemerisSegment(
+        planet=planet,
+        start_jd=start_jd,
+        step=step,
+        longitudes=samples[:, 0],
+        speeds=samples[:, 1],
+    )
+
+
+def share_ephemeris_segments(
+    segments: dict[int, EphemerisSegment]
+) -> dict[int, EphemerisSegment]:
+    """Shared copies of the segments, for search_roster_solunars calls
+    spread over a process pool. Pass the block names to the workers,
+    which attach with attach_ephemeris_segments; only this process pays
+    for the ephemeris calls."""
+    return {planet: segment.share() for (planet, segment) in segments.items()}
+
+
+def shared_segment_names(
+    segments: dict[int, EphemerisSegment]
+) -> dict[int, str]:
+    return {
+        planet: segment.shared.name for (planet, segment) in segments.items()
+    }
+
+
+def attach_ephemeris_segments(
+    names: dict[int, str]
+) -> dict[int, EphemerisSegment]:
+    return {
+        planet: EphemerisSegment.attach(name)
+        for (planet, name) in names.items()
+    }
@@ -0,0 +1,171 @@
+import math
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+from numpy.polynomial import chebyshev
+
+from src.swe import calc_planet_longitude
+from src.utils.ephemeris_segments import MOON, SUN
+
+FIT_DEGREE = 12
+
+# Piece lengths in days at which a degree 12 fit stays near the
+# library's own noise: about 1e-9 degrees for the Sun, 2e-7 for the Moon
+PIECE_DAYS = {SUN: 16.0, MOON: 8.0}
+DEFAULT_PIECE_DAYS = 16.0
+
+# The largest miss found between the nodes is scaled by this factor
+# to bound the error anywhere in the piece
+ERROR_SAFETY_FACTOR = 4
+MINIMUM_ERROR_BOUND = 1e-9
+
+MAX_FITTED_PIECES = 512
+
+
+def signed_degrees(difference: np.ndarray) -> np.ndarray:
+    return (difference + 180) % 360 - 180
+
+
+@dataclass
+class ChebyshevFit:
+    """Sidereal longitude of a body over [start_jd, end_jd] as a
+    Chebyshev series. Longitudes it returns are within error_bound
+    degrees of the library's."""
+
+    planet: int
+    start_jd: float
+    end_jd: float
+    # Of the unwrapped longitude, over the span mapped onto [-1, 1]
+    coefficients: list[float]
+    speed_coefficients: list[float]
+    error_bound: float
+
+    def covers(self, julian_day: float) -> bool:
+        return self.start_jd <= julian_day <= self.end_jd
+
+    def _x(self, julian_day: float) -> float:
+        return (2 * julian_day - self.start_jd - self.end_jd) / (
+            self.end_jd - self.start_jd
+        )
+
+    @staticmethod
+    def _evaluate(coefficients: list[float], x: float) -> float:
+        # Clenshaw's recurrence; plain floats are far quicker than numpy
+        # for the single dates searches ask for
+        b1 = 0.0
+        b2 = 0.0
+        x2 = 2 * x
+        for coefficient in reversed(coefficients[1:]):
+            (b1, b2) = (x2 * b1 - b2 + coefficient, b1)
+        return x * b1 - b2 + coefficients[0]
+
+    def longitude(self, julian_day: float) -> float:
+        return self._evaluate(self.coefficients, self._x(julian_day)) % 360
+
+    def speed(self, julian_day: float) -> float:
+        return self._evaluate(self.speed_coefficients, self._x(julian_day))
+
+
+def fit_planet_longitude(
+    planet: int, start_jd: float, end_jd: float, degree: int = FIT_DEGREE
+) -> ChebyshevFit:
+    """Interpolates the library's longitudes at the Chebyshev nodes of
+    the span, then checks the fit against the library halfway between
+    each pair of nodes to bound its error."""
+    middle = (start_jd + end_jd) / 2
+    half_span = (end_jd - start_jd) / 2
+
+    nodes = np.cos(np.pi * (np.arange(degree + 1) + 0.5) / (degree + 1))
+    samples = np.array(
+        [
+            calc_planet_longitude(middle + half_span * x, planet)[0]
+            for x in nodes
+        ]
+    )
+    unwrapped = samples[0] + np.concatenate(
+        ([0], np.cumsum(signed_degrees(np.diff(samples))))
+    )
+    coefficients = chebyshev.chebfit(nodes, unwrapped, degree)
+
+    checks = np.cos(np.pi * np.arange(1, degree + 1) / (degree + 1))
+    misses = signed_degrees(
+        chebyshev.chebval(checks, coefficients)
+        - np.array(
+            [
+                calc_planet_longitude(middle + half_span * x, planet)[0]
+                for x in checks
+            ]
+        )
+    )
+
+    return ChebyshevFit(
+        planet=planet,
+        start_jd=start_jd,
+        end_jd=end_jd,
+        coefficients=coefficients.tolist(),
+        speed_coefficients=(
+            chebyshev.chebder(coefficients) / half_span
+        ).tolist(),
+        error_bound=max(
+            ERROR_SAFETY_FACTOR * float(np.abs(misses).max()),
+            MINIMUM_ERROR_BOUND,
+        ),
+    )
+
+
+class FittedLongitudes:
+    """Longitudes of one body, on a fixed grid of pieces that are each
+    fitted the first time a date in them is asked for. Fitted pieces
+    are kept for later searches, least recently used out first."""
+
+    def __init__(
+        self,
+        planet: int,
+        piece_days: float = None,
+        max_pieces: int = MAX_FITTED_PIECES,
+    ):
+        self.planet = planet
+        self.piece_days = piece_days or PIECE_DAYS.get(
+            planet, DEFAULT_PIECE_DAYS
+        )
+        self.max_pieces = max_pieces
+        self.fits: OrderedDict[int, ChebyshevFit] = OrderedDict()
+        self.lock = threading.Lock()
+
+    def fit_at(self, julian_day: float) -> ChebyshevFit:
+        index = math.floor(julian_day / self.piece_days)
+        with self.lock:
+            fit = self.fits.get(index)
+            if fit is not None:
+                self.fits.move_to_end(index)
+
+        if fit is None:
+            fit = fit_planet_longitude(
+                self.planet,
+                index * self.piece_days,
+                (index + 1) * self.piece_days,
+            )
+            with self.lock:
+                self.fits[index] = fit
+                if len(self.fits) > self.max_pieces:
+                    self.fits.popitem(last=False)
+
+        return fit
+
+    def longitude(self, julian_day: float) -> tuple[float, float]:
+        """The fitted longitude, and the bound on its error."""
+        fit = self.fit_at(julian_day)
+        return (fit.longitude(julian_day), fit.error_bound)
+
+
+FITTED_LONGITUDES: dict[int, FittedLongitudes] = {}
+
+
+def fitted_longitudes(planet: int) -> FittedLongitudes:
+    """The shared fitted longitudes of the body."""
+    fitted = FITTED_LONGITUDES.get(planet)
+    if fitted is None:
+        fitted = FITTED_LONGITUDES.setdefault(planet, FittedLongitudes(planet))
+    return fitted
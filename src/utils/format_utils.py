@@ -107,3 +107,18 @@ def parse_version_from_txt_file(file_path: str) -> str:
             if '.' in element:
                 return version_str_to_tuple(element)
     return (0, 0, 0)
+
+
+def get_signed_orb_to_reference(longitude: float, reference: float) -> float:
+    if longitude >= reference:
+        if longitude - reference >= 180:
+            diff = 360 - longitude
+            return (reference + diff) * -1
+
+        return longitude - reference
+
+    if reference - longitude >= 180:
+        diff = 360 - reference
+        return longitude + diff
+
+    return longitude - reference
@@ -0,0 +1,276 @@
+from copy import deepcopy
+
+import numpy as np
+
+import src.models.charts as chart_models
+from src.models.options import Options
+from src.utils.calculation_utils import ASPECT_DEFINITIONS, parse_aspect
+from src.utils.format_utils import to360
+
+# Harmonic charts only show the major hard aspects
+HARMONIC_ASPECT_KEYS = ['0', '90', '180']
+
+# Slack on the vectorized orb screen; parse_aspect makes the final call
+SCREEN_TOLERANCE = 1e-9
+
+
+def calc_harmonic_longitude(
+    longitude: float, harmonic: int, offset: float = 0
+) -> float:
+    return to360((longitude * harmonic) % 360 + offset)
+
+
+def calc_harmonic_planets(
+    chart: chart_models.ChartObject,
+    options: Options,
+    harmonic: int,
+    offset: float = 0,
+    role: chart_models.ChartWheelRole = None,
+) -> dict[str, chart_models.PlanetData]:
+    """The Nth-harmonic positions of the chart's planets, in the given
+    role or else the chart's own."""
+    role = chart.role if role is None else role
+    harmonic_planets: dict[str, chart_models.PlanetData] = {}
+
+    for [key, data] in chart.iterate_points(options):
+        harmonic_planets[key] = chart_models.PlanetData(
+            name=key,
+            short_name=data.short_name,
+            number=data.number,
+            longitude=calc_harmonic_longitude(
+                data.longitude, harmonic, offset
+            ),
+            latitude=0,
+            speed=data.speed * harmonic,
+            right_ascension=0,
+            declination=0,
+            azimuth=0,
+            role=role,
+            is_stationary=data.is_stationary,
+        )
+
+    return harmonic_planets
+
+
+def calc_harmonic_chart(
+    chart: chart_models.ChartObject,
+    options: Options,
+    harmonic: int,
+    offset: float = 0,
+    role: chart_models.ChartWheelRole = None,
+) -> chart_models.ChartObject:
+    """Pseudo-chart holding the Nth-harmonic positions of the chart's
+    planets. It is derived from the chart's own positions, so no
+    ephemeris work is repeated. It takes the given role, or else keeps
+    the chart's own."""
+    role = chart.role if role is None else role
+    harmonic_chart = chart.copy().with_role(role)
+    harmonic_chart.planets.update(
+        calc_harmonic_planets(chart, options, harmonic, offset, role)
+    )
+    return harmonic_chart
+
+
+def calc_harmonic_charts(
+    chart: chart_models.ChartObject,
+    options: Options,
+    harmonics: list[int],
+    role: chart_models.ChartWheelRole = None,
+) -> dict[int, chart_models.ChartObject]:
+    return {
+        harmonic: calc_harmonic_chart(chart, options, harmonic, role=role)
+        for harmonic in harmonics
+    }
+
+
+def harmonic_aspect_options(options: Options) -> tuple[Options, Options]:
+    """Returns the options for aspects within a harmonic chart,
+    and the class 1 only options for harmonic-to-natal aspects."""
+    harmonic_options = deepcopy(options)
+    harmonic_options.ecliptic_aspects = {
+        key: options.ecliptic_aspects[key] for key in HARMONIC_ASPECT_KEYS
+    }
+
+    harmonic_to_natal_options = deepcopy(harmonic_options)
+    for key in harmonic_to_natal_options.ecliptic_aspects:
+        harmonic_to_natal_options.ecliptic_aspects[key] = [
+            harmonic_to_natal_options.ecliptic_aspects[key][0],
+            0,
+            0,
+        ]
+
+    return (harmonic_options, harmonic_to_natal_options)
+
+
+def screen_aspect_orbs(raw_orbs: np.ndarray, options: Options) -> np.ndarray:
+    """Vectorized in_harmonic_range over every aspect parse_aspect would
+    try; True wherever any enabled class could match."""
+    candidates = np.zeros(raw_orbs.shape, dtype=bool)
+
+    for dictionary_key_degrees, _, harmonic in ASPECT_DEFINITIONS:
+        orbs = options.ecliptic_aspects.get(
+            str(dictionary_key_degrees), [0, 0, 0]
+        )
+        if not len(orbs) or not orbs[0]:
+            continue
+
+        harmonic_degree_width = 360 / harmonic
+        remainder = raw_orbs % harmonic_degree_width
+        offset_from_exact = np.minimum(
+            remainder, harmonic_degree_width - remainder
+        )
+        candidates |= offset_from_exact <= max(orbs) + SCREEN_TOLERANCE
+
+    return candidates
+
+
+def make_harmonic_aspect(
+    primary_planet: chart_models.PlanetData,
+    secondary_planet: chart_models.PlanetData,
+    from_is_radix: bool,
+    to_is_radix: bool,
+    raw_orb: float,
+    options: Options,
+    is_harmonic_to_natal: bool,
+    harmonic_role: chart_models.ChartWheelRole,
+) -> chart_models.Aspect | None:
+    (aspect_type, aspect_class, aspect_orb, aspect_strength) = parse_aspect(
+        value=raw_orb, options=options
+    )
+
+    if not aspect_type:
+        return None
+
+    if aspect_class > 2:
+        return None
+
+    if is_harmonic_to_natal:
+        aspect_class = 3
+
+    from_planet = (
+        primary_planet
+        if primary_planet.role >= secondary_planet.role
+        else secondary_planet
+    )
+
+    to_planet = (
+        primary_planet if from_planet == secondary_planet else secondary_planet
+    )
+
+    from_planet_role = (
+        chart_models.ChartWheelRole.RADIX if from_is_radix else harmonic_role
+    )
+    to_planet_role = (
+        chart_models.ChartWheelRole.RADIX if to_is_radix else harmonic_role
+    )
+
+    return (
+        chart_models.Aspect()
+        .from_planet(from_planet.short_name, role=from_planet_role)
+        .to_planet(to_planet.short_name, role=to_planet_role)
+        .as_type(aspect_type)
+        .with_class(aspect_class)
+        .as_ecliptical()
+        .with_strength(aspect_strength)
+        .with_orb(aspect_orb)
+    )
+
+
+def calc_harmonic_aspects(
+    radix: chart_models.ChartObject,
+    harmonic_charts: dict[int, chart_models.ChartObject],
+    options: Options,
+) -> dict[int, list[list[chart_models.Aspect]]]:
+    """Aspects within each harmonic chart (classes 1 and 2) and from each
+    harmonic chart to the radix (class 3). The orbs of every pair in every
+    harmonic are screened in one array pass; only the pairs that could
+    form an aspect go through parse_aspect."""
+    (harmonic_options, harmonic_to_natal_options) = harmonic_aspect_options(
+        options
+    )
+
+    radix_points = [point for (_, point) in radix.iterate_points(options)]
+    harmonic_points = {
+        harmonic: [point for (_, point) in chart.iterate_points(options)]
+        for (harmonic, chart) in harmonic_charts.items()
+    }
+
+    radix_longitudes = np.array([point.longitude for point in radix_points])
+    # [harmonic, point]
+    harmonic_longitudes = np.array(
+        [
+            [point.longitude for point in points]
+            for points in harmonic_points.values()
+        ]
+    ).reshape(len(harmonic_charts), -1)
+
+    # [harmonic, primary, secondary]
+    internal_orbs = (
+        np.abs(
+            harmonic_longitudes[:, :, None] - harmonic_longitudes[:, None, :]
+        )
+        % 360
+    )
+    to_natal_orbs = (
+        np.abs(harmonic_longitudes[:, :, None] - radix_longitudes[None, None])
+        % 360
+    )
+
+    point_count = harmonic_longitudes.shape[1]
+    later_points = np.triu(np.ones((point_count, point_count), dtype=bool), 1)
+    internal_candidates = (
+        screen_aspect_orbs(internal_orbs, harmonic_options) & later_points
+    )
+    to_natal_candidates = screen_aspect_orbs(
+        to_natal_orbs, harmonic_to_natal_options
+    )
+
+    aspects = {}
+    for harmonic_index, (harmonic, points) in enumerate(
+        harmonic_points.items()
+    ):
+        aspects_by_class = [[], [], []]
+
+        for primary_index, secondary_index in zip(
+            *np.nonzero(internal_candidates[harmonic_index])
+        ):
+            aspect = make_harmonic_aspect(
+                points[primary_index],
+                points[secondary_index],
+                False,
+                False,
+                float(
+                    internal_orbs[
+                        harmonic_index, primary_index, secondary_index
+                    ]
+                ),
+                harmonic_options,
+                is_harmonic_to_natal=False,
+                harmonic_role=harmonic_charts[harmonic].role,
+            )
+            if aspect:
+                aspects_by_class[aspect.aspect_class - 1].append(aspect)
+
+        for primary_index, secondary_index in zip(
+            *np.nonzero(to_natal_candidates[harmonic_index])
+        ):
+            aspect = make_harmonic_aspect(
+                points[primary_index],
+                radix_points[secondary_index],
+                False,
+                True,
+                float(
+                    to_natal_orbs[
+                        harmonic_index, primary_index, secondary_index
+                    ]
+                ),
+                harmonic_to_natal_options,
+                is_harmonic_to_natal=True,
+                harmonic_role=harmonic_charts[harmonic].role,
+            )
+            if aspect:
+                aspects_by_class[aspect.aspect_class - 1].append(aspect)
+
+        aspects[harmonic] = aspects_by_class
+
+    return aspects
@@ -0,0 +1,187 @@
+import mmap
+import os
+import struct
+from bisect import bisect_right
+
+import src
+from src.models.options import ProgramOptions
+from src.swe import calc_moon_crossing, calc_sun_crossing, julday
+
+# File layout (little-endian):
+#   header:  magic, version, series count, span start JD, span end JD
+#   table:   one (body, target, first index, count) row per series
+#   data:    float64 julian days (UT) of every crossing, sorted per series
+ALMANAC_MAGIC = b'TMSAINGR'
+ALMANAC_VERSION = 1
+
+HEADER = struct.Struct('<8sIIdd')
+SERIES_ROW = struct.Struct('<IIQQ')
+
+SUN = 0
+MOON = 1
+CARDINAL_TARGETS = (0, 90, 180, 270)
+
+DEFAULT_START_YEAR = ProgramOptions.ingress_almanac_start_year
+DEFAULT_END_YEAR = ProgramOptions.ingress_almanac_end_year
+
+_crossing_functions = {SUN: calc_sun_crossing, MOON: calc_moon_crossing}
+
+
+def cardinal_target(ingress_name: str) -> int:
+    if 'Ari' in ingress_name:
+        return 0
+    if 'Can' in ingress_name:
+        return 90
+    if 'Lib' in ingress_name:
+        return 180
+    if 'Cap' in ingress_name:
+        return 270
+    raise ValueError(f'Not a cardinal ingress: {ingress_name}')
+
+
+def generate_ingress_almanac(
+    path: str,
+    start_year: int = DEFAULT_START_YEAR,
+    end_year: int = DEFAULT_END_YEAR,
+):
+    start = julday(start_year, 1, 1, 0, 1)
+    end = julday(end_year, 1, 1, 0, 1)
+
+    series = []
+    for body in (SUN, MOON):
+        find_crossing = _crossing_functions[body]
+        for target in CARDINAL_TARGETS:
+            crossings = []
+            date = find_crossing(target, start)
+            while date <= end:
+                crossings.append(date)
+                date = find_crossing(target, date + 1)
+            series.append((body, target, crossings))
+
+    header = HEADER.pack(
+        ALMANAC_MAGIC, ALMANAC_VERSION, len(series), start, end
+    )
+    table = b''
+    first_index = 0
+    for body, target, crossings in series:
+        table += SERIES_ROW.pack(body, target, first_index, len(crossings))
+        first_index += len(crossings)
+
+    # Write to a sibling file and swap it in, so a reader never maps a
+    # half-written almanac.
+    temporary_path = path + '.tmp'
+    with open(temporary_path, 'wb') as file:
+        file.write(header)
+        file.write(table)
+        for _, _, crossings in series:
+            file.write(struct.pack(f'<{len(crossings)}d', *crossings))
+    os.replace(temporary_path, path)
+
+
+class IngressAlmanac:
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as file:
+            self.__map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (magic, version, series_count, start, end) = HEADER.unpack_from(
+            self.__map, 0
+        )
+        if magic != ALMANAC_MAGIC or version != ALMANAC_VERSION:
+            self.__map.close()
+            raise ValueError(f'Unsupported ingress almanac: {path}')
+
+        self.start = start
+        self.end = end
+
+        self.__series = {}
+        for i in range(series_count):
+            (body, target, first_index, count) = SERIES_ROW.unpack_from(
+                self.__map, HEADER.size + i * SERIES_ROW.size
+            )
+            self.__series[(body, target)] = (first_index, first_index + count)
+
+        data_offset = HEADER.size + series_count * SERIES_ROW.size
+        day_count = max(
+            (high for (_, high) in self.__series.values()), default=0
+        )
+        # A file cut short, like one left by an interrupted copy, is
+        # regenerated rather than read past its end
+        if len(self.__map) != data_offset + day_count * 8:
+            self.__map.close()
+            raise ValueError(f'Ingress almanac is the wrong size: {path}')
+
+        self.__days = memoryview(self.__map)[data_offset:].cast('d')
+
+    def close(self):
+        self.__days.release()
+        self.__map.close()
+
+    def crossings(self, body: int, target: int) -> list[float]:
+        (low, high) = self.__series.get((body, target), (0, 0))
+        return self.__days[low:high].tolist()
+
+    def next_crossing(self, body: int, target: int, after: float):
+        """Returns the first crossing after the given julian day,
+        or None if the answer is not covered by the almanac."""
+        if (body, target) not in self.__series or after < self.start:
+            return None
+        (low, high) = self.__series[(body, target)]
+        index = bisect_right(self.__days, after, low, high)
+        if index >= high:
+            return None
+        return self.__days[index]
+
+
+_almanac = None
+
+
+def ingress_almanac_years() -> tuple[int, int]:
+    """The years the almanac covers, as set in the program options."""
+    options = ProgramOptions.from_default()
+    if os.path.exists(src.PROGRAM_OPTION_PATH):
+        options = ProgramOptions.from_file(src.PROGRAM_OPTION_PATH)
+    return (
+        options.ingress_almanac_start_year,
+        options.ingress_almanac_end_year,
+    )
+
+
+def load_ingress_almanac(
+    path: str = None, start_year: int = None, end_year: int = None
+):
+    """The almanac, regenerated if it can't be read or covers other
+    years than start_year to end_year, which default to the program
+    options."""
+    global _almanac
+    if _almanac is None:
+        path = path or src.INGRESS_ALMANAC_FILE
+        if start_year is None or end_year is None:
+            (start_year, end_year) = ingress_almanac_years()
+        span = (julday(start_year, 1, 1, 0, 1), julday(end_year, 1, 1, 0, 1))
+
+        try:
+            almanac = IngressAlmanac(path)
+        except (OSError, ValueError, struct.error):
+            almanac = None
+        if almanac and (almanac.start, almanac.end) != span:
+            almanac.close()
+            almanac = None
+
+        if almanac is None:
+            generate_ingress_almanac(path, start_year, end_year)
+            almanac = IngressAlmanac(path)
+        _almanac = almanac
+    return _almanac
+
+
+def calc_ingress_crossing(body: int, target: int, start: float) -> float:
+    """Same result as calc_sun_crossing/calc_moon_crossing, answered from
+    the almanac when the date falls within its span."""
+    try:
+        date = load_ingress_almanac().next_crossing(body, target, start)
+    except OSError:
+        date = None
+    if date is None:
+        date = _crossing_functions[body](target, start)
+    return date
@@ -13,29 +13,24 @@ from src.utils.chart_utils import (
     zod_sec_with_sign,
 )
 from src.utils.format_utils import to360
+from src.utils.harmonics import (
+    calc_harmonic_aspects,
+    calc_harmonic_chart,
+    calc_harmonic_longitude,
+    calc_harmonic_planets,
+)
+
+NOVIEN_HARMONIC = 9
+# To get the appropriate sign, novien positions are counted from 0° Taurus
+NOVIEN_OFFSET = 120
 
 
 def write_novien_data_table_to_file(
     chart: ChartObject, options: Options, chartfile: TextIOWrapper
 ) -> dict[str, PlanetData]:
-    novien_planets: dict[str, PlanetData] = {}
-
-    # Calculate novien positions
-    for [key, data] in chart.iterate_points(options):
-        novien_longitude = calc_novien_longitude(data.longitude)
-        novien_planets[key] = PlanetData(
-            name=key,
-            short_name=data.short_name,
-            number=data.number,
-            longitude=novien_longitude,
-            latitude=0,
-            speed=data.speed * 9,
-            right_ascension=0,
-            declination=0,
-            azimuth=0,
-            role=ChartWheelRole.NOVIEN,
-            is_stationary=data.is_stationary,
-        )
+    novien_planets = calc_harmonic_planets(
+        chart, options, NOVIEN_HARMONIC, NOVIEN_OFFSET, ChartWheelRole.NOVIEN
+    )
 
     moon_noviens = calc_successive_noviens(
         novien_planets['Moon'].longitude, first_already_novien=True
@@ -202,11 +197,21 @@ def __calc_novien_longitude_using_0_taurus(longitude: float) -> float:
 
 
 def calc_novien_longitude(longitude: float) -> float:
-    navamsa_position = (longitude * 9) % 360
+    return calc_harmonic_longitude(longitude, NOVIEN_HARMONIC, NOVIEN_OFFSET)
+
+
+def calc_novien_chart(chart: ChartObject, options: Options) -> ChartObject:
+    return calc_harmonic_chart(
+        chart, options, NOVIEN_HARMONIC, NOVIEN_OFFSET, ChartWheelRole.NOVIEN
+    )
+
 
-    # To get the appropriate sign, this needs to be converted
-    # to be based on 0° Taurus
-    return to360(navamsa_position + 120)
+def calc_novien_aspects(
+    radix: ChartObject, novien_chart: ChartObject, options: Options
+) -> list[list[Aspect]]:
+    return calc_harmonic_aspects(
+        radix, {NOVIEN_HARMONIC: novien_chart}, options
+    )[NOVIEN_HARMONIC]
 
 
 def calc_successive_noviens(
@@ -0,0 +1,276 @@
+from dataclasses import dataclass
+from io import TextIOWrapper
+
+import numpy as np
+
+from src.constants import MONTHS, PLANETS
+from src.models.angles import AngleAxes, MajorAngles
+from src.models.charts import ChartObject, ChartType
+from src.models.options import Options
+from src.swe import revjul
+from src.utils.chart_utils import (
+    center_align,
+    fmt_hms,
+    left_align,
+    right_align,
+    signed_degree_minute,
+    zod_min,
+)
+from src.utils.coordinates import campanus_house_position
+from src.utils.rectification import (
+    MINUTES_PER_DAY,
+    TimeSweep,
+    calc_angle_sweep,
+)
+from src.utils.relocation import RELATED_ANGLES, calc_angularity
+from src.utils.transits.progressions import (
+    ProgressionTypes,
+    calc_ssr_crossings,
+    get_progressed_jd_utc,
+    ssr_crossings_hold,
+)
+
+# Major angles by house quadrant, counted from the ascendant
+QUADRANT_ANGLES = [
+    MajorAngles.ASCENDANT,
+    MajorAngles.IC,
+    MajorAngles.DESCENDANT,
+    MajorAngles.MC,
+]
+MINOR_ANGLE_AXES = {
+    'ZN': AngleAxes.ZENITH_NADIR,
+    'EW': AngleAxes.EASTPOINT_WESTPOINT,
+    'RA': AngleAxes.EASTPOINT_IN_RA,
+}
+
+
+def snq_progressed_params(params: dict, progressed_jd: float) -> dict:
+    """Params of the progressed chart of an SNQ, cast for the place in
+    params."""
+    (p_year, p_month, p_day, p_time) = revjul(progressed_jd, params['style'])
+    return {
+        'year': p_year,
+        'month': p_month,
+        'day': p_day,
+        'time': p_time,
+        'zone': 'UT',
+        'correction': 0,
+        'type': ChartType.SIDEREAL_NATAL_QUOTIDIAN.value,
+        'location': params['location'],
+        'longitude': params['longitude'],
+        'latitude': params['latitude'],
+        'name': params['base_chart']['name'],
+    }
+
+
+@dataclass
+class TimelineAngularity:
+    """Angularity of bodies to the progressed angles at each step of a
+    timeline. The arrays are indexed [body, step]; related_angle holds
+    indices into RELATED_ANGLES."""
+
+    house: np.ndarray
+    strength: np.ndarray
+    signed_orb: np.ndarray
+    related_angle: np.ndarray
+    is_foreground: np.ndarray
+
+    def peak_steps(self) -> np.ndarray:
+        """Whether each body's strength is at its highest at each step
+        among the steps around it, while it is foreground."""
+        strength = np.where(self.is_foreground, self.strength, -np.inf)
+        padded = np.pad(strength, ((0, 0), (1, 1)), constant_values=-np.inf)
+        return (
+            self.is_foreground
+            & (strength >= padded[:, :-2])
+            & (strength >= padded[:, 2:])
+        )
+
+    def angle_label(self, body_index: int, step: int) -> str:
+        related_angle = RELATED_ANGLES[self.related_angle[body_index, step]]
+        if related_angle == 'major':
+            quadrant = int(round(self.house[body_index, step] / 90)) % 4
+            return QUADRANT_ANGLES[quadrant].value.strip()
+        return MINOR_ANGLE_AXES[related_angle].value
+
+
+@dataclass
+class QuotidianTimeline:
+    """Sidereal natal quotidian progressions to each step of a range of
+    dates. progressed holds the progressed angles and the progressed
+    bodies' positions; radix and progressed_bodies score the radix and
+    progressed bodies against the progressed angles."""
+
+    bodies: list[str]
+    julian_days: np.ndarray
+    progressed_julian_days: np.ndarray
+    progressed: TimeSweep
+    radix: TimelineAngularity
+    progressed_bodies: TimelineAngularity
+
+    def flagged_steps(self) -> list[int]:
+        """Steps at which a radix or progressed body is most angular
+        among the steps around it, for charts to be cast at."""
+        peaks = self.radix.peak_steps() | self.progressed_bodies.peak_steps()
+        return np.nonzero(peaks.any(axis=0))[0].tolist()
+
+
+def _score(
+    house: np.ndarray,
+    longitude: np.ndarray,
+    right_ascension: np.ndarray,
+    sweep: TimeSweep,
+    options: Options,
+) -> TimelineAngularity:
+    (strength, signed_orb, related_angle, is_foreground) = calc_angularity(
+        house,
+        longitude,
+        right_ascension,
+        sweep.ramc[np.newaxis],
+        sweep.ascendant[np.newaxis],
+        sweep.midheaven[np.newaxis],
+        options,
+    )
+    return TimelineAngularity(
+        house=house,
+        strength=strength,
+        signed_orb=signed_orb,
+        related_angle=related_angle,
+        is_foreground=is_foreground,
+    )
+
+
+def calc_snq_progressed_jds(
+    radix: ChartObject,
+    julian_days: np.ndarray,
+    use_apparent_rate: bool = False,
+) -> np.ndarray:
+    """The SNQ progressed date for each date, finding the solar returns
+    to progress between only when a date passes the last ones found."""
+    radix_sun_longitude = radix.planets['Sun'].longitude
+    crossings = None
+    progressed_jds = []
+    for julian_day in julian_days:
+        if not ssr_crossings_hold(crossings, julian_day):
+            crossings = calc_ssr_crossings(radix_sun_longitude, julian_day)
+        progressed_jds.append(
+            get_progressed_jd_utc(
+                base_jd=radix.julian_day_utc,
+                target_jd=julian_day,
+                radix_sun_longitude=radix_sun_longitude,
+                progression_type=ProgressionTypes.Q2.value,
+                use_apparent_rate=use_apparent_rate,
+                ssr_crossings=crossings,
+            )
+        )
+    return np.array(progressed_jds)
+
+
+def calc_snq_timeline(
+    radix: ChartObject,
+    start_jd: float,
+    end_jd: float,
+    step_days: float,
+    geo_latitude: float,
+    geo_longitude: float,
+    options: Options,
+    use_apparent_rate: bool = False,
+) -> QuotidianTimeline:
+    """SNQ progressions for the place to every step_days from start_jd
+    to end_jd. The progressed angles and bodies come from one sweep
+    over the progressed dates, which cover about a day for each year of
+    the range, rather than from a chart cast for each step."""
+    julian_days = np.arange(start_jd, end_jd + step_days / 2, step_days)
+    progressed_jds = calc_snq_progressed_jds(
+        radix, julian_days, use_apparent_rate
+    )
+
+    bodies = [name for name, _ in radix.iterate_points(options)]
+    sweep = calc_angle_sweep(
+        progressed_jds,
+        geo_latitude,
+        geo_longitude,
+        bodies,
+        (progressed_jds - radix.julian_day_utc) * MINUTES_PER_DAY,
+    )
+
+    planets = [radix.planets[name] for name in bodies]
+    radix_longitude = np.array([p.longitude for p in planets])[:, None]
+    radix_latitude = np.array([p.latitude for p in planets])[:, None]
+    radix_right_ascension = np.array([p.right_ascension for p in planets])[
+        :, None
+    ]
+    radix_house = campanus_house_position(
+        sweep.ramc[np.newaxis],
+        geo_latitude,
+        sweep.obliquity[np.newaxis],
+        radix_longitude + sweep.ayanamsa[np.newaxis],
+        radix_latitude,
+    )
+
+    return QuotidianTimeline(
+        bodies=bodies,
+        julian_days=julian_days,
+        progressed_julian_days=progressed_jds,
+        progressed=sweep,
+        radix=_score(
+            radix_house,
+            radix_longitude,
+            radix_right_ascension,
+            sweep,
+            options,
+        ),
+        progressed_bodies=_score(
+            sweep.house,
+            sweep.longitude,
+            sweep.right_ascension,
+            sweep,
+            options,
+        ),
+    )
+
+
+def write_snq_timeline_to_file(
+    timeline: QuotidianTimeline, style: int, chartfile: TextIOWrapper
+):
+    """One line per step: the date, the progressed angles, and each
+    foreground body with the angle it is on and its orb. Progressed
+    bodies are marked with a p."""
+    chartfile.write(
+        f"{left_align('Date', 12)} {left_align('Time UT', 8)} "
+        f"{right_align('RAMC', 6)}"
+    )
+    for angle in ['Mc', 'As', 'Ep', 'Vx']:
+        chartfile.write(f' {center_align(angle, 6)}')
+    chartfile.write('    Foreground\n')
+    sweep = timeline.progressed
+    for step, julian_day in enumerate(timeline.julian_days):
+        (year, month, day, time) = revjul(julian_day, style)
+        chartfile.write(
+            f'{day:2d} {MONTHS[month - 1]} {year:5d} {fmt_hms(time)}'
+        )
+        chartfile.write(f' {sweep.ramc[step]:6.2f}')
+        for angle in [
+            sweep.midheaven,
+            sweep.ascendant,
+            sweep.eastpoint,
+            sweep.vertex,
+        ]:
+            chartfile.write(f' {zod_min(angle[step])}')
+        chartfile.write('   ')
+
+        for prefix, angularity in [
+            ('', timeline.radix),
+            ('p', timeline.progressed_bodies),
+        ]:
+            for body_index, body in enumerate(timeline.bodies):
+                if not angularity.is_foreground[body_index, step]:
+                    continue
+                short_name = prefix + PLANETS[body]['short_name']
+                angle = angularity.angle_label(body_index, step)
+                orb = angularity.signed_orb[body_index, step]
+                chartfile.write(
+                    f' {left_align(short_name, 3)} {left_align(angle, 2)}'
+                    f' {signed_degree_minute(orb)}'
+                )
+        chartfile.write('\n')
@@ -0,0 +1,272 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from src import swe
+from src.constants import PLANETS
+from src.models.charts import ChartObject
+from src.utils.coordinates import (
+    ascendant_longitude,
+    campanus_house_position,
+    midheaven_longitude,
+)
+
+# Planetary positions are taken from the ephemeris this often across a
+# sweep and interpolated in between; over an hour even the Moon's path
+# bends by less than 1e-4 degrees
+POSITION_SAMPLE_MINUTES = 60
+
+MINUTES_PER_DAY = 1440
+
+# House positions at which a body is on each major angle
+MUNDANE_ANGLES = {'As': 0.0, 'Ic': 90.0, 'Ds': 180.0, 'Mc': 270.0}
+# Angles a body crosses when the angle's longitude reaches the body's
+ZODIACAL_ANGLES = ['Ep', 'Vx']
+
+
+def signed_degrees(difference: np.ndarray) -> np.ndarray:
+    return (difference + 180) % 360 - 180
+
+
+def unwrap_degrees(values: np.ndarray) -> np.ndarray:
+    return values[0] + np.concatenate(
+        ([0], np.cumsum(signed_degrees(np.diff(values))))
+    )
+
+
+@dataclass
+class AngleCrossing:
+    body: str
+    angle: str
+    julian_day: float
+    # From the chart's own time
+    minutes: float
+
+
+@dataclass
+class TimeSweep:
+    """Angles of a chart recast at each of a range of times, and the
+    house position of each body at each time. Longitudes are sidereal;
+    house positions are Campanus, 0-360 from the ascendant. Angle
+    arrays are indexed [time], body arrays [body, time]."""
+
+    bodies: list[str]
+    minutes: np.ndarray
+    julian_days: np.ndarray
+    ayanamsa: np.ndarray
+    obliquity: np.ndarray
+    ramc: np.ndarray
+    midheaven: np.ndarray
+    ascendant: np.ndarray
+    eastpoint: np.ndarray
+    vertex: np.ndarray
+    longitude: np.ndarray
+    right_ascension: np.ndarray
+    house: np.ndarray
+
+    def angle_crossings(
+        self, bodies: list[str] = None, angles: list[str] = None
+    ) -> list[AngleCrossing]:
+        """Times at which each body reaches each angle, in time order.
+        Mundane angles (As, Ic, Ds, Mc) are reached when the body's house
+        position passes the angle's; Ep and Vx when the angle's longitude
+        passes the body's. Times between steps are interpolated."""
+        bodies = bodies or self.bodies
+        angles = angles or [*MUNDANE_ANGLES, *ZODIACAL_ANGLES]
+
+        crossings = []
+        for body in bodies:
+            body_index = self.bodies.index(body)
+            for angle in angles:
+                if angle in MUNDANE_ANGLES:
+                    distance = signed_degrees(
+                        self.house[body_index] - MUNDANE_ANGLES[angle]
+                    )
+                else:
+                    angle_longitudes = (
+                        self.eastpoint if angle == 'Ep' else self.vertex
+                    )
+                    distance = signed_degrees(
+                        angle_longitudes - self.longitude[body_index]
+                    )
+                crossings.extend(
+                    AngleCrossing(body, angle, julian_day, minutes)
+                    for (julian_day, minutes) in self._zero_crossings(distance)
+                )
+
+        return sorted(crossings, key=lambda crossing: crossing.julian_day)
+
+    def _zero_crossings(self, distance: np.ndarray):
+        before = distance[:-1]
+        after = distance[1:]
+        # A jump of half a circle is the far side going past, not a crossing
+        steps = np.nonzero(
+            ((before < 0) & (after >= 0) | (before > 0) & (after <= 0))
+            & (np.abs(after - before) < 90)
+        )[0]
+        for step in steps:
+            fraction = before[step] / (before[step] - after[step])
+            yield (
+                float(
+                    self.julian_days[step]
+                    + fraction
+                    * (self.julian_days[step + 1] - self.julian_days[step])
+                ),
+                float(
+                    self.minutes[step]
+                    + fraction * (self.minutes[step + 1] - self.minutes[step])
+                ),
+            )
+
+
+def calc_time_sweep(
+    chart: ChartObject,
+    start_minutes: float,
+    end_minutes: float,
+    step_minutes: float = 1,
+    bodies: list[str] = None,
+) -> TimeSweep:
+    """Recasts the chart's angles every step_minutes from start_minutes
+    to end_minutes around its own time, without casting whole charts."""
+    if step_minutes <= 0:
+        raise ValueError(f'Step must be positive, not {step_minutes} minutes.')
+    if end_minutes < start_minutes:
+        raise ValueError(
+            f'Sweep ends at {end_minutes} minutes, '
+            f'before its start at {start_minutes}.'
+        )
+
+    minutes = np.arange(
+        start_minutes, end_minutes + step_minutes / 2, step_minutes
+    )
+    return calc_angle_sweep(
+        chart.julian_day_utc + minutes / MINUTES_PER_DAY,
+        chart.geo_latitude,
+        chart.geo_longitude,
+        bodies or list(chart.planets),
+        minutes,
+    )
+
+
+def calc_angle_sweep(
+    julian_days: np.ndarray,
+    geo_latitude: float,
+    geo_longitude: float,
+    bodies: list[str],
+    minutes: np.ndarray = None,
+) -> TimeSweep:
+    """Angles and house positions at one place at each of the dates,
+    which need not be evenly spaced. Planetary positions, RAMC,
+    obliquity and ayanamsa are taken from the ephemeris every
+    POSITION_SAMPLE_MINUTES across the dates and interpolated; the
+    angles and house positions are solved as arrays. minutes defaults
+    to the time from the first date."""
+    julian_days = np.asarray(julian_days, dtype=float)
+    if not julian_days.size:
+        raise ValueError('No dates to sweep.')
+    if minutes is None:
+        minutes = (julian_days - julian_days[0]) * MINUTES_PER_DAY
+
+    (first_day, last_day) = (julian_days.min(), julian_days.max())
+    sample_count = max(
+        2,
+        int(
+            np.ceil(
+                (last_day - first_day)
+                * MINUTES_PER_DAY
+                / POSITION_SAMPLE_MINUTES
+            )
+        )
+        + 1,
+    )
+    sample_days = np.linspace(first_day, last_day, sample_count)
+
+    sample_ramc = []
+    sample_ayanamsa = []
+    sample_obliquity = []
+    sample_positions = []
+    for julian_day in sample_days:
+        (_, angles) = swe.calc_cusps(julian_day, geo_latitude, geo_longitude)
+        sample_ramc.append(angles[0])
+        sample_ayanamsa.append(swe.calc_ayan(julian_day))
+        sample_obliquity.append(swe.calc_obliquity(julian_day))
+        sample_positions.append(
+            [
+                swe.calc_planet(julian_day, PLANETS[body]['number'])
+                for body in bodies
+            ]
+        )
+
+    def interpolate(samples, is_angle=False):
+        samples = np.asarray(samples, dtype=float)
+        if is_angle:
+            samples = unwrap_degrees(samples)
+        values = np.interp(julian_days, sample_days, samples)
+        return values % 360 if is_angle else values
+
+    ramc = interpolate(sample_ramc, is_angle=True)
+    ayanamsa = interpolate(sample_ayanamsa)
+    obliquity = interpolate(sample_obliquity)
+    # [sample, body, (longitude, latitude, speed, right ascension, ...)]
+    sample_positions = np.array(sample_positions)
+    longitude = np.array(
+        [
+            interpolate(sample_positions[:, body_index, 0], is_angle=True)
+            for body_index in range(len(bodies))
+        ]
+    )
+    latitude = np.array(
+        [
+            interpolate(sample_positions[:, body_index, 1])
+            for body_index in range(len(bodies))
+        ]
+    )
+    right_ascension = np.array(
+        [
+            interpolate(sample_positions[:, body_index, 3], is_angle=True)
+            for body_index in range(len(bodies))
+        ]
+    )
+
+    midheaven = (midheaven_longitude(ramc, obliquity) - ayanamsa) % 360
+    ascendant = (
+        ascendant_longitude(ramc, geo_latitude, obliquity) - ayanamsa
+    ) % 360
+    eastpoint = (ascendant_longitude(ramc, 0, obliquity) - ayanamsa) % 360
+
+    # The ascendant of the prime vertical; between the tropics it can
+    # come out as the antivertex, which Swiss Ephemeris turns around
+    vertex = (
+        ascendant_longitude(ramc + 180, 90 - geo_latitude, obliquity)
+        - ayanamsa
+    ) % 360
+    vertex = np.where(
+        (abs(geo_latitude) <= obliquity)
+        & (signed_degrees(vertex - midheaven) > 0),
+        (vertex + 180) % 360,
+        vertex,
+    )
+
+    house = campanus_house_position(
+        ramc[np.newaxis],
+        geo_latitude,
+        obliquity[np.newaxis],
+        longitude + ayanamsa[np.newaxis],
+        latitude,
+    )
+
+    return TimeSweep(
+        bodies=bodies,
+        minutes=minutes,
+        julian_days=julian_days,
+        ayanamsa=ayanamsa,
+        obliquity=obliquity,
+        ramc=ramc,
+        midheaven=midheaven,
+        ascendant=ascendant,
+        eastpoint=eastpoint,
+        vertex=vertex,
+        longitude=longitude,
+        right_ascension=right_ascension,
+        house=house,
+    )
@@ -0,0 +1,236 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from src.models.charts import ChartObject
+from src.models.options import AngularityModel, Options
+from src.utils.chart_utils import calc_class_3_orb
+from src.utils.coordinates import (
+    ascendant_longitude,
+    campanus_house_position,
+    midheaven_longitude,
+)
+
+# Same contacts as CoreChart.calc_angle_and_strength, in the order it
+# breaks ties between them
+RELATED_ANGLES = ['major', 'ZN', 'EW', 'RA']
+
+
+@dataclass
+class AngularityGrid:
+    """Angularity of each body of a chart relocated to every grid node.
+
+    The arrays are indexed [body, latitude, longitude]; related_angle
+    holds indices into RELATED_ANGLES."""
+
+    bodies: list[str]
+    latitudes: np.ndarray
+    longitudes: np.ndarray
+    house: np.ndarray
+    strength: np.ndarray
+    signed_orb: np.ndarray
+    related_angle: np.ndarray
+    is_foreground: np.ndarray
+
+    def save(self, path: str):
+        np.savez_compressed(
+            path,
+            bodies=np.array(self.bodies),
+            latitudes=self.latitudes,
+            longitudes=self.longitudes,
+            house=self.house,
+            strength=self.strength,
+            signed_orb=self.signed_orb,
+            related_angle=self.related_angle,
+            is_foreground=self.is_foreground,
+        )
+
+
+def _strength_percent(orb):
+    return (np.cos(np.radians(orb)) + 1) / 2 * 100
+
+
+def _major_angularity_curve(quadrant_position, model: AngularityModel):
+    # Array versions of the major angularity curves in chart_utils
+    if model == AngularityModel.MIDQUADRANT:
+        orb = np.where(
+            quadrant_position > 45, 90 - quadrant_position, quadrant_position
+        )
+        return _strength_percent(
+            np.select(
+                [orb <= 10, orb <= 35],
+                [orb * 6, 2.4 * orb + 36],
+                6 * orb - 90,
+            )
+        )
+
+    if model == AngularityModel.CLASSIC_CADENT:
+        orb = quadrant_position
+        return _strength_percent(
+            np.select(
+                [orb <= 10, orb <= 40, orb <= 60],
+                [orb * 6, 2 * orb + 40, orb * 3],
+                6 * orb - 180,
+            )
+        )
+
+    initial_angularity = np.cos(np.radians(quadrant_position * 4))
+    faded_angularity = initial_angularity * ((initial_angularity + 1) / 2)
+    cadency_strength = -1 * np.cos(np.radians(4 * (quadrant_position - 60)))
+    faded_cadency_strength = cadency_strength * (
+        1 - ((cadency_strength + 1) / 2)
+    )
+    penultimate_score = (faded_angularity + faded_cadency_strength) / 1.125
+    return (penultimate_score + 1) / 2 * 100
+
+
+def _square_contact(angle, point, options: Options):
+    """Returns (strength, signed orb, orb from the square) of a point
+    to an angle, as used for the Zenith/Nadir and Eastpoint contacts."""
+    aspect = np.abs(angle - point)
+    aspect = np.where(aspect > 180, 360 - aspect, aspect)
+    signed_orb = -1 * (((point - angle) % 360 % 180) - 90)
+    orb = np.abs(aspect - 90)
+
+    curve_multiplier = 360.0 / (
+        calc_class_3_orb(options.angularity.minor_angles) * 4
+    )
+    strength = np.where(
+        orb <= 3,
+        (np.cos(np.radians(orb * curve_multiplier)) + 1) * 25 + 50,
+        -200,
+    )
+    return (strength, signed_orb, orb)
+
+
+def calc_angularity(
+    house,
+    longitude,
+    right_ascension,
+    ramc,
+    ascendant,
+    midheaven,
+    options: Options,
+):
+    """Scores angularity the way CoreChart.calc_angle_and_strength does,
+    for arrays of house positions, longitudes and right ascensions
+    against arrays of angles that broadcast with them. Returns
+    (strength, signed orb, related angle, is foreground); related angle
+    holds indices into RELATED_ANGLES."""
+    quadrant_position = house % 90
+    mundane_signed_orb = np.where(
+        quadrant_position > 45, 90 - quadrant_position, -quadrant_position
+    )
+    mundane_orb = np.abs(mundane_signed_orb)
+    mundane_strength = _major_angularity_curve(
+        quadrant_position, options.angularity.model
+    )
+
+    (asc_strength, asc_signed_orb, asc_orb) = _square_contact(
+        ascendant, longitude, options
+    )
+    (mc_strength, mc_signed_orb, mc_orb) = _square_contact(
+        midheaven, longitude, options
+    )
+    (ramc_strength, ramc_signed_orb, ramc_orb) = _square_contact(
+        ramc, right_ascension, options
+    )
+
+    strengths = np.broadcast_arrays(
+        mundane_strength, asc_strength, mc_strength, ramc_strength
+    )
+    signed_orbs = np.broadcast_arrays(
+        mundane_signed_orb, asc_signed_orb, mc_signed_orb, ramc_signed_orb
+    )
+    # argmax keeps the first of equal strengths, as max() does
+    related_angle = np.argmax(np.stack(strengths), axis=0)
+    strength = np.take_along_axis(
+        np.stack(strengths), related_angle[np.newaxis], axis=0
+    )[0]
+    signed_orb = np.take_along_axis(
+        np.stack(signed_orbs), related_angle[np.newaxis], axis=0
+    )[0]
+
+    major_orb = max(
+        orb if orb != 0 else -3 for orb in options.angularity.major_angles
+    )
+    minor_orb = max(
+        orb if orb != 0 else -3 for orb in options.angularity.minor_angles
+    )
+    is_foreground = (
+        (mundane_orb <= major_orb)
+        | (asc_orb <= minor_orb)
+        | (mc_orb <= minor_orb)
+        | (ramc_orb <= minor_orb)
+    )
+
+    return (
+        strength,
+        signed_orb,
+        related_angle.astype(np.int8),
+        is_foreground,
+    )
+
+
+def calc_angularity_grid(
+    chart: ChartObject,
+    latitudes: np.ndarray,
+    longitudes: np.ndarray,
+    options: Options,
+) -> AngularityGrid:
+    """Relocates the chart's moment to every (latitude, longitude) node
+    and scores each body's angularity there the way the chart wheels do.
+    Planetary positions are taken from the chart as-is; only houses,
+    angles and RAMC vary across the grid."""
+    latitudes = np.asarray(latitudes, dtype=float)
+    longitudes = np.asarray(longitudes, dtype=float)
+
+    bodies = [name for name, _ in chart.iterate_points(options)]
+    planets = [chart.planets[name] for name in bodies]
+
+    # Broadcast to [body, latitude, longitude]
+    geo_latitude = latitudes[np.newaxis, :, np.newaxis]
+    # Greenwich sidereal time plus the local longitude
+    ramc = (chart.ramc - chart.geo_longitude + longitudes) % 360
+    ramc = ramc[np.newaxis, np.newaxis, :]
+    longitude = np.array([p.longitude for p in planets])[:, None, None]
+    latitude = np.array([p.latitude for p in planets])[:, None, None]
+    right_ascension = np.array([p.right_ascension for p in planets])[
+        :, None, None
+    ]
+
+    house = campanus_house_position(
+        ramc,
+        geo_latitude,
+        chart.obliquity,
+        longitude + chart.ayanamsa,
+        latitude,
+    )
+    ascendant = (
+        ascendant_longitude(ramc, geo_latitude, chart.obliquity)
+        - chart.ayanamsa
+    ) % 360
+    midheaven = (
+        midheaven_longitude(ramc, chart.obliquity) - chart.ayanamsa
+    ) % 360
+
+    (strength, signed_orb, related_angle, is_foreground) = calc_angularity(
+        house,
+        longitude,
+        right_ascension,
+        ramc,
+        ascendant,
+        midheaven,
+        options,
+    )
+
+    return AngularityGrid(
+        bodies=bodies,
+        latitudes=latitudes,
+        longitudes=longitudes,
+        house=house,
+        strength=strength,
+        signed_orb=signed_orb,
+        related_angle=related_angle,
+        is_foreground=is_foreground,
+    )
@@ -1,18 +1,53 @@
+import heapq
+import itertools
 import math
-from typing import Literal
+from typing import Iterator, Literal
 from src.models.charts import (
+    ANLUNAR_FAMILY,
+    KAR_FAMILY,
+    KLR_FAMILY,
+    LSR_FAMILY,
+    LUNAR_RETURN_FAMILY,
+    LUNISOLAR_FAMILY,
+    NLR_FAMILY,
+    NSR_FAMILY,
+    SOLAR_RETURN_FAMILY,
+    SOLAR_RETURNS,
+    SOLILUNAR_FAMILY,
     ChartObject,
     ChartType,
     ChartWheelRole,
 )
-from src.swe import calc_moon_crossing, calc_planet, calc_sun_crossing, revjul
-from src.utils.calculation_utils import get_signed_orb_to_reference
-from src.utils.format_utils import to360
+from src.swe import (
+    calc_elongation_crossing,
+    calc_moon_crossing,
+    calc_planet,
+    calc_sun_crossing,
+    julday,
+    revjul,
+)
+from src.utils.burst_manifest import BurstManifest
+from src.utils.ephemeris_segments import (
+    MOON,
+    SUN,
+    EphemerisSegment,
+    calc_ephemeris_segment,
+)
+from src.utils.fitted_ephemeris import fitted_longitudes
+from src.utils.format_utils import get_signed_orb_to_reference, to360
 from src.utils.transits.progressions import (
     ProgressionTypes,
+    calc_ssr_crossings,
     get_progressed_jd_utc,
+    ssr_crossings_hold,
 )
 
+# Fitted bisection steps stop once the bracket is this narrow, in days,
+# or the difference to the target is within the fits' error bounds plus
+# this slack, in degrees, of a point where the step could go either way
+MINIMUM_FITTED_BRACKET_DAYS = 1e-6
+FITTED_DECISION_SLACK = 1e-6
+
 
 def set_up_progressed_params(params: dict, date: float, chart_type: str):
     progressed_params = {**params}
@@ -30,6 +65,67 @@ def set_up_progressed_params(params: dict, date: float, chart_type: str):
     return params
 
 
+def narrow_progressed_aspect_bracket(
+    radix_jd: float,
+    low: float,
+    high: float,
+    body_number: int,
+    radix_sun_longitude: float,
+    target_signed_orb: float,
+) -> tuple[float, float]:
+    """Takes the first bisection steps of
+    find_julian_days_for_aspect_to_progressed_body on fitted longitudes,
+    without calling into the library for each date. A step is only taken
+    while the fitted difference to the target is further than the fits'
+    error from every value at which the step would turn the other way,
+    so each step goes where the library's longitudes would send it.
+    Returns the bracket the library would have reached."""
+    longitudes = fitted_longitudes(body_number)
+    crossings = None
+
+    while high - low >= MINIMUM_FITTED_BRACKET_DAYS:
+        transit_date = (low + high) / 2
+
+        if not ssr_crossings_hold(crossings, transit_date):
+            crossings = calc_ssr_crossings(radix_sun_longitude, transit_date)
+        progressed_date = get_progressed_jd_utc(
+            radix_jd,
+            transit_date,
+            radix_sun_longitude,
+            ProgressionTypes.Q2.value,
+            ssr_crossings=crossings,
+        )
+
+        (transit_longitude, transit_error) = longitudes.longitude(transit_date)
+        (progressed_longitude, progressed_error) = longitudes.longitude(
+            progressed_date
+        )
+
+        difference_to_target = (
+            target_signed_orb
+            + get_signed_orb_to_reference(
+                transit_longitude, progressed_longitude
+            )
+        ) % 360
+        margin = 2 * (transit_error + progressed_error) + FITTED_DECISION_SLACK
+        if (
+            min(
+                difference_to_target,
+                abs(difference_to_target - 180),
+                360 - difference_to_target,
+            )
+            <= margin
+        ):
+            break
+
+        if difference_to_target < 180:
+            high = transit_date
+        else:
+            low = transit_date
+
+    return (low, high)
+
+
 def find_julian_days_for_aspect_to_progressed_body(
     radix_jd: float,
     search_start_jd: float,
@@ -55,6 +151,15 @@ def find_julian_days_for_aspect_to_progressed_body(
     elif relationship == 'Q3':
         target_signed_orb = 90
 
+    (low, high) = narrow_progressed_aspect_bracket(
+        radix_jd,
+        low,
+        high,
+        body_number,
+        radix_sun_longitude,
+        target_signed_orb,
+    )
+
     while True:
         transit_date = (low + high) / 2
         derived_progressed_date = get_progressed_jd_utc(
@@ -103,7 +208,18 @@ def find_julian_days_for_aspect_to_progressed_body(
     return (derived_progressed_date, transit_date)
 
 
-def find_solunar_crossings_until_date(
+def solunar_target_offset(solunar_type: str) -> float:
+    solunar_name_normalized = solunar_type.lower()
+
+    if 'demi' in solunar_name_normalized:
+        return 180
+    elif 'quarti' in solunar_name_normalized:
+        return 90 if 'first' in solunar_name_normalized else -90
+
+    return 0
+
+
+def iter_solunar_crossings_until_date(
     base_start: float,
     continue_until_date: float,
     grace_period: float,
@@ -111,33 +227,10 @@ def find_solunar_crossings_until_date(
     target_longitude: float,
     cycle_length: int,
     solunar_type: str,
-) -> list[float]:
-
-    target = target_longitude
+) -> Iterator[float]:
+    target = (target_longitude + solunar_target_offset(solunar_type)) % 360
     start = base_start
 
-    solunar_name_normalized = solunar_type.lower()
-
-    dates = []
-
-    next_increment = cycle_length
-
-    grace_period_normalized = grace_period or 0
-
-    if 'demi' in solunar_name_normalized:
-        target = (target_longitude + 180) % 360
-        next_increment = math.ceil(cycle_length / 2)
-        grace_period_normalized /= 2
-
-    elif 'quarti' in solunar_name_normalized:
-        next_increment = math.ceil(cycle_length / 4)
-        grace_period_normalized /= 4
-
-        if 'first' in solunar_name_normalized:
-            target = (target_longitude + 90) % 360
-        else:
-            target = to360(target_longitude - 90)
-
     while start <= continue_until_date:
         if target_body == 'Sun':
             date = calc_sun_crossing(target, start)
@@ -148,14 +241,18 @@ def find_solunar_crossings_until_date(
             (date < continue_until_date)
             or (date - continue_until_date < grace_period)
         ):
-            dates.append(date)
+            yield date
+
+        # Search on from just past this crossing; stepping by the cycle
+        # length skips lunar returns, and by half of it finds demis twice
+        start = date + 1
 
-        start += next_increment
 
-    return dates
+def find_solunar_crossings_until_date(*args, **kwargs) -> list[float]:
+    return list(iter_solunar_crossings_until_date(*args, **kwargs))
 
 
-def find_novienic_crossings_until_date(
+def iter_novienic_crossings_until_date(
     base_start: float,
     continue_until_date: float,
     grace_period: float,
@@ -163,8 +260,7 @@ def find_novienic_crossings_until_date(
     target_longitude: float,
     cycle_length: int,
     solunar_type: str,
-) -> list[float]:
-
+) -> Iterator[float]:
     target = target_longitude
     start = base_start
 
@@ -172,7 +268,9 @@ def find_novienic_crossings_until_date(
         calc_sun_crossing if target_body == 'Sun' else calc_moon_crossing
     )
 
-    return_dates = []
+    # Crossings found in one cycle can land after those of the next,
+    # so hold them until no later cycle can find anything earlier
+    pending_dates = []
 
     definition_increment = 40
     normalized_grace_period = grace_period or 0
@@ -185,27 +283,31 @@ def find_novienic_crossings_until_date(
         normalized_grace_period /= 4
 
     while start <= continue_until_date:
-        dates_in_cycle = []
         current_increment = 0
 
         while current_increment < 360:
             date = crossing_func(to360(target + current_increment), start)
-            dates_in_cycle.append(date)
-
-            current_increment += definition_increment
-
-        for date in dates_in_cycle:
             if (date < continue_until_date) or (
                 date - continue_until_date < normalized_grace_period
             ):
-                return_dates.append(date)
+                heapq.heappush(pending_dates, date)
+
+            current_increment += definition_increment
 
         start += cycle_length
 
-    return sorted(return_dates)
+        while pending_dates and pending_dates[0] <= start:
+            yield heapq.heappop(pending_dates)
+
+    while pending_dates:
+        yield heapq.heappop(pending_dates)
+
 
+def find_novienic_crossings_until_date(*args, **kwargs) -> list[float]:
+    return list(iter_novienic_crossings_until_date(*args, **kwargs))
 
-def find_progressed_crossings_until_date(
+
+def iter_progressed_crossings_until_date(
     base_start: float,
     continue_until_date: float,
     grace_period: float,
@@ -214,13 +316,10 @@ def find_progressed_crossings_until_date(
     radix_sun_longitude: float,
     cycle_length: int,
     solunar_type: str,
-) -> list[float]:
-
+) -> Iterator[dict]:
     start = base_start
     next_increment = cycle_length
 
-    return_dates = []
-
     solunar_name_normalized = solunar_type.lower()
     relationship = 'full'
 
@@ -254,30 +353,30 @@ def find_progressed_crossings_until_date(
             if (transit_jd < continue_until_date) or (
                 transit_jd - continue_until_date <= (grace_period or 0)
             ):
-                return_dates.append(
-                    {
-                        'transit': transit_jd,
-                        'progressed': progressed_jd,
-                    }
-                )
+                yield {
+                    'transit': transit_jd,
+                    'progressed': progressed_jd,
+                }
 
         start += next_increment
 
-    return sorted(return_dates, key=lambda x: x['transit'])
 
+def find_progressed_crossings_until_date(*args, **kwargs) -> list[dict]:
+    return sorted(
+        iter_progressed_crossings_until_date(*args, **kwargs),
+        key=lambda x: x['transit'],
+    )
 
-def find_progressed_anlunar_crossings_until_date(
+
+def iter_progressed_anlunar_crossings_until_date(
     base_start: float,
     continue_until_date: float,
     grace_period: float,
     radix_sun_longitude: float,
     solunar_type: str,
-) -> list[dict]:
-
+) -> Iterator[dict]:
     start = base_start
 
-    return_dates = []
-
     relationship = 'full'
     next_increment = 28
 
@@ -313,21 +412,25 @@ def find_progressed_anlunar_crossings_until_date(
             if (transit_jd < continue_until_date) or (
                 transit_jd - continue_until_date <= (grace_period or 0)
             ):
-                return_dates.append(
-                    {
-                        'transit': transit_jd,
-                        'progressed': progressed_jd,
-                    }
-                )
+                yield {
+                    'transit': transit_jd,
+                    'progressed': progressed_jd,
+                }
 
         start += next_increment
 
-    return sorted(return_dates, key=lambda x: x['transit'])
 
+def find_progressed_anlunar_crossings_until_date(
+    *args, **kwargs
+) -> list[dict]:
+    return sorted(
+        iter_progressed_anlunar_crossings_until_date(*args, **kwargs),
+        key=lambda x: x['transit'],
+    )
 
-def append_applicable_returns(
-    returns: list,
-    return_args_list: list,
+
+def iter_applicable_returns(
+    returns: Iterator,
     args: tuple,
     burst: bool,
     active: bool,
@@ -339,6 +442,7 @@ def append_applicable_returns(
     if burst:
         filtered_returns = returns
     else:
+        returns = list(returns)
         if active:
             # From newest to oldest
             for return_date in reversed(returns):
@@ -362,7 +466,7 @@ def append_applicable_returns(
 
     for date in filtered_returns:
         if not isinstance(date, dict):
-            return_args_list.append(({**args[0]}, date, *args[2:]))
+            yield ({**args[0]}, date, *args[2:])
         else:
             transit_date = date.get('transit')
             progressed_date = date.get('progressed')
@@ -374,10 +478,535 @@ def append_applicable_returns(
                     args[2],
                 )
 
-                return_args_list.append(
-                    (
-                        progressed_params,
-                        transit_date,
-                        *args[2:],
+                yield (
+                    progressed_params,
+                    transit_date,
+                    *args[2:],
+                )
+
+
+def append_applicable_returns(
+    returns: list,
+    return_args_list: list,
+    args: tuple,
+    burst: bool,
+    active: bool,
+    base_start: float,
+):
+    return_args_list.extend(
+        iter_applicable_returns(returns, args, burst, active, base_start)
+    )
+
+
+def _iter_solar_years(
+    params: dict,
+    radix: ChartObject,
+    base_start: float,
+    continue_until_date: float,
+    solunar_type: str,
+    active: bool,
+) -> Iterator[tuple[ChartObject, float, float]]:
+    # Anlunar returns are measured from the SSR in effect, so the search is
+    # split into one window per solar year, each with its own SSR chart
+    sun_radix_longitude = radix.planets['Sun'].longitude
+    is_kinetic = solunar_type in KAR_FAMILY
+
+    last_ssr_date = calc_sun_crossing(
+        sun_radix_longitude, base_start - (366 if is_kinetic else 364)
+    )
+
+    starting_date = base_start - 29 if active else base_start
+
+    while True:
+        (year, month, day, time) = revjul(last_ssr_date, params['style'])
+
+        ssr_params = {**params}
+        ssr_params.update(
+            {
+                'name': radix.name + ' Solar Return',
+                'type': ChartType.SOLAR_RETURN.value,
+                'year': year,
+                'month': month,
+                'day': day,
+                'time': time,
+            }
+        )
+
+        ssr_chart = ChartObject(ssr_params)
+
+        next_ssr_date = calc_sun_crossing(
+            sun_radix_longitude, last_ssr_date + (363 if is_kinetic else 180)
+        )
+
+        yield (
+            ssr_chart,
+            starting_date,
+            min(continue_until_date, next_ssr_date),
+        )
+
+        if next_ssr_date > continue_until_date:
+            break
+
+        starting_date = next_ssr_date + 2
+        last_ssr_date = next_ssr_date
+
+
+def _iter_lunar_synodic_returns(
+    params: dict,
+    radix: ChartObject,
+    base_start: float,
+    continue_until_date: float,
+    solunar_type: str,
+    active: bool,
+) -> Iterator[float]:
+    natal_elongation = get_signed_orb_to_reference(
+        radix.planets['Moon'].longitude, radix.planets['Sun'].longitude
+    )
+
+    target_elongation = natal_elongation
+
+    if solunar_type == ChartType.DEMI_LUNAR_SYNODIC_RETURN.value:
+        target_elongation = natal_elongation + 180
+    elif solunar_type == ChartType.LAST_QUARTI_LUNAR_SYNODIC_RETURN.value:
+        target_elongation = natal_elongation - 90
+    elif solunar_type == ChartType.FIRST_QUARTI_LUNAR_SYNODIC_RETURN.value:
+        target_elongation = natal_elongation + 90
+
+    # Each search starts just past the previous return, so every return
+    # is found exactly once
+    date = calc_elongation_crossing(
+        target_elongation, base_start - 30 if active else base_start
+    )
+    if active:
+        # A synodic month is shorter than the 30 days searched back, so
+        # two returns can precede the chart; only the later is in effect
+        next_date = calc_elongation_crossing(target_elongation, date + 1)
+        if next_date < base_start:
+            date = next_date
+    while date < continue_until_date:
+        yield date
+        date = calc_elongation_crossing(target_elongation, date + 1)
+
+
+def iter_solunar_type_returns(
+    params: dict,
+    solunar_type: str,
+    burst_months: int = None,
+    active: bool = False,
+) -> Iterator[tuple[dict, float, str, str]]:
+    """Yields (chart params, julian day, solunar type, chart class) for each
+    return of one solunar type that the search parameters call for.
+    Burst searches yield in chronological order as the returns are found."""
+    radix = params['radix']
+
+    base_start = julday(
+        params['year'],
+        params['month'],
+        params['day'],
+        params['time'],
+        params['style'],
+    )
+
+    burst = burst_months is not None and burst_months > 0
+
+    continue_until_date = None
+
+    if burst_months:
+        continue_until_date = base_start + (30 * burst_months)
+
+    sun_radix_longitude = radix.planets['Sun'].longitude
+    moon_radix_longitude = radix.planets['Moon'].longitude
+
+    def applicable_returns(returns, chart_class, override_params=None):
+        return iter_applicable_returns(
+            returns=returns,
+            args=(
+                override_params or params,
+                None,
+                solunar_type,
+                chart_class,
+            ),
+            burst=burst,
+            active=active,
+            base_start=base_start,
+        )
+
+    if solunar_type in SOLAR_RETURNS:
+        cycle_length = 366
+
+        continue_until_date = continue_until_date or (
+            base_start if active else base_start + 365
+        )
+
+        # Traditional Solar Returns
+        if solunar_type in SOLAR_RETURN_FAMILY:
+            returns = iter_solunar_crossings_until_date(
+                base_start=base_start - 365 if active else base_start,
+                continue_until_date=continue_until_date,
+                target_body='Sun',
+                target_longitude=sun_radix_longitude,
+                cycle_length=cycle_length,
+                solunar_type=solunar_type,
+                grace_period=10,
+            )
+
+        elif solunar_type in NSR_FAMILY:
+            if solunar_type == ChartType.NOVIENIC_SOLAR_RETURN.value:
+                starting_date = base_start - 41 if active else base_start
+            else:
+                starting_date = base_start - 11 if active else base_start
+
+            returns = iter_novienic_crossings_until_date(
+                base_start=starting_date,
+                continue_until_date=continue_until_date,
+                target_body='Sun',
+                target_longitude=sun_radix_longitude,
+                cycle_length=cycle_length,
+                solunar_type=solunar_type,
+                grace_period=1,
+            )
+
+        elif solunar_type in SOLILUNAR_FAMILY:
+            returns = iter_solunar_crossings_until_date(
+                base_start=base_start - 365 if active else base_start,
+                continue_until_date=continue_until_date,
+                target_body='Sun',
+                target_longitude=moon_radix_longitude,
+                cycle_length=cycle_length,
+                solunar_type=solunar_type,
+                grace_period=10,
+            )
+
+        else:
+            returns = iter_progressed_crossings_until_date(
+                base_start=base_start - 365 if active else base_start,
+                radix_julian_day_utc=radix.julian_day_utc,
+                continue_until_date=continue_until_date,
+                target_body='Sun',
+                radix_sun_longitude=sun_radix_longitude,
+                cycle_length=cycle_length,
+                solunar_type=solunar_type,
+                grace_period=10,
+            )
+
+        yield from applicable_returns(returns, 'SR')
+        return
+
+    cycle_length = 29
+
+    continue_until_date = continue_until_date or (
+        base_start if active else base_start + 29
+    )
+
+    if solunar_type in LUNAR_RETURN_FAMILY:
+        returns = iter_solunar_crossings_until_date(
+            base_start=(base_start - 29) if active else base_start,
+            continue_until_date=continue_until_date,
+            target_body='Moon',
+            target_longitude=moon_radix_longitude,
+            cycle_length=cycle_length,
+            solunar_type=solunar_type,
+            grace_period=1,
+        )
+
+    elif solunar_type in NLR_FAMILY:
+        returns = iter_novienic_crossings_until_date(
+            base_start=base_start - 3.5 if active else base_start,
+            continue_until_date=continue_until_date,
+            target_body='Moon',
+            target_longitude=moon_radix_longitude,
+            cycle_length=3.5,
+            solunar_type=solunar_type,
+            grace_period=0.5,
+        )
+
+    elif solunar_type in LUNISOLAR_FAMILY:
+        returns = iter_solunar_crossings_until_date(
+            base_start=base_start - 29 if active else base_start,
+            continue_until_date=continue_until_date,
+            target_body='Moon',
+            target_longitude=sun_radix_longitude,
+            cycle_length=cycle_length,
+            solunar_type=solunar_type,
+            grace_period=1,
+        )
+
+    elif solunar_type in ANLUNAR_FAMILY + KAR_FAMILY:
+        for ssr_chart, starting_date, sar_continue_date in _iter_solar_years(
+            params,
+            radix,
+            base_start,
+            continue_until_date,
+            solunar_type,
+            active,
+        ):
+            if solunar_type in ANLUNAR_FAMILY:
+                returns = iter_solunar_crossings_until_date(
+                    base_start=starting_date,
+                    continue_until_date=sar_continue_date,
+                    target_body='Moon',
+                    target_longitude=ssr_chart.planets['Moon'].longitude,
+                    cycle_length=cycle_length,
+                    solunar_type=solunar_type,
+                    grace_period=1,
+                )
+            else:
+                returns = iter_progressed_anlunar_crossings_until_date(
+                    base_start=starting_date,
+                    continue_until_date=sar_continue_date,
+                    radix_sun_longitude=sun_radix_longitude,
+                    solunar_type=solunar_type,
+                    grace_period=1,
+                )
+
+            yield from applicable_returns(
+                returns,
+                'LR',
+                override_params={**params, 'ssr_chart': ssr_chart},
+            )
+        return
+
+    elif solunar_type in LSR_FAMILY:
+        for date in _iter_lunar_synodic_returns(
+            params,
+            radix,
+            base_start,
+            continue_until_date,
+            solunar_type,
+            active,
+        ):
+            yield (params, date, solunar_type, 'LR')
+        return
+
+    elif solunar_type in KLR_FAMILY:
+        returns = iter_progressed_crossings_until_date(
+            base_start=base_start - 29 if active else base_start,
+            radix_julian_day_utc=radix.julian_day_utc,
+            continue_until_date=continue_until_date,
+            target_body='Moon',
+            radix_sun_longitude=sun_radix_longitude,
+            cycle_length=cycle_length,
+            solunar_type=solunar_type,
+            grace_period=1,
+        )
+
+    else:
+        return
+
+    yield from applicable_returns(returns, 'LR')
+
+
+def search_solunars(
+    params: dict,
+    solars: list[str],
+    lunars: list[str],
+    burst_months: int = None,
+    active: bool = False,
+) -> list[tuple[dict, float, str, str]]:
+    """All returns of the selected types, grouped by type in the order
+    given, as (chart params, julian day, solunar type, chart class)."""
+    return list(
+        itertools.chain.from_iterable(
+            iter_solunar_type_returns(
+                params, solunar_type, burst_months, active
+            )
+            for solunar_type in solars + lunars
+        )
+    )
+
+
+def iter_solunar_returns(
+    params: dict,
+    solars: list[str],
+    lunars: list[str],
+    burst_months: int = None,
+) -> Iterator[tuple[dict, float, str, str]]:
+    """Yields every return of the selected types from the chart date
+    onward, in chronological order, as each is found. Without a burst
+    duration, only the next return of each type is yielded."""
+    return heapq.merge(
+        *[
+            iter_solunar_type_returns(params, solunar_type, burst_months)
+            for solunar_type in solars + lunars
+        ],
+        key=lambda found: found[1],
+    )
+
+
+# Return families that are a plain crossing of a radix longitude, as
+# (family, transiting body, radix body)
+ROSTER_CROSSINGS = [
+    (SOLAR_RETURN_FAMILY, SUN, 'Sun'),
+    (SOLILUNAR_FAMILY, SUN, 'Moon'),
+    (LUNAR_RETURN_FAMILY, MOON, 'Moon'),
+    (LUNISOLAR_FAMILY, MOON, 'Sun'),
+]
+
+
+def _iter_window_returns(
+    params: dict, solunar_type: str, start_jd: float, end_jd: float
+) -> Iterator[tuple[dict, float, str, str]]:
+    (year, month, day, time) = revjul(start_jd, params['style'])
+    window_params = {
+        **params,
+        'year': year,
+        'month': month,
+        'day': day,
+        'time': time,
+    }
+
+    for found in iter_solunar_type_returns(
+        window_params,
+        solunar_type,
+        burst_months=math.ceil((end_jd - start_jd) / 30) + 1,
+    ):
+        if found[1] >= end_jd:
+            break
+        if found[1] >= start_jd:
+            yield found
+
+
+def iter_burst_returns(
+    params: dict,
+    solunar_type: str,
+    start_jd: float,
+    end_jd: float,
+    manifest: BurstManifest,
+) -> Iterator[tuple[dict, float, str, str]]:
+    """Yields the returns of one type in [start_jd, end_jd) in
+    chronological order. Those the manifest already holds are read from
+    it and only the rest of the window is searched; each return found is
+    saved to the manifest before it is yielded."""
+    chart_class = 'SR' if solunar_type in SOLAR_RETURNS else 'LR'
+
+    for burst_return in manifest.returns_between(start_jd, end_jd):
+        if burst_return.progressed_date is None:
+            yield ({**params}, burst_return.date, solunar_type, chart_class)
+        else:
+            yield (
+                set_up_progressed_params(
+                    {**params}, burst_return.progressed_date, solunar_type
+                ),
+                burst_return.date,
+                solunar_type,
+                chart_class,
+            )
+
+    if manifest.searched_until >= end_jd:
+        return
+
+    for found in _iter_window_returns(
+        params, solunar_type, max(start_jd, manifest.searched_until), end_jd
+    ):
+        progressed_date = None
+        progressed_chart = found[0].get('progressed_chart')
+        if progressed_chart:
+            # The date set_up_progressed_params was given, which the
+            # progressed chart reads in the chart's zone
+            progressed_date = julday(
+                progressed_chart.year,
+                progressed_chart.month,
+                progressed_chart.day,
+                progressed_chart.time,
+                params['style'],
+            )
+        manifest.add_return(found[1], progressed_date)
+        yield found
+
+    manifest.finish_search(end_jd)
+
+
+def iter_burst_solunar_returns(
+    params: dict,
+    solars: list[str],
+    lunars: list[str],
+    burst_months: int,
+    manifests: dict[str, BurstManifest],
+) -> Iterator[tuple[dict, float, str, str]]:
+    """The returns of a burst from the chart date, in chronological
+    order, kept in a manifest for each type."""
+    start_jd = julday(
+        params['year'],
+        params['month'],
+        params['day'],
+        params['time'],
+        params['style'],
+    )
+    end_jd = start_jd + 30 * burst_months
+
+    return heapq.merge(
+        *[
+            iter_burst_returns(
+                params, solunar_type, start_jd, end_jd, manifests[solunar_type]
+            )
+            for solunar_type in solars + lunars
+        ],
+        key=lambda found: found[1],
+    )
+
+
+def search_roster_solunars(
+    roster: list[dict],
+    solars: list[str],
+    lunars: list[str],
+    start_jd: float,
+    end_jd: float,
+    segments: dict[int, EphemerisSegment] = None,
+) -> list[list[tuple[dict, float, str, str]]]:
+    """Every return of the selected types in [start_jd, end_jd) for each
+    chart params dict in the roster, grouped by roster entry and sorted
+    by date. Plain solar, lunar, solilunar and lunisolar returns of all
+    entries are found together from shared Sun and Moon segments; other
+    types are searched entry by entry."""
+    segments = segments if segments is not None else {}
+    found_by_entry = [[] for _ in roster]
+
+    for solunar_type in solars + lunars:
+        chart_class = 'SR' if solunar_type in SOLAR_RETURNS else 'LR'
+        crossing = next(
+            (
+                (body, radix_body)
+                for family, body, radix_body in ROSTER_CROSSINGS
+                if solunar_type in family
+            ),
+            None,
+        )
+
+        if crossing is None:
+            for entry, params in enumerate(roster):
+                found_by_entry[entry].extend(
+                    _iter_window_returns(
+                        params, solunar_type, start_jd, end_jd
                     )
                 )
+            continue
+
+        (body, radix_body) = crossing
+
+        segment = segments.get(body)
+        if (
+            segment is None
+            or segment.start_jd > start_jd
+            or segment.end_jd < end_jd
+        ):
+            segment = calc_ephemeris_segment(body, start_jd, end_jd)
+            segments[body] = segment
+
+        offset = solunar_target_offset(solunar_type)
+        targets = [
+            params['radix'].planets[radix_body].longitude + offset
+            for params in roster
+        ]
+
+        for entry, dates in enumerate(
+            segment.crossings(targets, start_jd, end_jd)
+        ):
+            found_by_entry[entry].extend(
+                ({**roster[entry]}, float(date), solunar_type, chart_class)
+                for date in dates
+            )
+
+    for found in found_by_entry:
+        found.sort(key=lambda found_return: found_return[1])
+
+    return found_by_entry
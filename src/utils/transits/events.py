@@ -0,0 +1,207 @@
+from dataclasses import dataclass
+from enum import Enum
+
+import numpy as np
+
+from src.constants import PLANETS
+from src.models.charts import AspectType, ChartObject
+from src.models.options import Options
+from src.swe import calc_planet_longitude
+from src.utils.calculation_utils import ASPECT_DEFINITIONS
+
+# Sampling interval for bracketing; a body cannot cross an orb boundary
+# and come back between samples except right at a station.
+DEFAULT_SAMPLE_DAYS = 1.0
+SAMPLE_DAYS = {'Moon': 0.25}
+
+PRECISION_DEGREES = 1e-7
+MAX_ITERATIONS = 50
+
+
+class TransitEventType(Enum):
+    ENTER = 'enter'
+    EXACT = 'exact'
+    LEAVE = 'leave'
+
+
+@dataclass
+class TransitEvent:
+    julian_day_utc: float
+    event_type: TransitEventType
+    transiting_planet: str
+    radix_point: str
+    aspect_type: AspectType
+    aspect_angle: float
+    orb: float
+
+
+def calc_transit_aspect_angles(
+    options: Options,
+) -> list[tuple[float, AspectType, float]]:
+    """Exact separations that parse_aspect recognizes with the given
+    ecliptic orbs, as (separation, aspect type, widest orb). Where two
+    harmonics share a separation, the one parse_aspect tries first wins."""
+    angles = {}
+    for dictionary_key_degrees, aspect_type, harmonic in ASPECT_DEFINITIONS:
+        orbs = options.ecliptic_aspects.get(
+            str(dictionary_key_degrees), [0, 0, 0]
+        )
+        if not len(orbs) or not orbs[0]:
+            continue
+
+        widest_orb = max(orb for orb in orbs if orb)
+        harmonic_degree_width = 360 / harmonic
+        multiple = 0
+        while multiple * harmonic_degree_width < 360:
+            angle = round(multiple * harmonic_degree_width, 9)
+            if angle not in angles:
+                angles[angle] = (aspect_type, widest_orb)
+            multiple += 1
+
+    return [
+        (angle, aspect_type, widest_orb)
+        for angle, (aspect_type, widest_orb) in sorted(angles.items())
+    ]
+
+
+def _signed_distance(longitude, target):
+    return (longitude - target + 180) % 360 - 180
+
+
+def _refine_crossing(
+    planet_number: int,
+    target: float,
+    boundary: float,
+    low: float,
+    high: float,
+    low_value: float,
+    high_value: float,
+) -> float:
+    # Newton steps from the planet's own speed, falling back to bisection
+    # whenever a step would leave the bracket
+    julian_day = low + (high - low) * low_value / (low_value - high_value)
+    for _ in range(MAX_ITERATIONS):
+        (longitude, speed) = calc_planet_longitude(julian_day, planet_number)
+        value = _signed_distance(longitude, target) - boundary
+        if abs(value) < PRECISION_DEGREES:
+            break
+
+        if (value > 0) == (low_value > 0):
+            (low, low_value) = (julian_day, value)
+        else:
+            high = julian_day
+
+        next_julian_day = julian_day - value / speed if speed else low
+        if not low < next_julian_day < high:
+            next_julian_day = (low + high) / 2
+        julian_day = next_julian_day
+
+    return julian_day
+
+
+def find_transit_events(
+    radix: ChartObject,
+    start_jd: float,
+    end_jd: float,
+    options: Options,
+    include_angles: bool = True,
+) -> list[TransitEvent]:
+    """Every time a transiting body enters, perfects or leaves an ecliptic
+    aspect to a radix point between the two julian days, sorted by time.
+    Orbs are the widest class orb of each aspect in the options."""
+    aspect_angles = calc_transit_aspect_angles(options)
+    if not aspect_angles:
+        return []
+
+    radix_points = [
+        (name, data.longitude if hasattr(data, 'longitude') else data)
+        for name, data in radix.iterate_points(
+            options, include_angles=include_angles
+        )
+    ]
+    radix_names = [
+        radix.planets[name].short_name if name in radix.planets else name
+        for name, _ in radix_points
+    ]
+    radix_longitudes = np.array([longitude for _, longitude in radix_points])
+
+    angles = np.array([angle for angle, _, _ in aspect_angles])
+    orbs = np.array([orb for _, _, orb in aspect_angles])
+
+    # [radix point, aspect, sample]
+    targets = (radix_longitudes[:, None] + angles[None, :])[:, :, None]
+    boundaries = [
+        (0, TransitEventType.EXACT),
+        (orbs[None, :, None], None),
+        (-orbs[None, :, None], None),
+    ]
+
+    events = []
+    for name, _ in radix.iterate_points(options):
+        planet_number = PLANETS[name]['number']
+        step = SAMPLE_DAYS.get(name, DEFAULT_SAMPLE_DAYS)
+        julian_days = np.append(np.arange(start_jd, end_jd, step), end_jd)
+        longitudes = np.array(
+            [
+                calc_planet_longitude(julian_day, planet_number)[0]
+                for julian_day in julian_days
+            ]
+        )
+
+        distances = _signed_distance(longitudes[None, None, :], targets)
+        continuous = np.abs(np.diff(distances, axis=2)) < 90
+
+        for boundary, event_type in boundaries:
+            values = distances - boundary
+            positive = values > 0
+            crossed = (positive[:, :, :-1] != positive[:, :, 1:]) & continuous
+
+            for point_index, angle_index, sample_index in zip(
+                *np.nonzero(crossed)
+            ):
+                boundary_value = (
+                    boundary
+                    if np.isscalar(boundary)
+                    else boundary[0, angle_index, 0]
+                )
+                low_value = values[point_index, angle_index, sample_index]
+                high_value = values[point_index, angle_index, sample_index + 1]
+
+                if event_type is None:
+                    # Moving toward exact while crossing the orb boundary
+                    moving_inward = (high_value < low_value) == (
+                        boundary_value > 0
+                    )
+                    this_event_type = (
+                        TransitEventType.ENTER
+                        if moving_inward
+                        else TransitEventType.LEAVE
+                    )
+                else:
+                    this_event_type = event_type
+
+                julian_day = _refine_crossing(
+                    planet_number,
+                    targets[point_index, angle_index, 0],
+                    boundary_value,
+                    julian_days[sample_index],
+                    julian_days[sample_index + 1],
+                    low_value,
+                    high_value,
+                )
+
+                (angle, aspect_type, orb) = aspect_angles[angle_index]
+                events.append(
+                    TransitEvent(
+                        julian_day_utc=float(julian_day),
+                        event_type=this_event_type,
+                        transiting_planet=PLANETS[name]['short_name'],
+                        radix_point=radix_names[point_index],
+                        aspect_type=aspect_type,
+                        aspect_angle=angle,
+                        orb=orb,
+                    )
+                )
+
+    events.sort(key=lambda event: event.julian_day_utc)
+    return events
@@ -16,6 +16,32 @@ SIDEREAL_YEAR_LENGTH = 365.256363004
 SOLAR_RA_PER_YEAR_PLUS_PRECESSION = 360.0139583333
 
 
+def calc_ssr_crossings(
+    radix_sun_longitude: float, target_jd: float
+) -> tuple[float, float]:
+    """The solar returns get_progressed_jd_utc progresses between.
+    They stay the same for every target date after the first return
+    and before the second, so repeated calls can pass them back in."""
+    return (
+        calc_sun_crossing(radix_sun_longitude, target_jd - 366),
+        calc_sun_crossing(radix_sun_longitude, target_jd),
+    )
+
+
+def ssr_crossings_hold(
+    ssr_crossings: tuple[float, float], target_jd: float
+) -> bool:
+    """Whether crossings calc_ssr_crossings found for an earlier date
+    still bracket target_jd."""
+    if not ssr_crossings:
+        return False
+    (previous_ssr_jd, next_ssr_jd) = ssr_crossings
+    return (
+        previous_ssr_jd + 1 < target_jd < previous_ssr_jd + 366
+        and next_ssr_jd - 365 < target_jd < next_ssr_jd
+    )
+
+
 def get_progressed_jd_utc(
     base_jd: float,
     target_jd: float,
@@ -23,6 +49,7 @@ def get_progressed_jd_utc(
     progression_type: ProgressionTypes,
     base_is_ssr: bool = False,
     use_apparent_rate: bool = False,
+    ssr_crossings: tuple[float, float] = None,
 ) -> float:
 
     # This is the simplified way to do it
@@ -38,12 +65,15 @@ def get_progressed_jd_utc(
 
         years_old = int(age / SIDEREAL_YEAR_LENGTH)
 
-        previous_ssr_jd = (
-            calc_sun_crossing(radix_sun_longitude, target_jd - 366)
-            if not base_is_ssr
-            else base_jd
-        )
-        next_ssr_jd = calc_sun_crossing(radix_sun_longitude, target_jd)
+        if ssr_crossings:
+            (previous_ssr_jd, next_ssr_jd) = ssr_crossings
+        else:
+            previous_ssr_jd = (
+                calc_sun_crossing(radix_sun_longitude, target_jd - 366)
+                if not base_is_ssr
+                else base_jd
+            )
+            next_ssr_jd = calc_sun_crossing(radix_sun_longitude, target_jd)
 
         time_increment = None
         if use_apparent_rate:
@@ -0,0 +1,59 @@
+from test.fixtures.tk_fixtures import mock_tk_main
+
+
+class TestAspectIndex:
+    def test_matches_scanning_every_class(self, mock_tk_main):
+        from src.models.charts import Aspect, AspectType, ChartWheelRole
+        from src.utils.aspect_index import AspectIndex
+
+        transit = ChartWheelRole.TRANSIT
+        radix = ChartWheelRole.RADIX
+        pairs = [
+            [('Su', transit, 'Mo', radix), ('Su', radix, 'Su', transit)],
+            [('Mo', radix, 'Ma', radix), ('Su', transit, 'Ma', radix)],
+            [('Ve', transit, 'Mo', transit)],
+            [('Mo', radix, 'Su', transit)],
+        ]
+        aspects_by_class = [
+            [
+                Aspect(
+                    type=AspectType.SQUARE,
+                    aspect_class=class_index + 1,
+                    from_planet_short_name=from_name,
+                    from_planet_role=from_role,
+                    to_planet_short_name=to_name,
+                    to_planet_role=to_role,
+                )
+                for (from_name, from_role, to_name, to_role) in aspects
+            ]
+            for (class_index, aspects) in enumerate(pairs)
+        ]
+
+        index = AspectIndex(aspects_by_class)
+
+        for name in ['Su', 'Mo', 'Ma', 'Ve', 'Ju']:
+            assert index.aspects_of(name) == [
+                (class_index, aspect)
+                for (class_index, aspects) in enumerate(aspects_by_class)
+                for aspect in aspects
+                if aspect.includes_planet(name)
+            ]
+
+            for role in [transit, radix]:
+                assert index.aspects_of(name, role, class_count=3) == [
+                    (class_index, aspect)
+                    for (class_index, aspects) in enumerate(
+                        aspects_by_class[:3]
+                    )
+                    for aspect in aspects
+                    if (
+                        aspect.from_planet_short_name == name
+                        and aspect.from_planet_role == role
+                    )
+                    or (
+                        aspect.to_planet_short_name == name
+                        and aspect.to_planet_role == role
+                    )
+                ]
+
+        assert len(index.aspects_of('Su', transit)) == 4
@@ -0,0 +1,376 @@
+import csv
+import json
+
+import pytest
+
+from test.fixtures.natal_options import natal_options
+from test.fixtures.tk_fixtures import mock_tk_main
+
+HEADER = [
+    'First Name',
+    'Last Name',
+    'Date',
+    'Time',
+    'AM/PM',
+    'Location',
+    'Latitude',
+    'Longitude',
+    'Zone',
+    'UTC Offset',
+]
+KEYS = [
+    'first_name',
+    'last_name',
+    'date',
+    'time',
+    'am_pm',
+    'location',
+    'latitude',
+    'longitude',
+    'zone',
+    'utc_offset',
+]
+
+ROWS = [
+    ['Grace', 'Hopper', '1906-12-09', '2:30', 'PM', 'New York']
+    + ['40.7', '-74.0', 'EST', '-5'],
+    ['Sam', 'Roe', '1985-07-04', '12:00', '', 'Boston']
+    + ['42.36', '-71.06', '', ''],
+    ['Pat', 'Doe', '1990-02-30', '10:00', '', 'Nowhere', '10', '10', '', ''],
+    ['Sam', 'Roe', '1985-07-04', '12:00', 'PM', 'Boston']
+    + ['42.36', '-71.06', 'America/New_York', ''],
+    ['Sam', 'Roe', '1985-07-04', '13:00', '', 'Boston']
+    + ['42.36', '-71.06', 'America/New_York', ''],
+]
+
+
+class TestNormalizeImportRecord:
+    @pytest.fixture
+    def record(self):
+        return {
+            'first_name': 'ada',
+            'last_name': 'lovelace',
+            'year': '1815',
+            'month': '12',
+            'day': '10',
+            'time': '1:00 PM',
+            'location': 'london',
+            'latitude': '51.5',
+            'longitude': '-0.1333',
+        }
+
+    def test_follows_new_chart_rules(self, record, mock_tk_main):
+        from src.utils.bulk_import import normalize_import_record
+
+        chart = normalize_import_record(record)
+
+        assert chart['name'] == 'Lovelace, Ada'
+        assert chart['type'] == 'Natal'
+        assert (chart['year'], chart['month'], chart['day']) == (1815, 12, 10)
+        assert chart['style'] == 1
+        assert chart['time'] == 13
+        assert chart['zone'] == 'LMT'
+        assert chart['correction'] == pytest.approx(0.1333 / 15, abs=1e-3)
+        assert chart['options'] == 'Natal Default'
+
+        chart = normalize_import_record(
+            {**record, 'year': '44', 'bce': 'yes', 'time': '12:00 AM'}
+        )
+        assert (chart['year'], chart['style'], chart['time']) == (-43, 0, 0)
+
+        chart = normalize_import_record(
+            {
+                **record,
+                'year': '2024',
+                'month': '7',
+                'day': '4',
+                'latitude': '40.7',
+                'longitude': '-74.0',
+            }
+        )
+        assert (chart['zone'], chart['correction']) == ('EDT', 4)
+
+    @pytest.mark.parametrize(
+        'changes, message',
+        [
+            ({'first_name': '', 'last_name': ''}, 'Name must be specified.'),
+            ({'type': 'Birthday'}, "Unknown chart type 'Birthday'."),
+            ({'month': '13'}, 'Month must be between 1 and 12.'),
+            ({'month': '2', 'day': '30'}, 'is not a date in the calendar.'),
+            ({'time': '13:00 PM'}, 'Time must be between 0:0:0 and 12:59:59'),
+            ({'time': '10'}, 'Time must be given as H:M or H:M:S.'),
+            ({'location': ''}, 'Location must be specified.'),
+            ({'latitude': '90'}, 'Latitude must be between'),
+            ({'year': '1930'}, 'Must enter timezone information manually.'),
+            ({'zone': 'EST'}, "Time zone 'EST' needs a UTC offset."),
+            ({'zone': 'EST', 'utc_offset': '25'}, 'UTC offset must be'),
+        ],
+    )
+    def test_rejects(self, record, mock_tk_main, changes, message):
+        from src.utils.bulk_import import (
+            BulkImportError,
+            normalize_import_record,
+        )
+
+        with pytest.raises(BulkImportError) as error:
+            normalize_import_record({**record, **changes})
+        assert message in str(error.value)
+
+
+class TestImportCharts:
+    def test_imports_across_a_pool(self, mock_tk_main, monkeypatch, tmp_path):
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        import src
+        from src.constants import VERSION
+        from src.core import initialize_worker
+        from src.models.charts import ChartObject
+        from src.utils.bulk_import import (
+            ImportStatus,
+            import_charts,
+            normalize_import_record,
+            write_import_report,
+        )
+        from src.utils.format_utils import version_str_to_tuple
+
+        monkeypatch.setattr(src, 'CHART_PATH', str(tmp_path / 'charts'))
+        client_file = tmp_path / 'clients.csv'
+        with open(client_file, 'w', newline='') as datafile:
+            writer = csv.writer(datafile)
+            writer.writerow(HEADER)
+            writer.writerows(ROWS)
+            writer.writerow([''] * len(HEADER))
+
+        with ProcessPoolExecutor(
+            max_workers=2,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=initialize_worker,
+        ) as executor:
+            results = import_charts(str(client_file), executor=executor)
+
+        assert [(result.line, result.status) for result in results] == [
+            (2, ImportStatus.IMPORTED),
+            (3, ImportStatus.IMPORTED),
+            (4, ImportStatus.REJECTED),
+            (5, ImportStatus.DUPLICATE),
+            (6, ImportStatus.REJECTED),
+        ]
+        assert results[3].message == 'Same chart as line 3.'
+        assert results[0].chart['time'] == 14.5
+
+        for result in results[:2]:
+            with open(result.chart_file) as datafile:
+                saved = json.load(datafile)
+            params = normalize_import_record(
+                dict(zip(KEYS, ROWS[result.line - 2]))
+            )
+            assert saved == {
+                **ChartObject(params).to_dict(),
+                'version': list(version_str_to_tuple(VERSION)),
+            }
+
+        again = import_charts(str(client_file))
+        assert [result.status for result in again] == [
+            ImportStatus.DUPLICATE,
+            ImportStatus.DUPLICATE,
+            ImportStatus.REJECTED,
+            ImportStatus.DUPLICATE,
+            ImportStatus.REJECTED,
+        ]
+        assert again[4].message.startswith('A different chart')
+
+        report = tmp_path / 'report.csv'
+        write_import_report(again, str(report))
+        with open(report, encoding='utf-8-sig') as datafile:
+            rows = list(csv.reader(datafile))
+        assert rows[0] == ['Line', 'Name', 'Status', 'Message']
+        assert [row[0] for row in rows[1:]] == ['2', '3', '4', '5', '6']
+
+    def test_writes_reports_across_a_pool(
+        self, natal_options, mock_tk_main, monkeypatch, tmp_path
+    ):
+        import multiprocessing
+        import os
+        from concurrent.futures import ProcessPoolExecutor
+
+        import src
+        from src.core import initialize_chart_worker
+        from src.utils.bulk_import import ImportStatus, import_charts
+
+        option_path = tmp_path / 'options'
+        option_path.mkdir()
+        (option_path / 'Natal_Default.opt').write_text(
+            json.dumps(natal_options)
+        )
+        monkeypatch.setattr(src, 'CHART_PATH', str(tmp_path / 'charts'))
+        monkeypatch.setattr(src, 'OPTION_PATH', str(option_path))
+        client_file = tmp_path / 'clients.csv'
+        with open(client_file, 'w', newline='') as datafile:
+            writer = csv.writer(datafile)
+            writer.writerow(HEADER)
+            writer.writerows(ROWS)
+
+        with ProcessPoolExecutor(
+            max_workers=2,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=initialize_chart_worker,
+            initargs=(src.CHART_PATH, src.TEMP_CHARTS, src.OPTION_PATH),
+        ) as executor:
+            results = import_charts(
+                str(client_file), write_reports=True, executor=executor
+            )
+
+        imported = [
+            result
+            for result in results
+            if result.status == ImportStatus.IMPORTED
+        ]
+        assert len(imported) == 2
+        for result in imported:
+            assert result.message == ''
+            with open(
+                result.chart_file[0:-3] + 'txt', encoding='utf-8-sig'
+            ) as report:
+                assert 'Created by Time Matters' in report.read()
+            # Nothing but the chart and its report
+            assert sorted(
+                os.listdir(os.path.dirname(result.chart_file))
+            ) == sorted(
+                os.path.basename(result.chart_file[0:-3] + extension)
+                for extension in ['dat', 'txt']
+            )
+
+    def test_imports_across_a_pool_started_by_a_script(self, tmp_path):
+        import os
+        import subprocess
+        import sys
+
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        client_file = tmp_path / 'clients.csv'
+        with open(client_file, 'w', newline='') as datafile:
+            writer = csv.writer(datafile)
+            writer.writerow(HEADER)
+            writer.writerows(ROWS)
+        # The pool's processes run the script again as they start
+        script = tmp_path / 'import_clients.py'
+        script.write_text(
+            'import multiprocessing\n'
+            'import sys\n'
+            'from src.utils import bulk_import\n'
+            'if __name__ == "__main__":\n'
+            '    multiprocessing.freeze_support()\n'
+            '    bulk_import.POOL_THRESHOLD = 1\n'
+            '    results = bulk_import.import_charts(sys.argv[1], workers=2)\n'
+            '    print(" ".join(result.status.value for result in results))\n'
+        )
+
+        result = subprocess.run(
+            [sys.executable, str(script), str(client_file)],
+            capture_output=True,
+            text=True,
+            cwd=root,
+            env={**os.environ, 'HOME': str(tmp_path), 'PYTHONPATH': root},
+            timeout=300,
+            check=True,
+        )
+
+        assert result.stdout.split() == [
+            'Imported',
+            'Imported',
+            'Rejected',
+            'Duplicate',
+            'Rejected',
+        ]
+
+    def test_pool_processes_do_not_start_the_app(
+        self, mock_tk_main, monkeypatch
+    ):
+        import runpy
+        from unittest.mock import MagicMock
+
+        from src.user_interfaces import widgets
+
+        monkeypatch.setattr(widgets, 'main', MagicMock())
+
+        # How a spawned pool process runs the module that was launched
+        runpy.run_module('src.tmsa', run_name='__mp_main__')
+
+        widgets.main.mainloop.assert_not_called()
+
+    def test_reads_jsonl(self, mock_tk_main, monkeypatch, tmp_path):
+        import src
+        from src.utils.bulk_import import ImportStatus, import_charts
+
+        monkeypatch.setattr(src, 'CHART_PATH', str(tmp_path / 'charts'))
+        client_file = tmp_path / 'clients.jsonl'
+        client_file.write_text(
+            json.dumps(
+                {
+                    'Name': 'Event One',
+                    'Type': 'Event',
+                    'Year': 2024,
+                    'Month': 3,
+                    'Day': 5,
+                    'Time': '12:00',
+                    'Location': 'Greenwich',
+                    'Latitude': 51.48,
+                    'Longitude': 0,
+                    'Zone': 'UT',
+                }
+            )
+            + '\n\n[1, 2]\n'
+        )
+
+        results = import_charts(str(client_file))
+
+        assert [(result.line, result.status) for result in results] == [
+            (1, ImportStatus.IMPORTED),
+            (3, ImportStatus.REJECTED),
+        ]
+        assert results[0].chart['type'] == 'Event'
+        assert (results[0].chart['zone'], results[0].chart['correction']) == (
+            'UT',
+            0,
+        )
+
+    def test_imported_charts_open_without_reports(
+        self, mock_tk_main, monkeypatch, tmp_path
+    ):
+        from types import SimpleNamespace
+        from unittest.mock import MagicMock
+
+        import src
+        from src.user_interfaces import select_chart
+        from src.user_interfaces.select_chart import SelectChart
+        from src.utils.bulk_import import import_charts
+
+        monkeypatch.setattr(src, 'CHART_PATH', str(tmp_path / 'charts'))
+        client_file = tmp_path / 'clients.csv'
+        with open(client_file, 'w', newline='') as datafile:
+            writer = csv.writer(datafile)
+            writer.writerow(HEADER)
+            writer.writerow(ROWS[1])
+        (result,) = import_charts(str(client_file))
+
+        for method, page in [
+            (SelectChart.solunars, 'SolunarsAllInOne'),
+            (SelectChart.predictive_methods, 'PredictiveMethods'),
+        ]:
+            opened = MagicMock()
+            monkeypatch.setattr(select_chart, page, opened)
+            monkeypatch.setattr(select_chart, 'main', MagicMock())
+            page_self = SimpleNamespace(
+                filename=result.chart_file,
+                program_options=None,
+                sort_recent=MagicMock(),
+                destroy=MagicMock(),
+                status=MagicMock(),
+            )
+
+            method(page_self)
+
+            page_self.status.error.assert_not_called()
+            assert opened.call_args.args[0]['version'] == (
+                result.chart['version']
+            )
@@ -0,0 +1,178 @@
+import itertools
+
+import pytest
+
+from test.fixtures.base_chart import base_chart
+from test.fixtures.tk_fixtures import mock_tk_main
+
+
+class TestBurstManifest:
+    @pytest.fixture
+    def burst(self, base_chart, mock_tk_main, tmp_path):
+        from src.models.charts import ChartObject, ChartType, ChartWheelRole
+        from src.utils.burst_manifest import BurstManifest, burst_manifest_key
+        from src.swe import julday
+
+        params = {
+            **base_chart,
+            'year': 2024,
+            'month': 3,
+            'day': 5,
+            'time': 12.0,
+            'style': 1,
+            'options': 'Return Default',
+            'base_chart': base_chart,
+            'radix': ChartObject(base_chart).with_role(ChartWheelRole.RADIX),
+        }
+        solars = [ChartType.SOLAR_RETURN.value]
+        lunars = [
+            ChartType.LUNAR_RETURN.value,
+            ChartType.KINETIC_LUNAR_RETURN.value,
+        ]
+        start_jd = julday(2024, 3, 5, 12.0, 1)
+
+        def load_manifests(directory=tmp_path):
+            return {
+                solunar_type: BurstManifest.load(
+                    burst_manifest_key(base_chart, solunar_type, params, True),
+                    start_jd,
+                    str(directory),
+                )
+                for solunar_type in solars + lunars
+            }
+
+        return (params, solars, lunars, load_manifests)
+
+    def found_dates(self, found):
+        # Searches started from different dates converge to within a
+        # fraction of a second
+        return [
+            (pytest.approx(date, abs=1e-6), solunar_type)
+            for (_, date, solunar_type, _) in found
+        ]
+
+    def test_extending_only_searches_the_new_months(
+        self, burst, monkeypatch, tmp_path
+    ):
+        import src.utils.solunars as solunars
+
+        (params, solars, lunars, load_manifests) = burst
+
+        first = list(
+            solunars.iter_burst_solunar_returns(
+                params, solars, lunars, 2, load_manifests()
+            )
+        )
+
+        searched_windows = []
+        iter_window_returns = solunars._iter_window_returns
+
+        def record_window(params, solunar_type, start_jd, end_jd):
+            searched_windows.append((solunar_type, start_jd, end_jd))
+            return iter_window_returns(params, solunar_type, start_jd, end_jd)
+
+        monkeypatch.setattr(solunars, '_iter_window_returns', record_window)
+        extended = list(
+            solunars.iter_burst_solunar_returns(
+                params, solars, lunars, 4, load_manifests()
+            )
+        )
+        monkeypatch.undo()
+
+        fresh = list(
+            solunars.iter_burst_solunar_returns(
+                params, solars, lunars, 4, load_manifests(tmp_path / 'fresh')
+            )
+        )
+
+        assert self.found_dates(extended) == self.found_dates(fresh)
+        assert self.found_dates(extended)[: len(first)] == self.found_dates(
+            first
+        )
+        assert len(extended) > len(first)
+        start_jd = load_manifests()[solars[0]].start_jd
+        assert sorted(searched_windows) == sorted(
+            (solunar_type, start_jd + 60, start_jd + 120)
+            for solunar_type in solars + lunars
+        )
+
+        kinetic = [found for found in extended if found[2] == lunars[1]]
+        fresh_kinetic = [found for found in fresh if found[2] == lunars[1]]
+        assert [
+            found[0]['progressed_chart'].julian_day_utc for found in kinetic
+        ] == pytest.approx(
+            [
+                found[0]['progressed_chart'].julian_day_utc
+                for found in fresh_kinetic
+            ],
+            abs=1e-6,
+        )
+
+    def test_interrupted_burst_resumes(self, burst):
+        from src.utils.solunars import iter_burst_solunar_returns
+
+        (params, solars, lunars, load_manifests) = burst
+
+        interrupted = list(
+            itertools.islice(
+                iter_burst_solunar_returns(
+                    params, solars, lunars, 3, load_manifests()
+                ),
+                4,
+            )
+        )
+        manifests = load_manifests()
+        assert sum(len(m.returns) for m in manifests.values()) >= 4
+
+        resumed = list(
+            iter_burst_solunar_returns(params, solars, lunars, 3, manifests)
+        )
+
+        assert self.found_dates(resumed)[:4] == self.found_dates(interrupted)
+        assert self.found_dates(resumed) == self.found_dates(
+            iter_burst_solunar_returns(
+                params, solars, lunars, 3, load_manifests()
+            )
+        )
+
+    def test_made_charts_are_remembered(self, burst, tmp_path):
+        (params, solars, lunars, load_manifests) = burst
+
+        manifest = load_manifests()[solars[0]]
+        date = manifest.start_jd + 10
+        chart_file = tmp_path / 'chart.dat'
+
+        manifest.record_chart(date, str(chart_file))
+        assert not manifest.find(date)
+
+        manifest.add_return(date)
+        manifest.record_chart(date, str(chart_file))
+        assert not load_manifests()[solars[0]].has_chart(date)
+
+        chart_file.write_text('')
+        assert load_manifests()[solars[0]].has_chart(date + 1e-5)
+        assert not load_manifests()[solars[0]].has_chart(date + 1)
+
+    def test_clients_born_together_have_their_own(
+        self, base_chart, burst, tmp_path
+    ):
+        from src.utils.burst_manifest import BurstManifest, burst_manifest_key
+
+        (params, solars, _, load_manifests) = burst
+
+        manifest = load_manifests()[solars[0]]
+        date = manifest.start_jd + 10
+        chart_file = tmp_path / 'chart.dat'
+        chart_file.write_text('')
+        manifest.add_return(date)
+        manifest.record_chart(date, str(chart_file))
+
+        twin = BurstManifest.load(
+            burst_manifest_key(
+                {**base_chart, 'name': 'Twin'}, solars[0], params, True
+            ),
+            manifest.start_jd,
+            str(tmp_path),
+        )
+        assert twin.path != manifest.path
+        assert not twin.has_chart(date)
@@ -0,0 +1,70 @@
+from test.fixtures.base_chart import base_chart
+from test.fixtures.tk_fixtures import mock_tk_main
+
+
+class TestChartCache:
+    def test_shares_one_chart_per_moment_and_place(
+        self, base_chart, mock_tk_main
+    ):
+        from src.models.charts import ChartObject, ChartType
+        from src.utils.chart_cache import ChartCache
+
+        cache = ChartCache()
+        first = cache.get(base_chart)
+        second = cache.get(
+            {
+                **base_chart,
+                'name': 'other client',
+                'type': ChartType.SOLAR_RETURN.value,
+                'notes': 'shared moment',
+            }
+        )
+
+        assert (cache.misses, cache.hits) == (1, 1)
+        assert first is not second
+        assert second.name == 'other client'
+        assert second.type == ChartType.SOLAR_RETURN
+        assert second.notes == 'shared moment'
+        assert first.name == base_chart['name']
+        assert (
+            first.planets == second.planets == ChartObject(base_chart).planets
+        )
+
+        cache.get({**base_chart, 'latitude': base_chart['latitude'] + 1})
+        assert cache.misses == 2
+
+    def test_copies_precess_independently(self, base_chart, mock_tk_main):
+        from src.models.charts import ChartObject, ChartWheelRole
+        from src.utils.chart_cache import ChartCache
+
+        cache = ChartCache()
+        untouched = ChartObject(base_chart)
+        transit = ChartObject({**base_chart, 'year': 2024})
+
+        precessed = cache.get(base_chart).precess_to(transit)
+        precessed.planets['Sun'].angle_axes_contacted.append('A')
+        precessed.planets['Moon'].role = ChartWheelRole.TRANSIT
+
+        assert precessed.planets != untouched.planets
+        assert cache.get(base_chart).planets == untouched.planets
+        assert cache.get(base_chart).angle_data == untouched.angle_data
+
+    def test_radix_copies_follow_their_own_transit(
+        self, base_chart, mock_tk_main
+    ):
+        from src.models.charts import ChartObject
+        from src.utils.chart_cache import ChartCache
+
+        cache = ChartCache()
+        transits = [
+            ChartObject({**base_chart, 'year': year, 'month': month})
+            for year, month in [(2020, 1), (2021, 6), (2024, 11)]
+        ]
+
+        radixes = [cache.get(base_chart).precess_to(t) for t in transits]
+
+        assert cache.misses == 1
+        for radix, transit in zip(radixes, transits):
+            expected = ChartObject(base_chart).precess_to(transit)
+            assert radix.planets == expected.planets
+            assert radix.angle_data == expected.angle_data
@@ -0,0 +1,253 @@
+import json
+import os
+
+import pytest
+
+from test.fixtures.base_chart import base_chart
+from test.fixtures.natal_options import natal_options
+from test.fixtures.tk_fixtures import mock_tk_main
+
+LEGACY_REPORT_FOOTER = 'Created by Time Matters 0.6.2  (1 Jan 2022)'
+
+
+class TestChartMigration:
+    @pytest.fixture
+    def archive(
+        self, base_chart, natal_options, mock_tk_main, monkeypatch, tmp_path
+    ):
+        import src
+        from src.models.charts import ChartObject
+        from src.utils.chart_utils import make_chart_path
+
+        chart_path = tmp_path / 'charts'
+        option_path = tmp_path / 'options'
+        option_path.mkdir()
+        (option_path / 'Natal_Default.opt').write_text(
+            json.dumps(natal_options)
+        )
+        monkeypatch.setattr(src, 'CHART_PATH', str(chart_path))
+        monkeypatch.setattr(src, 'TEMP_CHARTS', str(chart_path / 'temporary'))
+        monkeypatch.setattr(src, 'OPTION_PATH', str(option_path))
+
+        chart = {**base_chart, 'options': 'Natal Default'}
+
+        # Saved before charts were filed by name, with the data that used
+        # to be kept alongside
+        legacy = chart_path / 'Legacy~2022.dat'
+        legacy.parent.mkdir(parents=True)
+        legacy.write_text(
+            json.dumps({**chart, 'name': 'Legacy', 'planets': {'Sun': [1]}})
+        )
+        (chart_path / 'Legacy~2022.txt').write_text(
+            'old report\n' + LEGACY_REPORT_FOOTER
+        )
+
+        current = make_chart_path({**chart, 'name': 'Current'}, False)
+        os.makedirs(os.path.dirname(current))
+        ChartObject({**chart, 'name': 'Current'}).to_file(current)
+
+        temporary = make_chart_path({**chart, 'name': 'Temporary'}, True)
+        os.makedirs(os.path.dirname(temporary))
+        ChartObject({**chart, 'name': 'Temporary'}).to_file(temporary)
+
+        broken = chart_path / 'B' / 'Broken' / 'Broken~2000-01-01~Natal.dat'
+        broken.parent.mkdir(parents=True)
+        broken.write_text('{')
+
+        return {
+            'chart': chart,
+            'legacy': str(legacy),
+            'current': current,
+            'temporary': temporary,
+            'broken': str(broken),
+            'journal': str(tmp_path / 'journal.txt'),
+        }
+
+    def test_migrates_and_resumes(self, archive):
+        from src.constants import VERSION
+        from src.utils.chart_migration import (
+            MigrationStatus,
+            current_chart_data,
+            find_chart_files,
+            migrate_charts,
+        )
+        from src.utils.chart_utils import make_chart_path
+        from src.utils.format_utils import version_str_to_tuple
+
+        assert [path for (path, _) in find_chart_files()] == [
+            archive['legacy'],
+            archive['broken'],
+            archive['current'],
+            archive['temporary'],
+        ]
+        assert len(find_chart_files(include_temporary=False)) == 3
+
+        progress = []
+        summary = migrate_charts(
+            progress=lambda done, total: progress.append((done, total)),
+            journal_path=archive['journal'],
+        )
+
+        assert summary.total == 4
+        assert summary.counts[MigrationStatus.MIGRATED] == 3
+        assert [failure.path for failure in summary.failures] == [
+            archive['broken']
+        ]
+        assert progress[-1] == (4, 4)
+
+        moved = make_chart_path({**archive['chart'], 'name': 'Legacy'}, False)
+        assert not os.path.exists(archive['legacy'])
+        with open(moved[0:-3] + 'txt') as report:
+            assert report.read().endswith(LEGACY_REPORT_FOOTER)
+        for path in [moved, archive['current'], archive['temporary']]:
+            with open(path) as datafile:
+                data = json.load(datafile)
+            assert data == current_chart_data(data)
+            assert tuple(data['version']) == version_str_to_tuple(VERSION)
+            assert 'planets' not in data
+        assert not [
+            name
+            for (_, _, filenames) in os.walk(os.path.dirname(moved))
+            for name in filenames
+            if name.endswith('.tmp')
+        ]
+
+        # Everything but the failure was journaled
+        summary = migrate_charts(journal_path=archive['journal'])
+        assert summary.resumed == 3
+        assert summary.counts[MigrationStatus.FAILED] == 1
+
+        # A run stopped partway picks up after the last file it finished
+        def stop(done, total):
+            if done == 2:
+                raise KeyboardInterrupt
+
+        with pytest.raises(KeyboardInterrupt):
+            migrate_charts(
+                restart=True, progress=stop, journal_path=archive['journal']
+            )
+        summary = migrate_charts(journal_path=archive['journal'])
+        assert summary.resumed == 1
+        assert summary.counts[MigrationStatus.UNCHANGED] == 2
+
+    def test_rewrites_reports_across_a_pool(self, archive):
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        import src
+        from src.core import initialize_chart_worker
+        from src.utils.chart_migration import MigrationStatus, migrate_charts
+        from src.utils.chart_utils import make_chart_path
+
+        with ProcessPoolExecutor(
+            max_workers=2,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=initialize_chart_worker,
+            initargs=(src.CHART_PATH, src.TEMP_CHARTS, src.OPTION_PATH),
+        ) as executor:
+            summary = migrate_charts(
+                write_reports=True,
+                executor=executor,
+                journal_path=archive['journal'],
+            )
+
+        assert [failure.path for failure in summary.failures] == [
+            archive['broken']
+        ]
+        assert summary.counts[MigrationStatus.MIGRATED] == 3
+        assert summary.reports_written == 3
+
+        moved = make_chart_path({**archive['chart'], 'name': 'Legacy'}, False)
+        for path in [moved, archive['current'], archive['temporary']]:
+            with open(path[0:-3] + 'txt', encoding='utf-8-sig') as report:
+                text = report.read()
+            assert 'Created by Time Matters' in text
+            assert LEGACY_REPORT_FOOTER not in text
+
+    def test_keeps_the_old_report_when_writing_fails(
+        self, archive, monkeypatch
+    ):
+        from unittest.mock import MagicMock
+
+        from src.user_interfaces import core_chart
+        from src.user_interfaces.uniwheel import Uniwheel
+        from src.utils.chart_migration import (
+            MigrationStatus,
+            migrate_chart_file,
+        )
+
+        report = archive['current'][0:-3] + 'txt'
+        with open(report, 'w') as datafile:
+            datafile.write('old report')
+
+        def fail(self, chartfile):
+            chartfile.write('half a report')
+            raise ValueError('Unable to draw')
+
+        showerror = MagicMock()
+        monkeypatch.setattr(Uniwheel, 'draw_chart', fail)
+        monkeypatch.setattr(core_chart.tkmessagebox, 'showerror', showerror)
+
+        result = migrate_chart_file(
+            archive['current'], False, write_report=True
+        )
+
+        assert result.status == MigrationStatus.FAILED
+        assert not result.report_written
+        showerror.assert_called_once()
+        with open(report) as datafile:
+            assert datafile.read() == 'old report'
+        assert not os.path.exists(report + '.tmp')
+
+    def test_migrates_across_a_pool_started_by_a_script(
+        self, archive, tmp_path
+    ):
+        import subprocess
+        import sys
+
+        import src
+
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        # The pool's processes run the script again as they start
+        script = tmp_path / 'migrate_charts.py'
+        script.write_text(
+            'import json\n'
+            'import multiprocessing\n'
+            'import sys\n'
+            'import src\n'
+            'from src.utils import chart_migration\n'
+            'if __name__ == "__main__":\n'
+            '    multiprocessing.freeze_support()\n'
+            '    src.initialize()\n'
+            '    (src.CHART_PATH, src.TEMP_CHARTS) = sys.argv[1:3]\n'
+            '    chart_migration.POOL_THRESHOLD = 1\n'
+            '    summary = chart_migration.migrate_charts(\n'
+            '        workers=2, journal_path=sys.argv[3]\n'
+            '    )\n'
+            '    print(json.dumps({\n'
+            '        status.value: count\n'
+            '        for (status, count) in summary.counts.items()\n'
+            '    }))\n'
+        )
+
+        result = subprocess.run(
+            [
+                sys.executable,
+                str(script),
+                src.CHART_PATH,
+                src.TEMP_CHARTS,
+                archive['journal'],
+            ],
+            capture_output=True,
+            text=True,
+            cwd=root,
+            env={**os.environ, 'HOME': str(tmp_path), 'PYTHONPATH': root},
+            timeout=300,
+            check=True,
+        )
+
+        assert json.loads(result.stdout) == {
+            'Unchanged': 0,
+            'Migrated': 3,
+            'Failed': 1,
+        }
@@ -0,0 +1,177 @@
+from test.fixtures.base_chart import base_chart
+from test.fixtures.natal_options import natal_options
+from test.fixtures.tk_fixtures import mock_tk_main
+
+
+class TestChartObjectAtLocations:
+    locations = [
+        ('Ridgewood, NJ USA', 40.97972222222222, -74.11944444444444),
+        ('London, UK', 51.5072, -0.1276),
+        ('Sydney, Australia', -33.8688, 151.2093),
+    ]
+
+    def test_matches_individual_charts(self, base_chart, mock_tk_main):
+        from src.models.charts import ChartObject
+
+        charts = ChartObject.at_locations(base_chart, self.locations)
+
+        for chart, (location, latitude, longitude) in zip(
+            charts, self.locations
+        ):
+            expected = ChartObject(
+                {
+                    **base_chart,
+                    'location': location,
+                    'latitude': latitude,
+                    'longitude': longitude,
+                }
+            )
+            assert chart.location == location
+            assert chart.julian_day_utc == expected.julian_day_utc
+            assert chart.cusps == expected.cusps
+            assert chart.angle_data == expected.angle_data
+            assert chart.planets == expected.planets
+
+    def test_local_mean_time_charts_keep_their_own_moment(
+        self, base_chart, mock_tk_main
+    ):
+        from src.models.charts import ChartObject
+
+        charts = ChartObject.at_locations(
+            {**base_chart, 'zone': 'LMT'}, self.locations
+        )
+
+        assert len({chart.julian_day_utc for chart in charts}) == 3
+        for chart in charts:
+            expected = ChartObject({**chart.to_dict(), 'zone': 'LMT'})
+            assert chart.planets == expected.planets
+
+
+class TestChartObjectPrecession:
+    def test_matches_precessing_each_point(self, base_chart, mock_tk_main):
+        from copy import deepcopy
+
+        from src.models.charts import ChartObject
+
+        radix = ChartObject(base_chart)
+        transit = ChartObject(
+            {
+                **base_chart,
+                'year': 2024,
+                'latitude': 51.5072,
+                'longitude': -0.1276,
+            }
+        )
+
+        expected = deepcopy(radix)
+        for planet in expected.planets.values():
+            planet.precess_to(transit)
+        for angle in expected.angle_data.values():
+            angle.precess_to(transit)
+
+        precessed = radix.precess_to(transit)
+
+        assert precessed is radix
+        assert precessed.planets == expected.planets
+        assert precessed.angle_data == expected.angle_data
+
+
+class TestHalfSums:
+    def test_points_are_slotted_and_shared(
+        self, base_chart, natal_options, mock_tk_main
+    ):
+        from src.models.charts import ChartObject, ChartWheelRole
+        from src.models.options import Options
+        from src.utils.calculation_utils import calc_halfsums
+
+        natal_options['midpoints']['cross_wheel_enabled'] = True
+        options = Options(natal_options)
+        charts = [
+            ChartObject({**base_chart, 'year': 2024}).with_role(
+                ChartWheelRole.TRANSIT
+            ),
+            ChartObject(base_chart).with_role(ChartWheelRole.RADIX),
+        ]
+
+        halfsums = calc_halfsums(options, charts)
+        points = {
+            id(point): point
+            for halfsum in halfsums
+            for point in [halfsum.point_a, halfsum.point_b]
+        }
+        point_count = len(list(charts[0].iterate_points(options, True)))
+
+        assert len(points) == 2 * point_count
+        assert len(halfsums) == (
+            point_count * (point_count - 1) + point_count**2
+        )
+        assert not any(hasattr(halfsum, '__dict__') for halfsum in halfsums)
+        assert not any(hasattr(point, '__dict__') for point in points.values())
+
+        ascendants = [
+            point for point in points.values() if point.short_name == 'As'
+        ]
+        assert [point.role for point in ascendants] == [
+            ChartWheelRole.TRANSIT,
+            ChartWheelRole.RADIX,
+        ]
+        assert all(point.is_angle for point in ascendants)
+
+    def test_own_midpoint_contacts_are_shared_across_wheels(
+        self, base_chart, natal_options, mock_tk_main, monkeypatch
+    ):
+        from src.models.charts import ChartObject, ChartWheelRole
+        from src.models.options import Options
+        from src.utils import calculation_utils
+        from src.utils.calculation_utils import (
+            OWN_MIDPOINT_CONTACTS,
+            calc_halfsums,
+            calc_midpoints_3,
+        )
+
+        natal_options['midpoints']['cross_wheel_enabled'] = True
+        options = Options(natal_options)
+
+        def midpoints_for(year):
+            transit = ChartObject({**base_chart, 'year': year}).with_role(
+                ChartWheelRole.TRANSIT
+            )
+            radix = (
+                ChartObject(base_chart)
+                .with_role(ChartWheelRole.RADIX)
+                .precess_to(transit)
+            )
+            charts = [transit, radix]
+            midpoints = calc_midpoints_3(
+                options, charts, calc_halfsums(options, charts)
+            )
+            return {
+                key: [str(midpoint) for midpoint in found]
+                for (key, found) in midpoints.items()
+            }
+
+        OWN_MIDPOINT_CONTACTS.clear()
+        cold = [midpoints_for(year) for year in [2020, 2024]]
+        assert len(OWN_MIDPOINT_CONTACTS) == 3
+
+        parse_midpoint = calculation_utils.parse_midpoint
+        ecliptic_checks = []
+
+        def counting_parse_midpoint(
+            options, point, halfsum, coordinates, **kw
+        ):
+            if coordinates == 'longitude' and not kw:
+                ecliptic_checks.append(
+                    (point.role, halfsum.point_a.role, halfsum.point_b.role)
+                )
+            return parse_midpoint(options, point, halfsum, coordinates, **kw)
+
+        monkeypatch.setattr(
+            calculation_utils, 'parse_midpoint', counting_parse_midpoint
+        )
+        warm = midpoints_for(2020)
+
+        assert warm == cold[0]
+        assert cold[0] != cold[1]
+        assert ecliptic_checks
+        assert (ChartWheelRole.RADIX,) * 3 not in ecliptic_checks
@@ -0,0 +1,98 @@
+import random
+
+import pytest
+
+from test.fixtures.base_chart import base_chart
+from test.fixtures.tk_fixtures import mock_tk_main
+from test.utils import difference
+
+
+class TestCoordinates:
+    @pytest.mark.parametrize('year', [1900, 1989, 2030])
+    @pytest.mark.parametrize('latitude', [-62.0, -33.9, 0.5, 40.98, 60.1])
+    def test_matches_swiss_ephemeris(
+        self, base_chart, mock_tk_main, year, latitude
+    ):
+        from src import swe
+        from src.models.charts import ChartObject
+        from src.utils import coordinates
+
+        chart = ChartObject({**base_chart, 'year': year, 'latitude': latitude})
+        tolerance = coordinates.TOLERANCE
+
+        for planet in chart.planets.values():
+            tropical_longitude = planet.longitude + chart.ayanamsa
+
+            (
+                right_ascension,
+                declination,
+            ) = coordinates.ecliptic_to_equatorial(
+                tropical_longitude, planet.latitude, chart.obliquity
+            )
+            expected = swe.cotrans(
+                [tropical_longitude, planet.latitude, 1], chart.obliquity
+            )
+            assert difference(right_ascension, expected[0]) < tolerance
+            assert abs(declination - expected[1]) < tolerance
+
+            house = coordinates.campanus_house_position(
+                chart.ramc,
+                chart.geo_latitude,
+                chart.obliquity,
+                tropical_longitude,
+                planet.latitude,
+            )
+            assert difference(house, planet.house) < tolerance
+
+            (azimuth, altitude) = coordinates.horizontal_coordinates(
+                chart.ramc,
+                chart.geo_latitude,
+                chart.obliquity,
+                tropical_longitude,
+                planet.latitude,
+            )
+            assert difference(azimuth, planet.azimuth) < tolerance
+            assert abs(altitude - planet.altitude) < tolerance
+
+        assert (
+            difference(
+                coordinates.midheaven_longitude(chart.ramc, chart.obliquity)
+                - chart.ayanamsa,
+                chart.cusps[10],
+            )
+            < tolerance
+        )
+        assert (
+            difference(
+                coordinates.ascendant_longitude(
+                    chart.ramc, chart.geo_latitude, chart.obliquity
+                )
+                - chart.ayanamsa,
+                chart.cusps[1],
+            )
+            < tolerance
+        )
+
+    def test_meridian_longitude(self, mock_tk_main):
+        from src import swe
+        from src.utils import coordinates
+
+        generator = random.Random(12)
+        points = [
+            (generator.uniform(0, 360), generator.uniform(-89, 89))
+            for _ in range(2000)
+        ]
+
+        calculated = coordinates.meridian_longitude(
+            [azimuth for azimuth, _ in points],
+            [altitude for _, altitude in points],
+        )
+
+        for (azimuth, altitude), meridian_longitude in zip(points, calculated):
+            assert (
+                difference(
+                    meridian_longitude,
+                    swe.calc_meridian_longitude(azimuth, altitude),
+                )
+                < coordinates.TOLERANCE
+            )
@@ -0,0 +1,65 @@
+import json
+import os
+import subprocess
+import sys
+
+
+class TestCore:
+    def test_import_has_no_side_effects(self, tmp_path):
+        script = (
+            'import json, sys\n'
+            'import src.core\n'
+            'import src.swe\n'
+            'print(json.dumps({\n'
+            '    "gui": [m for m in sys.modules if m.startswith("tkinter")],\n'
+            '    "numpy": "numpy" in sys.modules,\n'
+            '    "dll_loaded": src.swe.dll is not None,\n'
+            '}))\n'
+        )
+        result = subprocess.run(
+            [sys.executable, '-c', script],
+            capture_output=True,
+            text=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            env={**os.environ, 'HOME': str(tmp_path)},
+            check=True,
+        )
+
+        assert json.loads(result.stdout) == {
+            'gui': [],
+            'numpy': False,
+            'dll_loaded': False,
+        }
+        assert list(tmp_path.iterdir()) == []
+
+    def test_builds_charts_and_midpoints(self, tmp_path):
+        script = (
+            'import json\n'
+            'import src.core as core\n'
+            'from test.fixtures.base_chart import base_chart\n'
+            'from test.fixtures.natal_options import natal_options\n'
+            'params = base_chart.__wrapped__()\n'
+            'options = core.Options(natal_options.__wrapped__())\n'
+            'chart = core.build_chart(params, core.ChartWheelRole.RADIX)\n'
+            'midpoints = core.calc_midpoints(options, [chart])\n'
+            'print(json.dumps({\n'
+            '    "sun": chart.planets["Sun"].longitude,\n'
+            '    "midpoints": sum(len(m) for m in midpoints.values()),\n'
+            '    "search": callable(core.search_solunars),\n'
+            '    "exported": all(hasattr(core, n) for n in core.__all__),\n'
+            '}))\n'
+        )
+        result = subprocess.run(
+            [sys.executable, '-c', script],
+            capture_output=True,
+            text=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            env={**os.environ, 'HOME': str(tmp_path)},
+            check=True,
+        )
+
+        found = json.loads(result.stdout)
+        assert 0 <= found['sun'] < 360
+        assert found['midpoints'] > 0
+        assert found['search']
+        assert found['exported']
@@ -0,0 +1,133 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from test.fixtures.tk_fixtures import mock_tk_main
+from test.utils import difference
+
+START_JD = 2460000.5
+
+worker_segments = {}
+
+
+def attach_in_worker(names):
+    from src.utils.ephemeris_segments import attach_ephemeris_segments
+
+    worker_segments.update(attach_ephemeris_segments(names))
+
+
+def crossings_in_worker(targets):
+    from src import swe
+
+    return (
+        [
+            dates.tolist()
+            for dates in worker_segments[1].crossings(np.array(targets))
+        ],
+        swe.dll is not None,
+    )
+
+
+class TestEphemerisSegments:
+    def test_shared_segment_is_read_in_place(self, mock_tk_main):
+        from src.swe import calc_planet_longitude
+        from src.utils.ephemeris_segments import (
+            MOON,
+            EphemerisSegment,
+            calc_ephemeris_segment,
+        )
+
+        segment = calc_ephemeris_segment(MOON, START_JD, START_JD + 60)
+        shared = segment.share()
+        attached = EphemerisSegment.attach(shared.shared.name)
+        try:
+            assert (attached.planet, attached.start_jd, attached.step) == (
+                segment.planet,
+                segment.start_jd,
+                segment.step,
+            )
+            assert attached.longitudes.tolist() == segment.longitudes.tolist()
+            assert attached.speeds.tolist() == segment.speeds.tolist()
+            assert not attached.longitudes.flags.owndata
+
+            targets = np.array([0.0, 123.4, 359.9])
+            for found, expected in zip(
+                attached.crossings(targets), segment.crossings(targets)
+            ):
+                assert found.tolist() == expected.tolist()
+
+            dates = START_JD + np.linspace(0, 60, 97)
+            (longitudes, speeds) = attached.interpolate(dates)
+            for date, longitude, speed in zip(dates, longitudes, speeds):
+                (exact_longitude, exact_speed) = calc_planet_longitude(
+                    date, MOON
+                )
+                assert difference(longitude, exact_longitude) < 1e-5
+                assert abs(speed - exact_speed) < 1e-3
+        finally:
+            attached.close()
+            shared.close(unlink=True)
+
+        assert shared.shared is None and shared.longitudes is None
+
+    def test_pool_workers_share_one_segment(self, mock_tk_main):
+        from src.utils.ephemeris_segments import (
+            MOON,
+            calc_ephemeris_segment,
+            share_ephemeris_segments,
+            shared_segment_names,
+        )
+
+        segments = share_ephemeris_segments(
+            {MOON: calc_ephemeris_segment(MOON, START_JD, START_JD + 90)}
+        )
+        targets = [[float(target)] for target in range(0, 360, 45)]
+        try:
+            with ProcessPoolExecutor(
+                max_workers=2,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=attach_in_worker,
+                initargs=(shared_segment_names(segments),),
+            ) as executor:
+                found = list(executor.map(crossings_in_worker, targets))
+        finally:
+            expected = [
+                [dates.tolist() for dates in segments[MOON].crossings(target)]
+                for target in targets
+            ]
+            segments[MOON].close(unlink=True)
+
+        assert [crossings for (crossings, _) in found] == expected
+        # The workers never loaded the ephemeris library
+        assert not any(loaded for (_, loaded) in found)
+
+    def test_retrograde_planet_segment(self, mock_tk_main):
+        from src.swe import calc_planet_longitude
+        from src.utils.ephemeris_segments import calc_ephemeris_segment
+
+        mercury = 2
+        segment = calc_ephemeris_segment(mercury, START_JD, START_JD + 400)
+        assert (segment.speeds < 0).any()
+
+        dates = START_JD + np.linspace(0, 400, 801)
+        (longitudes, speeds) = segment.interpolate(dates)
+        for date, longitude, speed in zip(dates, longitudes, speeds):
+            (exact_longitude, exact_speed) = calc_planet_longitude(
+                date, mercury
+            )
+            assert difference(longitude, exact_longitude) < 1e-4
+            assert abs(speed - exact_speed) < 1e-3
+
+        # Longitudes passed over three times, going back over them while
+        # retrograde, and once
+        targets = np.array(
+            [calc_planet_longitude(date, mercury)[0] for date in dates[::80]]
+        )
+        crossings = segment.crossings(targets)
+        assert 3 in [len(found) for found in crossings]
+        assert 1 in [len(found) for found in crossings]
+        for target, found in zip(targets, crossings):
+            for date in found:
+                longitude = calc_planet_longitude(date, mercury)[0]
+                assert difference(longitude, target) < 1e-4
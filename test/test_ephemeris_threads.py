@@ -0,0 +1,67 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from test.fixtures.base_chart import base_chart
+from test.fixtures.natal_options import natal_options
+from test.fixtures.tk_fixtures import mock_tk_main
+
+
+class TestEphemerisThreads:
+    def test_threaded_results_match_serial(
+        self, base_chart, natal_options, mock_tk_main
+    ):
+        from src import swe
+        from src.models.charts import ChartWheelRole
+        from src.models.options import Options
+        from src.utils.calculation_utils import calc_halfsums, calc_midpoints_3
+        from src.utils.chart_cache import ChartCache
+
+        options = Options(natal_options)
+        moments = [
+            {
+                **base_chart,
+                'year': 1950 + index * 3,
+                'month': 1 + index % 12,
+                'time': (index * 1.7) % 24,
+            }
+            for index in range(32)
+        ]
+        cache = ChartCache(max_charts=8)
+
+        def cast(params):
+            chart = cache.get(params).with_role(ChartWheelRole.RADIX)
+            julian_day = chart.julian_day_utc
+            midpoints = calc_midpoints_3(
+                options, [chart], calc_halfsums(options, [chart])
+            )
+            return (
+                {
+                    name: (
+                        planet.longitude,
+                        planet.right_ascension,
+                        planet.house,
+                        planet.prime_vertical_longitude,
+                    )
+                    for (name, planet) in chart.planets.items()
+                },
+                chart.cusps,
+                sorted(
+                    (key, len(aspects)) for (key, aspects) in midpoints.items()
+                ),
+                swe.calc_sun_crossing(0, julian_day),
+                swe.calc_moon_crossing(90, julian_day),
+                swe.calc_elongation_crossing(180, julian_day),
+                swe.is_planet_stationary('Mercury', julian_day),
+            )
+
+        serial = [cast(params) for params in moments]
+
+        # Threads that never called the library before need their own
+        # ephemeris path; without it they fall back to the analytical
+        # theory and lose the asteroids
+        cache.clear()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            threaded = list(executor.map(cast, moments * 4))
+
+        assert threaded == serial * 4
+        assert cache.misses + cache.hits == len(moments) * 4
+        assert len(cache.charts) == cache.max_charts
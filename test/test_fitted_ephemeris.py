@@ -0,0 +1,74 @@
+from test.fixtures.base_chart import base_chart
+from test.fixtures.tk_fixtures import mock_tk_main
+from test.utils import difference
+
+START_JD = 2460000.5
+
+
+class TestFittedEphemeris:
+    def test_fits_stay_within_their_error_bound(self, mock_tk_main):
+        from src.swe import calc_planet_longitude
+        from src.utils.fitted_ephemeris import FittedLongitudes
+
+        for planet in [0, 1, 4]:
+            longitudes = FittedLongitudes(planet)
+            for step in range(400):
+                julian_day = START_JD + step * 0.0773
+                (longitude, error_bound) = longitudes.longitude(julian_day)
+                (exact_longitude, exact_speed) = calc_planet_longitude(
+                    julian_day, planet
+                )
+
+                assert error_bound < 1e-5
+                assert difference(longitude, exact_longitude) <= error_bound
+                assert (
+                    abs(
+                        longitudes.fit_at(julian_day).speed(julian_day)
+                        - exact_speed
+                    )
+                    < 1e-4
+                )
+
+    def test_progressed_search_matches_the_library_bisection(
+        self, base_chart, monkeypatch, mock_tk_main
+    ):
+        import src.utils.solunars as solunars
+        from src.swe import julday
+
+        radix_jd = julday(
+            base_chart['year'],
+            base_chart['month'],
+            base_chart['day'],
+            base_chart['time'] + base_chart['correction'],
+            1,
+        )
+        radix_sun_longitude = base_chart['Sun'][0]
+        searches = [
+            (START_JD + offset, START_JD + offset + length, body, relation)
+            for offset in range(0, 360, 45)
+            for (length, body) in [(28, 1), (366, 0)]
+            for relation in ['full', 'demi', 'Q1', 'Q3']
+        ]
+
+        def search_all():
+            return [
+                solunars.find_julian_days_for_aspect_to_progressed_body(
+                    radix_jd,
+                    start,
+                    end,
+                    body,
+                    radix_sun_longitude,
+                    relation,
+                )
+                for (start, end, body, relation) in searches
+            ]
+
+        fitted = search_all()
+        monkeypatch.setattr(
+            solunars,
+            'narrow_progressed_aspect_bracket',
+            lambda radix_jd, low, high, *args: (low, high),
+        )
+
+        assert fitted == search_all()
+        assert any(found != (None, None) for found in fitted)
@@ -0,0 +1,132 @@
+from test.fixtures.base_chart import base_chart
+from test.fixtures.natal_options import natal_options
+from test.fixtures.tk_fixtures import mock_tk_main
+
+
+class TestHarmonics:
+    def test_harmonic_chart_leaves_the_radix_alone(
+        self, base_chart, natal_options, mock_tk_main
+    ):
+        from src.models.charts import ChartObject, ChartWheelRole
+        from src.models.options import Options
+        from src.utils.novien import calc_novien_chart, calc_novien_longitude
+
+        options = Options(natal_options)
+        radix = ChartObject(base_chart)
+        untouched = ChartObject(base_chart)
+
+        novien = calc_novien_chart(radix, options)
+
+        assert radix.planets == untouched.planets
+        assert novien.role == ChartWheelRole.NOVIEN
+        for name, planet in radix.iterate_points(options):
+            assert novien.planets[name].longitude == calc_novien_longitude(
+                planet.longitude
+            )
+            assert novien.planets[name].speed == planet.speed * 9
+
+    def test_screened_aspects_match_every_pair(
+        self, base_chart, natal_options, mock_tk_main
+    ):
+        from src.models.charts import ChartObject
+        from src.models.options import Options
+        from src.utils.harmonics import (
+            calc_harmonic_aspects,
+            calc_harmonic_charts,
+            harmonic_aspect_options,
+            make_harmonic_aspect,
+        )
+
+        options = Options(natal_options)
+        radix = ChartObject(base_chart)
+        harmonics = [5, 7, 9, 16]
+        harmonic_charts = calc_harmonic_charts(radix, options, harmonics)
+
+        found = calc_harmonic_aspects(radix, harmonic_charts, options)
+
+        (harmonic_options, to_natal_options) = harmonic_aspect_options(options)
+        radix_points = [point for (_, point) in radix.iterate_points(options)]
+        for harmonic in harmonics:
+            points = [
+                point
+                for (_, point) in harmonic_charts[harmonic].iterate_points(
+                    options
+                )
+            ]
+            expected = [[], [], []]
+            for primary_index, primary in enumerate(points):
+                for secondary in points[primary_index + 1 :]:
+                    aspect = make_harmonic_aspect(
+                        primary,
+                        secondary,
+                        False,
+                        False,
+                        abs(primary.longitude - secondary.longitude) % 360,
+                        harmonic_options,
+                        is_harmonic_to_natal=False,
+                        harmonic_role=radix.role,
+                    )
+                    if aspect:
+                        expected[aspect.aspect_class - 1].append(aspect)
+            for primary in points:
+                for secondary in radix_points:
+                    aspect = make_harmonic_aspect(
+                        primary,
+                        secondary,
+                        False,
+                        True,
+                        abs(primary.longitude - secondary.longitude) % 360,
+                        to_natal_options,
+                        is_harmonic_to_natal=True,
+                        harmonic_role=radix.role,
+                    )
+                    if aspect:
+                        expected[2].append(aspect)
+
+            assert found[harmonic] == expected
+            assert found[harmonic] == (
+                calc_harmonic_aspects(
+                    radix, {harmonic: harmonic_charts[harmonic]}, options
+                )[harmonic]
+            )
+
+        assert any(found[harmonic][2] for harmonic in harmonics)
+
+    def test_harmonic_charts_take_the_callers_role(
+        self, base_chart, natal_options, mock_tk_main
+    ):
+        from src.models.charts import ChartObject, ChartWheelRole
+        from src.models.options import Options
+        from src.utils.harmonics import (
+            calc_harmonic_aspects,
+            calc_harmonic_charts,
+        )
+
+        options = Options(natal_options)
+        radix = ChartObject(base_chart).with_role(ChartWheelRole.RADIX)
+        transit = ChartObject(base_chart).with_role(ChartWheelRole.TRANSIT)
+
+        for chart, role, expected in [
+            (transit, None, ChartWheelRole.TRANSIT),
+            (transit, ChartWheelRole.PROGRESSED, ChartWheelRole.PROGRESSED),
+        ]:
+            harmonic_charts = calc_harmonic_charts(
+                chart, options, [5, 7], role
+            )
+            aspects = calc_harmonic_aspects(radix, harmonic_charts, options)
+
+            for harmonic, harmonic_chart in harmonic_charts.items():
+                assert harmonic_chart.role == expected
+                assert all(
+                    planet.role == expected
+                    for (_, planet) in harmonic_chart.iterate_points(options)
+                )
+                assert aspects[harmonic][2]
+                for aspect in aspects[harmonic][2]:
+                    assert (
+                        aspect.from_planet_role,
+                        aspect.to_planet_role,
+                    ) in [
+                        (expected, ChartWheelRole.RADIX),
+                        (ChartWheelRole.RADIX, expected),
+                    ]
@@ -0,0 +1,114 @@
+import pytest
+
+from test.fixtures.tk_fixtures import mock_tk_main
+
+
+class TestIngressAlmanac:
+    @pytest.fixture
+    def almanac(self, tmp_path, mock_tk_main):
+        from src.utils.ingress_almanac import (
+            IngressAlmanac,
+            generate_ingress_almanac,
+        )
+
+        path = str(tmp_path / 'ingress_almanac.bin')
+        generate_ingress_almanac(path, 2020, 2023)
+        almanac = IngressAlmanac(path)
+        yield almanac
+        almanac.close()
+
+    def test_matches_live_search(self, almanac):
+        from src.swe import calc_moon_crossing, calc_sun_crossing, julday
+        from src.utils.ingress_almanac import MOON, SUN
+
+        for start in [julday(2020, 3, 1, 12.5, 1), julday(2021, 7, 4, 0, 1)]:
+            for target in (0, 90, 180, 270):
+                assert almanac.next_crossing(
+                    SUN, target, start
+                ) == pytest.approx(calc_sun_crossing(target, start), abs=1e-6)
+                assert almanac.next_crossing(
+                    MOON, target, start
+                ) == pytest.approx(calc_moon_crossing(target, start), abs=1e-6)
+
+    def test_series_are_sorted_and_complete(self, almanac):
+        from src.utils.ingress_almanac import MOON, SUN
+
+        solar = almanac.crossings(SUN, 0)
+        lunar = almanac.crossings(MOON, 0)
+
+        assert len(solar) == 3
+        assert 39 <= len(lunar) <= 41
+        assert lunar == sorted(lunar)
+
+    def test_outside_span_is_not_answered(self, almanac):
+        from src.utils.ingress_almanac import SUN
+
+        assert almanac.next_crossing(SUN, 0, almanac.start - 10) is None
+        assert almanac.next_crossing(SUN, 0, almanac.end) is None
+
+    def test_truncated_file_is_regenerated(
+        self, almanac, monkeypatch, tmp_path
+    ):
+        import src.utils.ingress_almanac as ingress_almanac
+        from src.utils.ingress_almanac import SUN, load_ingress_almanac
+
+        generate_ingress_almanac = ingress_almanac.generate_ingress_almanac
+        generated = []
+
+        def generate(path, start_year, end_year):
+            generated.append(path)
+            generate_ingress_almanac(path, start_year, end_year)
+
+        monkeypatch.setattr(
+            ingress_almanac, 'generate_ingress_almanac', generate
+        )
+
+        with open(almanac.path, 'rb') as file:
+            contents = file.read()
+
+        # Cut partway through a julian day, and on a julian day boundary
+        for cut in [5, 8]:
+            path = str(tmp_path / f'truncated_{cut}.bin')
+            with open(path, 'wb') as file:
+                file.write(contents[:-cut])
+            monkeypatch.setattr(ingress_almanac, '_almanac', None)
+
+            loaded = load_ingress_almanac(path, 2020, 2023)
+            try:
+                assert generated[-1] == path
+                assert loaded.crossings(SUN, 0) == almanac.crossings(SUN, 0)
+            finally:
+                loaded.close()
+
+    def test_other_years_are_regenerated(self, almanac, monkeypatch, tmp_path):
+        import json
+        import shutil
+
+        import src
+        import src.utils.ingress_almanac as ingress_almanac
+        from src.swe import julday
+        from src.utils.ingress_almanac import SUN, load_ingress_almanac
+
+        path = str(tmp_path / 'saved.bin')
+        shutil.copyfile(almanac.path, path)
+        program_options = tmp_path / 'program_options.opt'
+        program_options.write_text(
+            json.dumps(
+                {
+                    'ingress_almanac_start_year': 2021,
+                    'ingress_almanac_end_year': 2023,
+                }
+            )
+        )
+        monkeypatch.setattr(src, 'PROGRAM_OPTION_PATH', str(program_options))
+        monkeypatch.setattr(ingress_almanac, '_almanac', None)
+
+        loaded = load_ingress_almanac(path)
+        try:
+            assert (loaded.start, loaded.end) == (
+                julday(2021, 1, 1, 0, 1),
+                julday(2023, 1, 1, 0, 1),
+            )
+            assert loaded.crossings(SUN, 0) == almanac.crossings(SUN, 0)[1:]
+        finally:
+            loaded.close()
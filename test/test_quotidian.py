@@ -0,0 +1,139 @@
+import io
+from copy import deepcopy
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from test.fixtures.base_chart import base_chart
+from test.fixtures.natal_options import natal_options
+from test.fixtures.tk_fixtures import mock_tk_main
+from test.utils import difference
+
+START_JD = 2461041.5
+LATITUDE = 40.7
+LONGITUDE = -74.0
+
+
+class TestSnqTimeline:
+    def test_progressed_dates_match_single_progressions(
+        self, base_chart, mock_tk_main
+    ):
+        from src.models.charts import ChartObject
+        from src.utils.quotidian import calc_snq_progressed_jds
+        from src.utils.transits.progressions import (
+            ProgressionTypes,
+            get_progressed_jd_utc,
+        )
+
+        radix = ChartObject(base_chart)
+        julian_days = START_JD + np.arange(0, 800, 0.37)
+
+        assert calc_snq_progressed_jds(radix, julian_days).tolist() == [
+            get_progressed_jd_utc(
+                radix.julian_day_utc,
+                julian_day,
+                radix.planets['Sun'].longitude,
+                ProgressionTypes.Q2.value,
+            )
+            for julian_day in julian_days
+        ]
+
+    def test_matches_snq_charts(self, base_chart, natal_options, mock_tk_main):
+        from src import swe
+        from src.models.charts import ChartObject, ChartWheelRole
+        from src.models.options import Options
+        from src.user_interfaces.core_chart import CoreChart
+        from src.utils.quotidian import (
+            calc_snq_timeline,
+            snq_progressed_params,
+            write_snq_timeline_to_file,
+        )
+
+        options = Options(natal_options)
+        radix = ChartObject(base_chart).with_role(ChartWheelRole.RADIX)
+        timeline = calc_snq_timeline(
+            radix, START_JD, START_JD + 365, 1, LATITUDE, LONGITUDE, options
+        )
+        params = {
+            'style': 1,
+            'location': '',
+            'latitude': LATITUDE,
+            'longitude': LONGITUDE,
+            'base_chart': base_chart,
+        }
+
+        assert len(timeline.julian_days) == 366
+        assert timeline.radix.strength.shape == (len(timeline.bodies), 366)
+
+        for step in range(0, 366, 61):
+            progressed = ChartObject(
+                snq_progressed_params(
+                    params, timeline.progressed_julian_days[step]
+                )
+            ).with_role(ChartWheelRole.PROGRESSED)
+            sweep = timeline.progressed
+            assert difference(sweep.ramc[step], progressed.ramc) < 1e-6
+            assert (
+                difference(sweep.midheaven[step], progressed.cusps[10]) < 1e-6
+            )
+            assert (
+                difference(sweep.ascendant[step], progressed.cusps[1]) < 1e-6
+            )
+
+            wheel = SimpleNamespace(
+                use_progressed_angles=True,
+                charts=[progressed, radix],
+                options=options,
+            )
+            for body_index, body in enumerate(timeline.bodies):
+                radix_planet = deepcopy(
+                    radix.planets[body]
+                ).with_house_position(
+                    swe.calc_house_pos(
+                        progressed.ramc,
+                        progressed.geo_latitude,
+                        progressed.obliquity,
+                        radix.planets[body].longitude + progressed.ayanamsa,
+                        radix.planets[body].latitude,
+                    )
+                )
+                for angularity, planet in [
+                    (timeline.radix, radix_planet),
+                    (
+                        timeline.progressed_bodies,
+                        deepcopy(progressed.planets[body]),
+                    ),
+                ]:
+                    (
+                        _,
+                        strength,
+                        _,
+                        signed_orb,
+                        _,
+                        _,
+                    ) = CoreChart.calc_angle_and_strength(wheel, planet)
+                    node = (body_index, step)
+
+                    assert angularity.house[node] == pytest.approx(
+                        planet.house, abs=1e-4
+                    )
+                    assert angularity.strength[node] == pytest.approx(
+                        strength, abs=1e-2
+                    )
+                    assert angularity.signed_orb[node] == pytest.approx(
+                        signed_orb, abs=1e-3
+                    )
+
+        flagged = timeline.flagged_steps()
+        assert flagged
+        for step in flagged:
+            assert timeline.radix.is_foreground[:, step].any() or (
+                timeline.progressed_bodies.is_foreground[:, step].any()
+            )
+
+        table = io.StringIO()
+        write_snq_timeline_to_file(timeline, 1, table)
+        lines = table.getvalue().splitlines()
+        assert len(lines) == 367
+        assert lines[1].startswith(' 1 Jan  2026  0:00:00')
@@ -0,0 +1,96 @@
+import pytest
+
+from test.fixtures.base_chart import base_chart
+from test.fixtures.tk_fixtures import mock_tk_main
+from test.utils import difference
+
+
+class TestTimeSweep:
+    @pytest.mark.parametrize('latitude', [-50.0, -20.0, 0.5, 40.98, 62.0])
+    def test_matches_recast_charts(self, base_chart, mock_tk_main, latitude):
+        from src.models.charts import ChartObject
+        from src.utils.rectification import calc_time_sweep
+
+        params = {**base_chart, 'latitude': latitude}
+        sweep = calc_time_sweep(ChartObject(params), -180, 180, 1)
+
+        assert len(sweep.minutes) == 361
+        assert sweep.house.shape == (len(sweep.bodies), 361)
+
+        for step in range(0, 361, 45):
+            chart = ChartObject(
+                {**params, 'time': params['time'] + sweep.minutes[step] / 60}
+            )
+            assert difference(sweep.ramc[step], chart.ramc) < 1e-6
+            assert difference(sweep.midheaven[step], chart.cusps[10]) < 1e-6
+            assert difference(sweep.ascendant[step], chart.cusps[1]) < 1e-6
+            assert difference(sweep.eastpoint[step], chart.angles[2]) < 1e-6
+            assert difference(sweep.vertex[step], chart.angles[1]) < 1e-6
+            for body_index, body in enumerate(sweep.bodies):
+                assert (
+                    difference(
+                        sweep.house[body_index, step],
+                        chart.planets[body].house,
+                    )
+                    < 1e-4
+                )
+
+    @pytest.mark.parametrize(
+        'start, end, step, message',
+        [
+            (60, -60, 1, 'before its start'),
+            (-60, 60, 0, 'Step must be positive'),
+            (-60, 60, -5, 'Step must be positive'),
+        ],
+    )
+    def test_rejects_empty_sweeps(
+        self, base_chart, mock_tk_main, start, end, step, message
+    ):
+        from src.models.charts import ChartObject
+        from src.utils.rectification import calc_angle_sweep, calc_time_sweep
+
+        with pytest.raises(ValueError, match=message):
+            calc_time_sweep(ChartObject(base_chart), start, end, step)
+        with pytest.raises(ValueError, match='No dates'):
+            calc_angle_sweep([], 40.0, -90.0, ['Sun'])
+
+    def test_finds_angle_crossings(self, base_chart, mock_tk_main):
+        from src.models.charts import ChartObject
+        from src.utils.rectification import (
+            MUNDANE_ANGLES,
+            calc_time_sweep,
+        )
+
+        sweep = calc_time_sweep(ChartObject(base_chart), -720, 720, 2)
+        crossings = sweep.angle_crossings(['Sun', 'Moon'])
+
+        # Each body passes every mundane angle once in a day
+        for body in ['Sun', 'Moon']:
+            assert sorted(
+                crossing.angle
+                for crossing in crossings
+                if crossing.body == body and crossing.angle in MUNDANE_ANGLES
+            ) == sorted(MUNDANE_ANGLES)
+        assert [crossing.julian_day for crossing in crossings] == sorted(
+            crossing.julian_day for crossing in crossings
+        )
+
+        for crossing in crossings:
+            chart = ChartObject(
+                {
+                    **base_chart,
+                    'time': base_chart['time'] + crossing.minutes / 60,
+                }
+            )
+            planet = chart.planets[crossing.body]
+            if crossing.angle in MUNDANE_ANGLES:
+                found = planet.house
+                expected = MUNDANE_ANGLES[crossing.angle]
+            else:
+                found = planet.longitude
+                expected = (
+                    chart.angles[2]
+                    if crossing.angle == 'Ep'
+                    else chart.angles[1]
+                )
+            assert difference(found, expected) < 1e-3
@@ -0,0 +1,68 @@
+from types import SimpleNamespace
+
+import pytest
+
+from test.fixtures.base_chart import base_chart
+from test.fixtures.natal_options import natal_options
+from test.fixtures.tk_fixtures import mock_tk_main
+
+
+class TestAngularityGrid:
+    latitudes = [-40.0, 0.0, 40.97972222222222, 55.5]
+    longitudes = [-120.0, -74.11944444444444, 10.0, 151.2]
+
+    @pytest.mark.parametrize('model', [0, 1, 2])
+    def test_matches_relocated_charts(
+        self, base_chart, natal_options, mock_tk_main, model
+    ):
+        from src.models.charts import ChartObject
+        from src.models.options import Options
+        from src.user_interfaces.core_chart import CoreChart
+        from src.utils.relocation import calc_angularity_grid
+
+        natal_options['angularity']['model'] = model
+        options = Options(natal_options)
+        chart = ChartObject(base_chart)
+
+        grid = calc_angularity_grid(
+            chart, self.latitudes, self.longitudes, options
+        )
+
+        assert grid.strength.shape == (
+            len(grid.bodies),
+            len(self.latitudes),
+            len(self.longitudes),
+        )
+
+        for lat_index, latitude in enumerate(self.latitudes):
+            relocated_charts = ChartObject.at_locations(
+                base_chart,
+                [('', latitude, longitude) for longitude in self.longitudes],
+            )
+            for lon_index, relocated in enumerate(relocated_charts):
+                wheel = SimpleNamespace(
+                    use_progressed_angles=False,
+                    charts=[relocated],
+                    options=options,
+                )
+                for body_index, body in enumerate(grid.bodies):
+                    planet = relocated.planets[body]
+                    (
+                        _,
+                        strength,
+                        _,
+                        signed_orb,
+                        _,
+                        _,
+                    ) = CoreChart.calc_angle_and_strength(wheel, planet)
+                    node = (body_index, lat_index, lon_index)
+
+                    assert grid.house[node] == pytest.approx(
+                        planet.house, abs=1e-6
+                    )
+                    assert grid.strength[node] == pytest.approx(
+                        strength, abs=1e-4
+                    )
+                    assert grid.signed_orb[node] == pytest.approx(
+                        signed_orb, abs=1e-4
+                    )
@@ -0,0 +1,87 @@
+import asyncio
+
+from test.fixtures.base_chart import base_chart
+
+
+class TestChartService:
+    def test_serves_and_coalesces_requests(self, base_chart, tmp_path):
+        from src.service import ChartService, ChartServiceClient
+
+        socket_path = str(tmp_path / 'service.sock')
+
+        async def run():
+            service = ChartService(workers=1)
+            await service.start(unix_socket=socket_path)
+            client = ChartServiceClient(unix_socket=socket_path)
+            try:
+                charts = await asyncio.gather(
+                    *[
+                        client.chart({**base_chart, 'name': f'client {i}'})
+                        for i in range(6)
+                    ]
+                )
+                returns = await client.returns(
+                    {
+                        'base_chart': base_chart,
+                        'params': {
+                            'year': 2024,
+                            'month': 3,
+                            'day': 5,
+                            'time': 12.0,
+                        },
+                        'solars': ['Solar Return'],
+                        'lunars': ['Lunar Return'],
+                    }
+                )
+                ingress = await client.ingress(
+                    {
+                        'body': 'Sun',
+                        'longitude': 0,
+                        'year': 2024,
+                        'month': 1,
+                        'day': 1,
+                    }
+                )
+                missing = await client.request('POST', '/nowhere', {})
+                invalid = await client.chart({'name': 'no date'})
+                metrics = await client.metrics()
+            finally:
+                await service.close()
+            return (charts, returns, ingress, missing, invalid, metrics)
+
+        (charts, returns, ingress, missing, invalid, metrics) = asyncio.run(
+            run()
+        )
+
+        assert [status for (status, _) in charts] == [200] * 6
+        assert [chart['name'] for (_, chart) in charts] == [
+            f'client {i}' for i in range(6)
+        ]
+        sun = charts[0][1]['planets']['Sun']['longitude']
+        assert all(
+            chart['planets']['Sun']['longitude'] == sun
+            for (_, chart) in charts
+        )
+        assert abs(sun - base_chart['Sun'][0]) < 1e-3
+
+        (status, found) = returns
+        assert status == 200
+        assert [found_return['type'] for found_return in found] == [
+            'Solar Return',
+            'Lunar Return',
+        ]
+        assert all(found_return['date'][0] == 2024 for found_return in found)
+
+        (status, found) = ingress
+        assert status == 200
+        assert found['date'][:2] == [2024, 4]
+
+        assert missing[0] == 404
+        assert invalid[0] == 400
+
+        (status, found) = metrics
+        assert status == 200
+        assert found['computed'] + found['coalesced'] == 8
+        assert found['coalesced'] >= 1
+        assert found['latency']['/chart']['count'] == 7
+        assert sum(found['latency']['/chart']['buckets'].values()) == 7
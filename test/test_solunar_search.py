@@ -0,0 +1,237 @@
+import itertools
+
+import pytest
+
+from test.fixtures.base_chart import base_chart
+from test.fixtures.tk_fixtures import mock_tk_main
+from test.utils import difference
+
+
+class TestSolunarSearch:
+    @pytest.fixture
+    def search(self, base_chart, mock_tk_main):
+        from src.models.charts import (
+            LUNAR_RETURNS,
+            SOLAR_RETURNS,
+            SOLUNAR_FAMILIES,
+            ChartObject,
+            ChartWheelRole,
+        )
+
+        params = {
+            **base_chart,
+            'year': 2024,
+            'month': 3,
+            'day': 5,
+            'time': 12.0,
+            'style': 1,
+            'base_chart': base_chart,
+            'radix': ChartObject(base_chart).with_role(ChartWheelRole.RADIX),
+        }
+        solunar_types = [family[0] for family in SOLUNAR_FAMILIES]
+        return (
+            params,
+            [t for t in solunar_types if t in SOLAR_RETURNS],
+            [t for t in solunar_types if t in LUNAR_RETURNS],
+        )
+
+    def test_burst_returns_stream_in_order(self, search):
+        from src.utils.solunars import iter_solunar_returns, search_solunars
+
+        (params, solars, lunars) = search
+
+        streamed = list(
+            iter_solunar_returns(params, solars, lunars, burst_months=2)
+        )
+        searched = search_solunars(params, solars, lunars, burst_months=2)
+
+        dates = [date for _, date, _, _ in streamed]
+        assert len(streamed) > 50
+        assert dates == sorted(dates)
+        assert sorted(
+            (date, solunar_type) for _, date, solunar_type, _ in streamed
+        ) == sorted(
+            (date, solunar_type) for _, date, solunar_type, _ in searched
+        )
+
+    def test_next_returns_stop_early(self, search):
+        from src.swe import julday
+        from src.utils.solunars import iter_solunar_returns
+
+        (params, solars, lunars) = search
+        start = julday(
+            params['year'],
+            params['month'],
+            params['day'],
+            params['time'],
+            params['style'],
+        )
+
+        first = list(
+            itertools.islice(iter_solunar_returns(params, solars, lunars), 3)
+        )
+        every = list(iter_solunar_returns(params, solars, lunars))
+
+        assert first == every[:3]
+        assert len(every) == len(solars + lunars)
+        assert all(date > start for _, date, _, _ in every)
+
+    def test_lunar_synodic_returns_are_each_found_once(self, search):
+        from src.models.charts import LSR_FAMILY
+        from src.swe import ELONGATION_TOLERANCE, calc_signed_moon_elongation
+        from src.utils.solunars import search_solunars
+
+        (params, _, _) = search
+        radix = params['radix']
+        natal_elongation = (
+            radix.planets['Moon'].longitude - radix.planets['Sun'].longitude
+        )
+
+        for solunar_type, offset in zip(LSR_FAMILY, [0, 180, 90, -90]):
+            dates = [
+                date
+                for _, date, _, _ in search_solunars(
+                    params, [], [solunar_type], burst_months=120
+                )
+            ]
+
+            assert 118 < len(dates) < 124
+            for date, next_date in zip(dates, dates[1:]):
+                assert 29.1 < next_date - date < 30
+
+            for date in dates:
+                assert (
+                    difference(
+                        calc_signed_moon_elongation(date),
+                        natal_elongation + offset,
+                    )
+                    < ELONGATION_TOLERANCE
+                )
+
+    def test_active_lunar_synodic_return_just_after_a_return(self, search):
+        from src.models.charts import ChartType
+        from src.swe import revjul
+        from src.utils.solunars import (
+            iter_solunar_type_returns,
+            search_solunars,
+        )
+
+        (params, _, _) = search
+        solunar_type = ChartType.LUNAR_SYNODIC_RETURN.value
+        (_, last_return, _, _) = search_solunars(
+            params, [], [solunar_type], burst_months=2
+        )[1]
+
+        for hours in [1, 5, 10]:
+            (year, month, day, time) = revjul(
+                last_return + hours / 24, params['style']
+            )
+            dates = [
+                date
+                for _, date, _, _ in iter_solunar_type_returns(
+                    {
+                        **params,
+                        'year': year,
+                        'month': month,
+                        'day': day,
+                        'time': time,
+                    },
+                    solunar_type,
+                    active=True,
+                )
+            ]
+
+            assert dates == [pytest.approx(last_return, abs=1e-6)]
+
+    def test_roster_matches_single_searches(self, search):
+        from src.models.charts import (
+            ChartObject,
+            ChartType,
+            ChartWheelRole,
+        )
+        from src.swe import julday
+        from src.utils.solunars import (
+            iter_solunar_type_returns,
+            search_roster_solunars,
+        )
+
+        (params, _, _) = search
+        roster = []
+        for year, month in [(1989, 7), (1975, 1), (2001, 11)]:
+            radix_params = {**params['base_chart'], 'year': year}
+            radix_params['month'] = month
+            roster.append(
+                {
+                    **params,
+                    'base_chart': radix_params,
+                    'radix': ChartObject(radix_params).with_role(
+                        ChartWheelRole.RADIX
+                    ),
+                }
+            )
+
+        solars = [ChartType.SOLAR_RETURN.value]
+        lunars = [
+            ChartType.LUNAR_RETURN.value,
+            ChartType.DEMI_LUNAR_RETURN.value,
+            ChartType.LUNISOLAR_RETURN.value,
+            ChartType.LUNAR_SYNODIC_RETURN.value,
+        ]
+        start = julday(2024, 3, 5, 12.0, 1)
+        end = start + 400
+
+        found = search_roster_solunars(roster, solars, lunars, start, end)
+
+        assert len(found) == len(roster)
+        for entry, params in zip(found, roster):
+            dates = [date for _, date, _, _ in entry]
+            assert dates == sorted(dates)
+            assert all(
+                found_params['radix'] is params['radix']
+                for found_params, _, _, _ in entry
+            )
+
+            for solunar_type in solars + lunars:
+                expected = [
+                    date
+                    for _, date, _, _ in iter_solunar_type_returns(
+                        params, solunar_type, burst_months=15
+                    )
+                    if date < end
+                ]
+                roster_dates = [
+                    date
+                    for _, date, found_type, _ in entry
+                    if found_type == solunar_type
+                ]
+
+                assert roster_dates == pytest.approx(expected, abs=1e-5)
+
+    def test_lunar_returns_are_each_found_once(self, search):
+        from src.models.charts import ChartType
+        from src.swe import julday
+        from src.utils.solunars import find_solunar_crossings_until_date
+
+        (params, _, _) = search
+        start = julday(2024, 3, 5, 12.0, 1)
+        sidereal_month = 27.3217
+
+        for solunar_type in [
+            ChartType.LUNAR_RETURN.value,
+            ChartType.DEMI_LUNAR_RETURN.value,
+            ChartType.FIRST_QUARTI_LUNAR_RETURN.value,
+        ]:
+            dates = find_solunar_crossings_until_date(
+                base_start=start,
+                continue_until_date=start + 3 * 365.25,
+                grace_period=0,
+                target_body='Moon',
+                target_longitude=params['radix'].planets['Moon'].longitude,
+                cycle_length=29,
+                solunar_type=solunar_type,
+            )
+
+            # Each is a crossing of one longitude, once a sidereal month
+            assert dates[0] - start < sidereal_month
+            for date, next_date in zip(dates, dates[1:]):
+                assert abs(next_date - date - sidereal_month) < 0.5
@@ -0,0 +1,114 @@
+import pytest
+
+from test.fixtures.base_chart import base_chart
+from test.fixtures.natal_options import natal_options
+from test.fixtures.tk_fixtures import mock_tk_main
+from test.utils import separation
+
+
+class TestTransitEvents:
+    @pytest.fixture
+    def events(self, base_chart, natal_options, mock_tk_main):
+        from src.models.charts import ChartObject
+        from src.models.options import Options
+        from src.utils.transits.events import find_transit_events
+
+        radix = ChartObject(base_chart)
+        options = Options(natal_options)
+        start = radix.julian_day_utc + 365.25 * 30
+        return (
+            radix,
+            options,
+            find_transit_events(radix, start, start + 60, options),
+        )
+
+    def test_aspect_angles(self, natal_options, mock_tk_main):
+        from src.models.charts import AspectType
+        from src.models.options import Options
+        from src.utils.transits.events import calc_transit_aspect_angles
+
+        angles = {
+            angle: aspect_type
+            for angle, aspect_type, _ in calc_transit_aspect_angles(
+                Options(natal_options)
+            )
+        }
+
+        assert angles == {
+            0: AspectType.CONJUNCTION,
+            45: AspectType.OCTILE,
+            60: AspectType.SEXTILE,
+            90: AspectType.SQUARE,
+            120: AspectType.TRINE,
+            135: AspectType.OCTILE,
+            180: AspectType.OPPOSITION,
+            225: AspectType.OCTILE,
+            240: AspectType.TRINE,
+            270: AspectType.SQUARE,
+            300: AspectType.SEXTILE,
+            315: AspectType.OCTILE,
+        }
+
+    def test_events_are_sorted_crossings(self, events):
+        from src.constants import PLANETS
+        from src.swe import calc_planet
+        from src.utils.calculation_utils import parse_aspect
+        from src.utils.transits.events import TransitEventType
+
+        (radix, options, found) = events
+        radix_longitudes = {
+            planet.short_name: planet.longitude
+            for planet in radix.planets.values()
+        }
+        radix_longitudes['As'] = radix.cusps[1]
+        radix_longitudes['Mc'] = radix.cusps[10]
+        numbers = {
+            definition['short_name']: definition['number']
+            for definition in PLANETS.values()
+        }
+
+        assert len(found) > 100
+        assert [event.julian_day_utc for event in found] == sorted(
+            event.julian_day_utc for event in found
+        )
+
+        for event in found:
+            longitude = calc_planet(
+                event.julian_day_utc, numbers[event.transiting_planet]
+            )[0]
+            distance = separation(
+                longitude,
+                radix_longitudes[event.radix_point] + event.aspect_angle,
+            )
+
+            if event.event_type == TransitEventType.EXACT:
+                assert abs(distance) < 1e-6
+                (aspect_type, aspect_class, _, _) = parse_aspect(
+                    longitude - radix_longitudes[event.radix_point], options
+                )
+                assert aspect_type == event.aspect_type
+                assert aspect_class == 1
+            else:
+                assert abs(abs(distance) - event.orb) < 1e-6
+
+    def test_each_exact_is_bracketed(self, events):
+        from src.utils.transits.events import TransitEventType
+
+        (_, _, found) = events
+        passes = {}
+        for event in found:
+            key = (
+                event.transiting_planet,
+                event.radix_point,
+                event.aspect_angle,
+            )
+            passes.setdefault(key, []).append(event.event_type)
+
+        for event_types in passes.values():
+            depth = 0
+            for event_type in event_types:
+                if event_type == TransitEventType.ENTER:
+                    depth += 1
+                elif event_type == TransitEventType.LEAVE:
+                    depth -= 1
+                assert depth in [-1, 0, 1]
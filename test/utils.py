@@ -4,6 +4,15 @@ from io import TextIOWrapper
 from src.models.charts import AspectFramework, AspectType
 
 
+def separation(a: float, b: float) -> float:
+    # The signed arc from b to a, between -180 and 180 degrees
+    return (a - b + 180) % 360 - 180
+
+
+def difference(a: float, b: float) -> float:
+    return abs(separation(a, b))
+
+
 def assert_line_contains(
     line: str, text: str, starts_at: int = 0, any_position: bool = False
 ):